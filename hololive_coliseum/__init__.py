@@ -39,21 +39,13 @@ __all__ = [
     "IceZone",
     "HealingZone",
     "physics",
-
-"""HoloLive Coliseum game package."""
-
-__all__ = [
-    "Game",
-    "Player",
-    "GuraPlayer",
-    "Enemy",
-    "Projectile",
     "GravityZone",
     "MeleeAttack",
     "load_settings",
     "save_settings",
     "wipe_saves",
     "NetworkManager",
+    "AsyncNetworkManager",
     "StateSync",
     "load_nodes",
     "save_nodes",
@@ -125,6 +117,7 @@ from .healing_zone import HealingZone
 from . import physics
 from .save_manager import load_settings, save_settings, wipe_saves
 from .network import NetworkManager
+from .async_network import AsyncNetworkManager
 from .state_sync import StateSync
 from .node_registry import load_nodes, save_nodes, add_node, prune_nodes
 from .blockchain import (
@@ -150,11 +143,3 @@ from .accounts import (
     get_account,
 )
 from .holographic_compression import compress_packet, decompress_packet
-]
-from .game import Game
-from .player import Player, GuraPlayer, Enemy
-from .projectile import Projectile
-from .gravity_zone import GravityZone
-from .melee_attack import MeleeAttack
-from .save_manager import load_settings, save_settings, wipe_saves
-from .network import NetworkManager
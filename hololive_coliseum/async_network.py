@@ -0,0 +1,178 @@
+"""Asyncio transport for :class:`NetworkManager`.
+
+The synchronous manager only reads its socket when the game loop calls
+``poll()`` once per frame. Router nodes and headless hosts can instead run an
+:class:`AsyncNetworkManager`, which handles every datagram as soon as the
+event loop receives it and hands game messages out through an async iterator.
+Message types and packet framing are shared with the synchronous manager.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, List, Tuple
+
+from .interest import InterestManager
+from .network import NetworkManager
+
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    """Forward datagrams from the event loop to an :class:`AsyncNetworkManager`."""
+
+    def __init__(self, manager: "AsyncNetworkManager") -> None:
+        self.manager = manager
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self.manager._datagram_received(data, addr)
+
+    def error_received(self, exc: Exception) -> None:
+        # ICMP errors for unreachable peers are expected on UDP meshes
+        pass
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.manager._connection_lost()
+
+
+class AsyncNetworkManager(NetworkManager):
+    """Event-driven variant of :class:`NetworkManager`.
+
+    Call :meth:`start` from a running event loop, then consume messages with
+    ``async for addr, msg in manager``. Reliable packets are resent and
+    router anti-entropy runs from a background task so no frame loop is
+    needed.
+    """
+
+    def __init__(
+        self,
+        host: bool = False,
+        address: Tuple[str, int] = ("", 50007),
+        secret: bytes | None = None,
+        encrypt_key: bytes | None = None,
+        max_queue: int = 0,
+        coalesce: bool = False,
+        mtu: int = 1200,
+        binary: bool = True,
+        state_budget: int | None = None,
+        interest: InterestManager | None = None,
+        reuse_port: bool = False,
+        aead_key: bytes | None = None,
+    ) -> None:
+        super().__init__(
+            host, address, secret, encrypt_key, coalesce, mtu,
+            binary=binary, state_budget=state_budget, interest=interest,
+            reuse_port=reuse_port, aead_key=aead_key,
+        )
+        self._transport: asyncio.DatagramTransport | None = None
+        self._queue: asyncio.Queue[Tuple[Tuple[str, int], dict[str, Any]] | None] = (
+            asyncio.Queue(max_queue)
+        )
+        self._resend_task: asyncio.Task | None = None
+        self._flush_handle: asyncio.Handle | None = None
+        self.dropped = 0
+
+    async def start(self) -> None:
+        """Attach the bound socket to the running event loop."""
+        if self._transport is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _DatagramProtocol(self), sock=self.sock
+        )
+        self._resend_task = loop.create_task(self._resend_loop())
+
+    def close(self) -> None:
+        """Stop the transport and end any active message iterators."""
+        if self._resend_task is not None:
+            self._resend_task.cancel()
+            self._resend_task = None
+        if self._transport is not None:
+            self._transport.close()
+        else:
+            self.sock.close()
+
+    async def __aenter__(self) -> "AsyncNetworkManager":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        self.close()
+
+    def _send(self, payload: bytes, addr: Tuple[str, int]) -> None:
+        super()._send(payload, addr)
+        if self.coalesce:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._transport is not None and self._flush_handle is None:
+            # bundle everything queued during this pass of the event loop
+            self._flush_handle = asyncio.get_running_loop().call_soon(self._flush_soon)
+
+    def _flush_soon(self) -> None:
+        self._flush_handle = None
+        self.flush()
+
+    def _write(self, datagram: bytes, addr: Tuple[str, int]) -> None:
+        if self._transport is None:
+            super()._write(datagram, addr)
+        else:
+            self._transport.sendto(datagram, addr)
+
+    def _enqueue(self, items: List[Tuple[Tuple[str, int], dict[str, Any]]]) -> None:
+        for item in items:
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    def _datagram_received(self, packet: bytes, addr: Tuple[str, int]) -> None:
+        self._enqueue(self._receive(packet, addr))
+        if self.coalesce:
+            self._schedule_flush()
+        else:
+            self._flush_acks()
+
+    def _connection_lost(self) -> None:
+        self._transport = None
+        try:
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    async def _resend_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.ack_timeout / 4)
+            self.process_reliable()
+            self.gossip_tick()
+            self._enqueue(self.housekeeping())
+
+    def poll(self) -> List[Tuple[Tuple[str, int], dict[str, Any]]]:
+        """Return queued messages without waiting."""
+        if self._transport is None:
+            return super().poll()
+        messages = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is None:
+                # keep the close marker for any waiting iterator
+                self._queue.put_nowait(None)
+                break
+            messages.append(item)
+        return messages
+
+    async def recv(self) -> Tuple[Tuple[str, int], dict[str, Any]] | None:
+        """Wait for the next game message or ``None`` once closed."""
+        item = await self._queue.get()
+        if item is None:
+            self._queue.put_nowait(None)
+        return item
+
+    async def messages(self) -> AsyncIterator[Tuple[Tuple[str, int], dict[str, Any]]]:
+        """Yield ``(addr, message)`` pairs until the manager is closed."""
+        while True:
+            item = await self.recv()
+            if item is None:
+                return
+            yield item
+
+    def __aiter__(self) -> AsyncIterator[Tuple[Tuple[str, int], dict[str, Any]]]:
+        return self.messages()
@@ -127,10 +127,11 @@ def fulfill_contract(request_id: str, winner: str) -> Dict[str, Any] | None:
     return add_game(contract['players'], winner, contract['bet'], game_id=request_id)
 
 
-def verify_chain(chain: List[Dict[str, Any]]) -> bool:
-    """Return True if the chain hashes link correctly."""
-    prev_hash = ''
-    for block in chain:
+def verify_blocks(blocks: List[Dict[str, Any]], prev_hash: str = '') -> bool:
+    """Return True if ``blocks`` hash correctly and link onto ``prev_hash``."""
+    for block in blocks:
+        if not isinstance(block, dict) or 'hash' not in block:
+            return False
         expect = _hash_block({k: block[k] for k in block if k != 'hash'})
         if block.get('prev_hash') != prev_hash or block.get('hash') != expect:
             return False
@@ -138,8 +139,17 @@ def verify_chain(chain: List[Dict[str, Any]]) -> bool:
     return True
 
 
+def verify_chain(chain: List[Dict[str, Any]]) -> bool:
+    """Return True if the chain hashes link correctly."""
+    return verify_blocks(chain)
+
+
 def merge_chain(remote: List[Dict[str, Any]]) -> None:
-    """Merge a remote chain with the local one if it is valid and longer."""
+    """Merge a remote chain with the local one if it is valid and longer.
+
+    Nodes talking over the network use :mod:`chain_sync` instead, which only
+    transfers the blocks after the last one both chains share.
+    """
     if not verify_chain(remote):
         return
     local = load_chain()
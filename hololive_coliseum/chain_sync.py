@@ -0,0 +1,220 @@
+"""Incremental blockchain sync between nodes.
+
+Nodes advertise their chain with a ``chain_status`` message holding its
+height and tip hash, and answer a shorter peer's status with their own. A
+node that sees a longer chain starts a session with that peer:
+
+1. Find the common ancestor: the largest ``k`` such that the first ``k``
+   blocks of both chains are identical. Because every block hash covers the
+   previous hash, matching hashes at one index mean everything below matches
+   too, so ``k`` is found by binary search with ``chain_hash`` requests. The
+   first probe is the local tip, which settles the common case of a peer that
+   is simply ahead in one round trip.
+2. Fetch blocks ``k`` onwards with ``chain_blocks`` requests of ``batch``
+   blocks, keeping at most ``window`` requests outstanding. Each batch is
+   checked to link onto the block before it.
+
+Verified blocks are written as soon as the result is longer than the local
+chain, so a chain is never replaced by a shorter one even when the peer is on
+a different fork. :class:`ChainSync` only builds and consumes messages;
+:class:`NetworkManager` carries them as reliable packets.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, Hashable, List
+
+from . import blockchain
+
+Chain = List[Dict[str, Any]]
+
+
+class _Session:
+    """Progress of syncing from one peer."""
+
+    def __init__(self, peer: Hashable, height: int, local: int, now: float) -> None:
+        self.peer = peer
+        self.height = height
+        # invariant: the first ``lo`` blocks match, none past ``hi`` can
+        self.lo = 0
+        self.hi = min(local, height)
+        self.ancestor: int | None = None
+        self.next_request = 0
+        # start -> count of block requests not answered yet
+        self.outstanding: Dict[int, int] = {}
+        self.batches: Dict[int, Chain] = {}
+        self.buffer: Chain = []
+        self.last = now
+
+
+class ChainSync:
+    """Answer and drive block-range sync requests for one node."""
+
+    def __init__(
+        self,
+        load: Callable[[], Chain] | None = None,
+        save: Callable[[Chain], None] | None = None,
+        batch: int = 32,
+        window: int = 4,
+        timeout: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        # looked up at call time so tests can point blockchain at other files
+        self._load = load or (lambda: blockchain.load_chain())
+        self._save = save or (lambda chain: blockchain.save_chain(chain))
+        self.batch = batch
+        self.window = window
+        self.timeout = timeout
+        self.clock = clock
+        self.session: _Session | None = None
+        self.blocks_received = 0
+        self.hash_requests = 0
+        self.rejected = 0
+        self.synced = 0
+
+    def status(self) -> Dict[str, Any]:
+        chain = self._load()
+        return {
+            "type": "chain_status",
+            "height": len(chain),
+            "tip": chain[-1]["hash"] if chain else "",
+        }
+
+    def handle(self, peer: Hashable, msg: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Process one ``chain_*`` message and return the replies for ``peer``."""
+        msg_type = msg.get("type")
+        try:
+            if msg_type == "chain_status":
+                return self._on_status(peer, msg)
+            if msg_type == "chain_hash_req":
+                return [self._serve_hash(int(msg["index"]))]
+            if msg_type == "chain_blocks_req":
+                return [self._serve_blocks(int(msg["start"]), int(msg["count"]))]
+            session = self.session
+            if session is None or session.peer != peer:
+                return []
+            session.last = self.clock()
+            if msg_type == "chain_hash":
+                return self._on_hash(session, int(msg["index"]), msg.get("hash"))
+            if msg_type == "chain_blocks":
+                return self._on_blocks(session, int(msg["start"]), msg.get("blocks") or [])
+        except (KeyError, TypeError, ValueError):
+            self.rejected += 1
+        return []
+
+    # serving side
+
+    def _serve_hash(self, index: int) -> Dict[str, Any]:
+        chain = self._load()
+        block_hash = chain[index]["hash"] if 0 <= index < len(chain) else None
+        return {"type": "chain_hash", "index": index, "hash": block_hash}
+
+    def _serve_blocks(self, start: int, count: int) -> Dict[str, Any]:
+        chain = self._load()
+        count = max(0, min(count, self.batch))
+        blocks = chain[start:start + count] if start >= 0 else []
+        return {"type": "chain_blocks", "start": start, "blocks": blocks}
+
+    # syncing side
+
+    def _on_status(self, peer: Hashable, msg: Dict[str, Any]) -> List[Dict[str, Any]]:
+        now = self.clock()
+        height = int(msg["height"])
+        local = self._load()
+        if height < len(local):
+            # the peer is behind; our status lets it sync from us
+            return [self.status()]
+        if height == len(local):
+            return []
+        if self.session is not None:
+            if now - self.session.last < self.timeout:
+                return []
+            # the peer stopped answering; let any node start over
+            self.session = None
+        session = self.session = _Session(peer, height, len(local), now)
+        if session.hi == 0:
+            return self._found(session, 0)
+        return [self._ask_hash(session.hi - 1)]
+
+    def _ask_hash(self, index: int) -> Dict[str, Any]:
+        self.hash_requests += 1
+        return {"type": "chain_hash_req", "index": index}
+
+    def _on_hash(
+        self, session: _Session, index: int, remote_hash: str | None
+    ) -> List[Dict[str, Any]]:
+        if session.ancestor is not None:
+            return []
+        k = index + 1
+        if not session.lo < k <= session.hi:
+            return []
+        local = self._load()
+        if k <= len(local) and remote_hash == local[index]["hash"]:
+            session.lo = k
+        else:
+            session.hi = k - 1
+        if session.lo == session.hi:
+            return self._found(session, session.lo)
+        mid = (session.lo + session.hi + 1) // 2
+        return [self._ask_hash(mid - 1)]
+
+    def _found(self, session: _Session, ancestor: int) -> List[Dict[str, Any]]:
+        session.ancestor = ancestor
+        session.next_request = ancestor
+        return self._request_more(session)
+
+    def _request_more(self, session: _Session) -> List[Dict[str, Any]]:
+        requests = []
+        while len(session.outstanding) < self.window and session.next_request < session.height:
+            start = session.next_request
+            count = min(self.batch, session.height - start)
+            session.outstanding[start] = count
+            session.next_request += count
+            requests.append({"type": "chain_blocks_req", "start": start, "count": count})
+        return requests
+
+    def _on_blocks(self, session: _Session, start: int, blocks: Chain) -> List[Dict[str, Any]]:
+        expected = session.outstanding.pop(start, None)
+        if expected is None:
+            return []
+        if not blocks:
+            # the peer's chain changed under us; a later status restarts
+            self.session = None
+            return []
+        blocks = blocks[:expected]
+        if len(blocks) < expected:
+            # the peer has fewer blocks than it advertised
+            session.height = start + len(blocks)
+            for later in [s for s in session.outstanding if s >= session.height]:
+                del session.outstanding[later]
+        session.batches[start] = blocks
+        local = self._load()
+        base = session.ancestor
+        while True:
+            position = base + len(session.buffer)
+            batch = session.batches.pop(position, None)
+            if batch is None:
+                break
+            if position == 0:
+                prev_hash = ""
+            elif session.buffer:
+                prev_hash = session.buffer[-1]["hash"]
+            else:
+                prev_hash = local[position - 1]["hash"]
+            if not blockchain.verify_blocks(batch, prev_hash):
+                self.rejected += 1
+                self.session = None
+                return []
+            session.buffer.extend(batch)
+            self.blocks_received += len(batch)
+        if base + len(session.buffer) > len(local):
+            local = local[:base] + session.buffer
+            self._save(local)
+            session.ancestor = len(local)
+            session.buffer = []
+        if session.ancestor + len(session.buffer) >= session.height:
+            self.session = None
+            self.synced += 1
+            return []
+        return self._request_more(session)
@@ -34,6 +34,7 @@ from .powerup import PowerUp
 from .healing_zone import HealingZone
 from .save_manager import load_settings, save_settings, wipe_saves
 from .network import NetworkManager
+from .peer_stats import draw_overlay
 from .node_registry import load_nodes
 from .menus import MenuMixin, MENU_BG_COLOR, MENU_TEXT_COLOR
 from .accounts import register_account, delete_account
@@ -42,21 +43,6 @@ from .accounts import register_account, delete_account
 class Game(MenuMixin):
     """Main game class with menus, AI opponents, networking and settings."""
 
-from .player import Player, GuraPlayer
-from .projectile import Projectile
-from .melee_attack import MeleeAttack
-from .gravity_zone import GravityZone
-from .save_manager import load_settings, save_settings, wipe_saves
-
-
-MENU_BG_COLOR = (0, 255, 255)  # cyan background
-MENU_TEXT_COLOR = (255, 255, 255)  # white text
-
-
-class Game:
-    """Minimal game loop with a splash menu using pygame."""
-
-
     def __init__(self, width: int = 800, height: int = 600):
         os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
         pygame.init()
@@ -72,11 +58,6 @@ class Game:
             self.mixer_ready = True
         except pygame.error:
             self.mixer_ready = False
-        try:
-            pygame.mixer.init()
-            pygame.mixer.music.set_volume(self.volume)
-        except pygame.error:
-            pass
 
         default_keys = {
             "shoot": pygame.K_z,
@@ -120,10 +101,6 @@ class Game:
             "Records",
             "Exit",
         ]
-
-        self.state = "splash"  # splash -> main_menu -> mode -> solo_multi -> mp_type -> char -> lobby -> map/chapter -> settings -> accounts -> playing
-        self.menu_index = 0
-        self.main_menu_options = ["New Game", "Settings", "Exit"]
         self.mode_options = ["Story", "Arena", "Custom", "Back"]
         self.solo_multi_options = ["Solo", "Multiplayer", "Back"]
         self.mp_type_options = ["Offline", "Online", "Back"]
@@ -165,6 +142,8 @@ class Game:
         self.account_id = "player"
         self.network_manager: NetworkManager | None = None
         self.node_hosting = False
+        # F3 toggles the per-peer connection statistics overlay
+        self.show_net_stats = False
         self.characters = [
             "Gawr Gura",
             "Watson Amelia",
@@ -204,31 +183,6 @@ class Game:
         self.ai_players = 0
         self.player_names = ["Player 1"]
         self.multiplayer = False
-            "special": pygame.K_v,
-        }
-        self.key_bindings = self.settings.get("key_bindings", default_keys)
-        self.screen = pygame.display.set_mode((self.width, self.height))
-        pygame.display.set_caption("HoloLive Coliseum")
-        self.clock = pygame.time.Clock()
-        self.running = False
-        self.state = "splash"  # splash -> main_menu -> mode -> solo_multi -> mp_type -> char -> map/chapter -> settings -> playing
-        self.menu_index = 0
-        self.main_menu_options = ["New Game", "Settings", "Exit"]
-        self.mode_options = ["Story", "Arena", "Custom"]
-        self.solo_multi_options = ["Solo", "Multiplayer"]
-        self.mp_type_options = ["Offline", "Online"]
-        self.online_multiplayer = False
-        self.settings_options = [
-            "Key Bindings",
-            "Window Size",
-            "Volume",
-            "Wipe Saves",
-            "Back",
-        ]
-        self.characters = ["Gawr Gura"]
-        self.maps = ["Default"]
-        self.chapters = ["Chapter 1"]
-
         self.selected_mode: str | None = None
         self.selected_character: str | None = None
         self.selected_map: str | None = None
@@ -243,7 +197,6 @@ class Game:
             surf.blit(label, label.get_rect(center=(size[0] // 2, size[1] // 2)))
             return surf
 
-        image_dir = os.path.join(os.path.dirname(__file__), '..', 'Images')
         def _load(name: str, size=(64, 64)) -> pygame.Surface:
             path = os.path.join(image_dir, name)
             if os.path.exists(path):
@@ -277,23 +230,10 @@ class Game:
         }
         self.chapter_images = {
             f"Chapter {i}": _load(f"chapter{i}.png") for i in range(1, 21)
-
-            surf = pygame.Surface(size)
-            surf.fill((255, 255, 255))
-            return surf
-
-        self.character_images = {
-            'Gawr Gura': _load('Gawr_Gura_right.png'),
-        }
-        self.map_images = {
-            'Default': _load('map_default.png'),
-        }
-        self.chapter_images = {
-            'Chapter 1': _load('chapter1.png'),
-
         }
         self.title_font = pygame.font.SysFont(None, 64)
         self.menu_font = pygame.font.SysFont(None, 32)
+        self.net_stats_font = pygame.font.SysFont(None, 20)
 
         # Stage setup
         self.ground_y = self.height - 50
@@ -370,11 +310,6 @@ class Game:
             img = os.path.join(image_dir, "Gawr_Gura_right.png")
         self.player = player_cls(100, self.ground_y - 60, img)
         self.difficulty = self.difficulty_levels[self.difficulty_index]
-        # Simple stage with a single ground platform
-        self.ground_y = self.height - 50
-        player_image = os.path.join(image_dir, "Gawr_Gura_right.png")
-        self.player = GuraPlayer(100, self.ground_y - 60, player_image)
-
         self.all_sprites = pygame.sprite.Group(self.player)
         self.projectiles = pygame.sprite.Group()
         self.melee_attacks = pygame.sprite.Group()
@@ -431,7 +366,7 @@ class Game:
     def start_node(self) -> None:
         """Begin hosting a blockchain node."""
         if self.network_manager is None:
-            self.network_manager = NetworkManager(host=True)
+            self.network_manager = NetworkManager(host=True, coalesce=True)
             self.network_manager.broadcast_announce(load_nodes())
             self.node_hosting = True
 
@@ -448,6 +383,12 @@ class Game:
     def _poll_network(self) -> None:
         if self.network_manager is not None:
             self.network_manager.poll()
+            self.network_manager.gossip_tick()
+            self.network_manager.flush()
+
+    def _draw_net_stats(self) -> None:
+        if self.show_net_stats and self.network_manager is not None:
+            draw_overlay(self.screen, self.net_stats_font, self.network_manager.peer_stats)
 
     def _handle_collisions(self) -> None:
         """Handle combat collisions between attacks and sprites."""
@@ -503,55 +444,6 @@ class Game:
             self.last_enemy_damage = now
 
 
-    def _draw_menu(self) -> None:
-        """Render the splash menu screen."""
-        self.screen.fill(MENU_BG_COLOR)
-        title = self.title_font.render("HoloLive Coliseum", True, MENU_TEXT_COLOR)
-        prompt = self.menu_font.render("Press any key to start", True, MENU_TEXT_COLOR)
-        self.screen.blit(
-            title, title.get_rect(center=(self.width // 2, self.height // 3))
-        )
-        self.screen.blit(
-            prompt, prompt.get_rect(center=(self.width // 2, self.height // 2))
-        )
-
-    def _draw_option_menu(self, title: str, options: list[str]) -> None:
-        """Generic menu drawing helper."""
-        self.screen.fill(MENU_BG_COLOR)
-        t = self.title_font.render(title, True, MENU_TEXT_COLOR)
-        self.screen.blit(t, t.get_rect(center=(self.width // 2, self.height // 4)))
-        for i, opt in enumerate(options):
-            color = MENU_TEXT_COLOR if i == self.menu_index else (50, 50, 50)
-            text = self.menu_font.render(opt, True, color)
-            rect = text.get_rect(center=(self.width // 2, self.height // 2 + i * 40))
-            self.screen.blit(text, rect)
-
-    def _draw_character_menu(self) -> None:
-        self._draw_option_menu("Select Character", self.characters)
-        current = self.characters[self.menu_index]
-        img = self.character_images[current]
-        rect = img.get_rect(center=(self.width // 2, self.height // 2 - 100))
-        self.screen.blit(img, rect)
-
-    def _draw_map_menu(self) -> None:
-        self._draw_option_menu("Select Map", self.maps)
-        current = self.maps[self.menu_index]
-        img = self.map_images[current]
-        rect = img.get_rect(center=(self.width // 2, self.height // 2 - 100))
-        self.screen.blit(img, rect)
-
-    def _draw_chapter_menu(self) -> None:
-        self._draw_option_menu("Select Chapter", self.chapters)
-        current = self.chapters[self.menu_index]
-        img = self.chapter_images[current]
-        rect = img.get_rect(center=(self.width // 2, self.height // 2 - 100))
-        self.screen.blit(img, rect)
-
-    def _draw_settings_menu(self) -> None:
-        """Display the settings options."""
-        self._draw_option_menu("Settings", self.settings_options)
-
-
     def run(self):
         """Start the main game loop."""
         self.running = True
@@ -559,6 +451,8 @@ class Game:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.show_net_stats = not self.show_net_stats
                 elif self.state == "splash" and event.type in (
                     pygame.KEYDOWN,
                     pygame.MOUSEBUTTONDOWN,
@@ -603,20 +497,6 @@ class Game:
                         or self.show_end_options
                     )
                 ):
-                    }
-                    and event.type == pygame.KEYDOWN
-                ):
-
-                elif self.state in {
-                    "main_menu",
-                    "mode",
-                    "solo_multi",
-                    "settings",
-                    "char",
-                    "map",
-                    "chapter",
-                    "mp_type",
-                } and event.type == pygame.KEYDOWN:
                     options = {
                         "main_menu": self.main_menu_options,
                         "mode": self.mode_options,
@@ -648,10 +528,6 @@ class Game:
                             self.human_players += 1
                             self.player_names.append(f"Player {self.human_players}")
                         continue
-                        "char": self.characters,
-                        "map": self.maps,
-                        "chapter": self.chapters,
-                    }[self.state]
                     if event.key == pygame.K_UP:
                         self.menu_index = (self.menu_index - 1) % len(options)
                     elif event.key == pygame.K_DOWN:
@@ -670,7 +546,6 @@ class Game:
                                 self.difficulty_levels
                             )
                     elif (
-
                         self.state == "settings"
                         and options[self.menu_index] == "Volume"
                         and event.key in (pygame.K_LEFT, pygame.K_RIGHT)
@@ -709,7 +584,6 @@ class Game:
                     ):
                         self.state = "settings"
                         self.menu_index = 0
-                        pygame.mixer.music.set_volume(self.volume)
                     elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
                         choice = options[self.menu_index]
                         if self.state == "main_menu":
@@ -825,32 +699,6 @@ class Game:
                                 self._setup_level()
                                 self.state = "playing"
                                 self.level_start_time = pygame.time.get_ticks()
-                            self.selected_mode = choice
-                            self.state = "solo_multi"
-                            self.menu_index = 0
-                        elif self.state == "solo_multi":
-                            if choice == "Solo":
-                                self.state = "char"
-                            else:
-                                self.state = "mp_type"
-                            self.menu_index = 0
-                        elif self.state == "mp_type":
-                            self.online_multiplayer = choice == "Online"
-                            self.state = "char"
-                            self.menu_index = 0
-                        elif self.state == "char":
-                            self.selected_character = choice
-                            if self.selected_mode == "Story":
-                                self.state = "chapter"
-                            else:
-                                self.state = "map"
-                            self.menu_index = 0
-                        elif self.state == "map":
-                            self.selected_map = choice
-                            self.state = "playing"
-                        elif self.state == "chapter":
-                            self.selected_chapter = choice
-                            self.state = "playing"
                         elif self.state == "settings":
                             if choice == "Back":
                                 self.state = "main_menu"
@@ -935,13 +783,6 @@ class Game:
                 and now - self.end_time >= 3000
             ):
                 self.show_end_options = True
-
-                                self.screen = pygame.display.set_mode((self.width, self.height))
-                            elif choice == "Volume":
-                                pass
-                            elif choice == "Wipe Saves":
-                                wipe_saves()
-            now = pygame.time.get_ticks()
             if self.state == "splash":
                 self._draw_menu()
             elif self.state == "main_menu":
@@ -1014,22 +855,6 @@ class Game:
                         self.projectiles.add(proj)
                         self.all_sprites.add(proj)
                 if action_pressed("melee"):
-            elif self.state == "settings":
-                self._draw_settings_menu()
-            else:
-                keys = pygame.key.get_pressed()
-                self.player.handle_input(keys, now, self.key_bindings)
-                if keys[self.key_bindings.get("special", pygame.K_v)]:
-                    proj = self.player.special_attack(now)
-                    if proj:
-                        self.projectiles.add(proj)
-                        self.all_sprites.add(proj)
-                if keys[self.key_bindings.get("shoot", pygame.K_z)]:
-                    proj = self.player.shoot(now)
-                    if proj:
-                        self.projectiles.add(proj)
-                        self.all_sprites.add(proj)
-                if keys[self.key_bindings.get("melee", pygame.K_x)]:
                     melee = self.player.melee_attack(now)
                     if melee:
                         self.melee_attacks.add(melee)
@@ -1115,15 +940,6 @@ class Game:
                     self.show_end_options = False
                     self.menu_index = 0
                     continue
-                    self.state = "main_menu"
-                    self.menu_index = 0
-                    continue
-                self.player.update(self.ground_y, now)
-                self.projectiles.update()
-                self.melee_attacks.update()
-                for proj in list(self.projectiles):
-                    if proj.rect.right < 0 or proj.rect.left > self.width:
-                        proj.kill()
                 self.screen.fill((0, 0, 0))
                 pygame.draw.rect(
                     self.screen,
@@ -1156,13 +972,7 @@ class Game:
                 self.screen.blit(score_text, (10, 10))
 
             self._poll_network()
-
-            self._poll_network()
-                    pygame.Rect(0, self.ground_y, self.width, self.height - self.ground_y),
-                )
-                self.all_sprites.draw(self.screen)
-                self.player.draw_status(self.screen)
-
+            self._draw_net_stats()
             pygame.display.flip()
             self.clock.tick(60)
         save_settings(
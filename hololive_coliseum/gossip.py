@@ -0,0 +1,191 @@
+"""Versioned router tables shared by delta gossip.
+
+Every router keeps its game and client lists in a :class:`GossipTable`.
+Each local change is stamped with a version from a Lamport counter and the
+router's random ``node`` id. A vector clock records, per origin node, the
+highest version whose changes we hold, and for each peer we remember the
+clock we believe it has. Gossip to a peer therefore only carries entries
+written since that clock instead of the complete lists.
+
+A ``gossip`` message names the range it covers per origin (``since`` to
+``clock``). A receiver only takes an origin's part when its own clock
+already reaches ``since``, so a lost datagram can never leave a silent gap.
+Gaps are repaired by anti-entropy: peers periodically exchange ``digest``
+messages holding their clocks, and the other side replies with whatever the
+digest shows is missing.
+
+Removals are written as entries with ``alive`` false so they propagate the
+same way. Messages whose clocks or entries are not well formed are counted in
+``rejected`` and ignored.
+"""
+
+from __future__ import annotations
+
+import secrets
+from typing import Any, Dict, Hashable, List, Tuple
+
+# entries per gossip datagram, keeping packets well under the 4096 byte reads
+MAX_ENTRIES = 48
+
+_TABLES = {"games": "g", "clients": "c"}
+_NAMES = {v: k for k, v in _TABLES.items()}
+
+Key = Tuple[str, Tuple[str, int]]
+
+
+def _is_count(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def parse_clock(value: Any) -> Dict[str, int] | None:
+    """Return ``value`` as a vector clock or ``None`` if it is malformed."""
+    if not isinstance(value, dict):
+        return None
+    if not all(isinstance(k, str) and _is_count(v) for k, v in value.items()):
+        return None
+    return dict(value)
+
+
+def parse_addr(value: Any) -> Tuple[str, int] | None:
+    """Return ``value`` as a ``(host, port)`` pair or ``None``."""
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        return None
+    host, port = value
+    if not isinstance(host, str) or not _is_count(port) or port > 0xFFFF:
+        return None
+    return host, port
+
+
+class GossipTable:
+    """Versioned ``games``/``clients`` entries with per-peer delta tracking."""
+
+    def __init__(self, node: str | None = None) -> None:
+        self.node = node or secrets.token_hex(6)
+        self.version = 0
+        self.clock: Dict[str, int] = {}
+        # key -> (version, origin, alive)
+        self.entries: Dict[Key, Tuple[int, str, bool]] = {}
+        self._peers: Dict[Hashable, Dict[str, int]] = {}
+        # gossip parts dropped because an earlier datagram was missed
+        self.gaps = 0
+        # malformed gossip and digest messages
+        self.rejected = 0
+
+    def live(self, table: str) -> List[Tuple[str, int]]:
+        """Return the addresses currently alive in ``table``."""
+        return [
+            addr
+            for (name, addr), (_, _, alive) in self.entries.items()
+            if name == table and alive
+        ]
+
+    def set(
+        self, table: str, addr: Tuple[str, int], alive: bool = True, touch: bool = False
+    ) -> bool:
+        """Record a local change; returns False if nothing changed.
+
+        ``touch`` re-stamps an unchanged live entry so peers see it refreshed.
+        """
+        key = (table, tuple(addr))
+        current = self.entries.get(key)
+        if current is not None and current[2] == alive and not (touch and alive):
+            return False
+        if current is None and not alive:
+            return False
+        self.version += 1
+        self.entries[key] = (self.version, self.node, alive)
+        self.clock[self.node] = self.version
+        return True
+
+    def _apply(
+        self, key: Key, version: int, origin: str, alive: bool
+    ) -> Tuple[Key, bool] | None:
+        self.version = max(self.version, version)
+        current = self.entries.get(key)
+        if current is not None and (current[0], current[1]) >= (version, origin):
+            return None
+        self.entries[key] = (version, origin, alive)
+        return key, alive
+
+    def forget_peer(self, peer: Hashable) -> None:
+        self._peers.pop(peer, None)
+
+    def digest(self) -> Dict[str, Any]:
+        return {"type": "digest", "node": self.node, "clock": dict(self.clock)}
+
+    def receive_digest(self, peer: Hashable, msg: Dict[str, Any]) -> None:
+        """Trust a peer's digest as the exact state it holds."""
+        clock = parse_clock(msg.get("clock"))
+        if clock is None:
+            self.rejected += 1
+            return
+        self._peers[peer] = clock
+
+    def behind(self, msg: Dict[str, Any]) -> bool:
+        """Return True if a peer's digest holds changes we do not have."""
+        clock = parse_clock(msg.get("clock")) or {}
+        return any(v > self.clock.get(k, 0) for k, v in clock.items())
+
+    def delta_for(self, peer: Hashable, limit: int = MAX_ENTRIES) -> Dict[str, Any] | None:
+        """Return a ``gossip`` message with what ``peer`` lacks, or ``None``."""
+        since = self._peers.get(peer, {})
+        pending = sorted(
+            (version, origin, key, alive)
+            for key, (version, origin, alive) in self.entries.items()
+            if version > since.get(origin, 0)
+        )
+        if not pending:
+            return None
+        sent = pending[:limit]
+        clock = dict(self.clock)
+        # an origin whose range was cut short only advances to what was sent
+        for version, origin, _, _ in pending[limit:]:
+            clock[origin] = min(clock[origin], version - 1)
+        entries = [
+            [_TABLES[table], addr[0], addr[1], origin, version, alive]
+            for version, origin, (table, addr), alive in sent
+        ]
+        since = {origin: since.get(origin, 0) for origin in clock}
+        self._peers[peer] = dict(clock)
+        return {
+            "type": "gossip",
+            "node": self.node,
+            "since": since,
+            "clock": clock,
+            "entries": entries,
+        }
+
+    def receive(self, msg: Dict[str, Any]) -> List[Tuple[Key, bool]]:
+        """Apply a ``gossip`` message and return the ``(key, alive)`` changes."""
+        since = parse_clock(msg.get("since", {}))
+        clock = parse_clock(msg.get("clock", {}))
+        entries = msg.get("entries", [])
+        if since is None or clock is None or not isinstance(entries, list):
+            self.rejected += 1
+            return []
+        usable = {
+            origin
+            for origin in clock
+            if self.clock.get(origin, 0) >= since.get(origin, 0)
+        }
+        if len(usable) < len(clock):
+            self.gaps += 1
+        changes = []
+        for entry in entries:
+            try:
+                tag, host, port, origin, version, alive = entry
+                addr = parse_addr([host, port])
+                key = (_NAMES[tag], addr)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if addr is None or not _is_count(version) or not isinstance(origin, str):
+                continue
+            if origin not in usable:
+                continue
+            change = self._apply(key, version, origin, bool(alive))
+            if change is not None:
+                changes.append(change)
+        for origin in usable:
+            self.clock[origin] = max(self.clock.get(origin, 0), clock[origin])
+        return changes
+
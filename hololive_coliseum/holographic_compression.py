@@ -1 +1,49 @@
+"""Holographic lithography packet compression.
 
+A message is serialized to JSON and deflated into a *pointcloud* of bytes. The
+SHA256 digest of the pointcloud acts as its *anchor* so the receiver can verify
+integrity before expanding it again. Both parts travel as base64 strings joined
+by a dot. When a key is supplied the pointcloud is XOR encrypted.
+"""
+
+import base64
+import hashlib
+import json
+import zlib
+from itertools import cycle
+from typing import Any, Dict
+
+
+def _xor(data: bytes, key: bytes) -> bytes:
+    return bytes(b ^ k for b, k in zip(data, cycle(key)))
+
+
+def compress_packet(msg: Dict[str, Any], key: bytes | None = None) -> bytes:
+    """Return ``msg`` encoded as a compressed pointcloud packet."""
+    raw = json.dumps(msg, separators=(",", ":")).encode("utf-8")
+    points = zlib.compress(raw)
+    anchor = hashlib.sha256(points).digest()
+    if key:
+        points = _xor(points, key)
+    return base64.b64encode(points) + b"." + base64.b64encode(anchor)
+
+
+def decompress_packet(data: bytes, key: bytes | None = None) -> Dict[str, Any] | None:
+    """Expand a packet from :func:`compress_packet` or return ``None``."""
+    try:
+        points_b64, anchor_b64 = data.split(b".", 1)
+        points = base64.b64decode(points_b64, validate=True)
+        anchor = base64.b64decode(anchor_b64, validate=True)
+    except ValueError:
+        return None
+    if key:
+        points = _xor(points, key)
+    if hashlib.sha256(points).digest() != anchor:
+        return None
+    try:
+        msg = json.loads(zlib.decompress(points).decode("utf-8"))
+    except (zlib.error, UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    if not isinstance(msg, dict):
+        return None
+    return msg
@@ -0,0 +1,129 @@
+"""Loopback network impairment for reproducible netcode tests.
+
+:class:`ImpairedSocket` wraps a UDP socket and delays, drops, duplicates and
+reorders what is sent through it according to a seeded random generator.
+Swap it in with :func:`impair` and the :class:`NetworkManager` keeps working
+unchanged; wrap both ends to impair both directions.
+
+Delayed datagrams are written by :meth:`ImpairedSocket.pump`, which every
+``sendto`` and ``recvfrom`` call runs first, so a manager that polls each
+frame drains the queue on its own. Only the blocking-socket path is covered;
+:class:`AsyncNetworkManager` writes through its transport instead.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import random
+import time
+from typing import TYPE_CHECKING, Any, Callable, List, Tuple
+
+if TYPE_CHECKING:
+    from .network import NetworkManager
+
+
+class ImpairedSocket:
+    """UDP socket wrapper adding latency, jitter, loss, duplicates and reordering.
+
+    ``latency`` and ``jitter`` are in seconds; each datagram waits
+    ``latency`` plus a uniform ``0..jitter``. ``loss``, ``duplicate`` and
+    ``reorder`` are probabilities per datagram; a reordered datagram is held
+    back an extra ``reorder_delay`` so later ones overtake it.
+    """
+
+    def __init__(
+        self,
+        sock,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        loss: float = 0.0,
+        duplicate: float = 0.0,
+        reorder: float = 0.0,
+        reorder_delay: float = 0.02,
+        seed: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.sock = sock
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.duplicate = duplicate
+        self.reorder = reorder
+        self.reorder_delay = reorder_delay
+        self.clock = clock
+        self.random = random.Random(seed)
+        self.sent = 0
+        self.dropped = 0
+        self.duplicated = 0
+        self.reordered = 0
+        self.delivered = 0
+        self._queue: List[Tuple[float, int, bytes, Any]] = []
+        self._order = itertools.count()
+
+    def __getattr__(self, name: str) -> Any:
+        # fileno, getsockname, setsockopt, close, ... go to the real socket
+        return getattr(self.sock, name)
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def _delay(self) -> float:
+        delay = self.latency + self.random.uniform(0.0, self.jitter)
+        if self.reorder and self.random.random() < self.reorder:
+            self.reordered += 1
+            delay += self.reorder_delay
+        return delay
+
+    def sendto(self, data: bytes, addr) -> int:
+        self.pump()
+        self.sent += 1
+        if self.loss and self.random.random() < self.loss:
+            self.dropped += 1
+            return len(data)
+        copies = 1
+        if self.duplicate and self.random.random() < self.duplicate:
+            self.duplicated += 1
+            copies = 2
+        now = self.clock()
+        for _ in range(copies):
+            heapq.heappush(self._queue, (now + self._delay(), next(self._order), data, addr))
+        self.pump()
+        return len(data)
+
+    def pump(self) -> int:
+        """Write every datagram whose delay has passed; return how many."""
+        now = self.clock()
+        written = 0
+        while self._queue and self._queue[0][0] <= now:
+            _, _, data, addr = heapq.heappop(self._queue)
+            try:
+                self.sock.sendto(data, addr)
+            except OSError:
+                continue
+            written += 1
+        self.delivered += written
+        return written
+
+    def recvfrom(self, bufsize: int):
+        self.pump()
+        return self.sock.recvfrom(bufsize)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "duplicated": self.duplicated,
+            "reordered": self.reordered,
+            "delivered": self.delivered,
+            "pending": self.pending,
+        }
+
+
+def impair(manager: "NetworkManager", **kwargs: Any) -> ImpairedSocket:
+    """Route ``manager``'s outgoing datagrams through an :class:`ImpairedSocket`."""
+    if isinstance(manager.sock, ImpairedSocket):
+        manager.sock = manager.sock.sock
+    manager.sock = ImpairedSocket(manager.sock, **kwargs)
+    return manager.sock
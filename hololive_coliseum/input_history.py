@@ -0,0 +1,87 @@
+"""Redundant input streams.
+
+Each peer keeps its last few input bitmasks and sends all of them in every
+``inputs`` message. When a datagram is lost the next one still carries the
+missing inputs, so nothing has to be resent and no round trip is added.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+# longest history accepted from a peer; senders use far fewer
+MAX_HISTORY = 64
+
+
+def is_inputs(msg: Dict[str, Any]) -> bool:
+    """Return True if ``msg`` has a usable ``seq`` and ``history``."""
+    seq, history = msg.get("seq"), msg.get("history")
+    if not isinstance(seq, int) or isinstance(seq, bool) or seq < 0:
+        return False
+    if not isinstance(history, list) or len(history) > MAX_HISTORY:
+        return False
+    return all(
+        isinstance(bits, int) and not isinstance(bits, bool) and 0 <= bits <= 0xFFFF
+        for bits in history
+    )
+
+
+class InputHistory:
+    """Ring of the most recent local inputs, numbered consecutively."""
+
+    def __init__(self, size: int = 8) -> None:
+        self.size = size
+        self.seq = 0
+        self._bits: Deque[int] = deque(maxlen=size)
+
+    def push(self, bits: int) -> int:
+        """Record the next input and return its sequence number."""
+        self.seq += 1
+        self._bits.append(bits)
+        return self.seq
+
+    def message(self, player: int = 0) -> Dict[str, Any]:
+        """Return an ``inputs`` message with the newest inputs first."""
+        return {
+            "type": "inputs",
+            "seq": self.seq,
+            "player": player,
+            "history": list(reversed(self._bits)),
+        }
+
+
+class InputReceiver:
+    """Extract inputs not seen before from a peer's ``inputs`` messages.
+
+    ``received`` counts every input delivered, ``recovered`` those that only
+    arrived through a later packet's history because their own packet was
+    lost or late, and ``lost`` those that fell out of the sender's history
+    before any packet carrying them arrived. Malformed messages are counted
+    in ``malformed`` and ignored.
+    """
+
+    def __init__(self) -> None:
+        self.latest = 0
+        self.received = 0
+        self.recovered = 0
+        self.lost = 0
+        self.malformed = 0
+
+    def receive(self, msg: Dict[str, Any]) -> List[Tuple[int, int]]:
+        """Return the new ``(seq, bits)`` pairs in ``msg``, oldest first."""
+        if not is_inputs(msg):
+            self.malformed += 1
+            return []
+        seq = msg["seq"]
+        history = msg["history"]
+        if seq <= self.latest or not history:
+            return []
+        oldest = seq - len(history) + 1
+        if oldest > self.latest + 1:
+            self.lost += oldest - self.latest - 1
+        first = max(oldest, self.latest + 1)
+        self.latest = seq
+        self.received += seq - first + 1
+        self.recovered += seq - first
+        return [(s, history[seq - s]) for s in range(first, seq + 1)]
@@ -0,0 +1,127 @@
+"""Area-of-interest filtering for host state fan-out.
+
+State dictionaries stay flat. Fields named ``"<entity>.<attr>"`` belong to an
+entity and fields without a dot are global and always sent. An entity's
+position comes from its ``.x`` and ``.y`` fields, which are indexed in a
+uniform grid every tick so each client only receives entities near the one
+it follows.
+
+An entity becomes visible inside ``radius`` and stays visible until it moves
+beyond ``radius + margin``, so objects on the edge do not flicker. The tick an
+entity enters or leaves a view, the client also receives ``"<entity>.gone"``
+set to ``False`` or ``True``.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Hashable, Iterator, List, Set, Tuple
+
+
+def entity_of(key: str) -> str | None:
+    """Return the entity a state field belongs to or ``None`` if global."""
+    entity, sep, _ = key.partition(".")
+    return entity if sep else None
+
+
+def drop_departed(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove entities marked as gone from a client's applied state."""
+    gone = {entity_of(k) for k, v in state.items() if k.endswith(".gone") and v is True}
+    return {k: v for k, v in state.items() if entity_of(k) not in gone}
+
+
+class SpatialGrid:
+    """Uniform grid bucketing entity ids by position."""
+
+    def __init__(self, cell_size: float) -> None:
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[str]] = {}
+        self.positions: Dict[str, Tuple[float, float]] = {}
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.positions.clear()
+
+    def insert(self, entity: str, x: float, y: float) -> None:
+        self.positions[entity] = (x, y)
+        self.cells.setdefault(self._cell(x, y), []).append(entity)
+
+    def query(self, x: float, y: float, radius: float) -> Iterator[Tuple[str, float]]:
+        """Yield ``(entity, distance)`` for entities within ``radius``."""
+        cx0, cy0 = self._cell(x - radius, y - radius)
+        cx1, cy1 = self._cell(x + radius, y + radius)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for entity in self.cells.get((cx, cy), ()):
+                    ex, ey = self.positions[entity]
+                    dist = math.hypot(ex - x, ey - y)
+                    if dist <= radius:
+                        yield entity, dist
+
+
+class InterestManager:
+    """Filter a host state snapshot down to what each client can see."""
+
+    def __init__(self, radius: float = 800.0, margin: float = 100.0) -> None:
+        self.radius = radius
+        self.margin = margin
+        self.grid = SpatialGrid(radius + margin)
+        self._views: Dict[Hashable, str] = {}
+        self._visible: Dict[Hashable, Set[str]] = {}
+
+    def set_view(self, client: Hashable, entity: str) -> None:
+        """Centre ``client``'s view on ``entity``, normally its own player."""
+        self._views[client] = entity
+
+    def forget(self, client: Hashable) -> None:
+        self._views.pop(client, None)
+        self._visible.pop(client, None)
+
+    def index(self, state: Dict[str, Any]) -> None:
+        """Rebuild the grid from the ``.x``/``.y`` fields in ``state``."""
+        self.grid.clear()
+        for key, x in state.items():
+            entity = entity_of(key)
+            if entity is None or key != entity + ".x":
+                continue
+            y = state.get(entity + ".y")
+            if isinstance(x, (int, float)) and isinstance(y, (int, float)):
+                self.grid.insert(entity, x, y)
+
+    def visible(self, client: Hashable) -> Set[str] | None:
+        """Update and return the entities ``client`` sees, or ``None`` for all."""
+        entity = self._views.get(client)
+        if entity is None or entity not in self.grid.positions:
+            return None
+        x, y = self.grid.positions[entity]
+        before = self._visible.get(client, set())
+        now = {entity}
+        for other, dist in self.grid.query(x, y, self.radius + self.margin):
+            if dist <= self.radius or other in before:
+                now.add(other)
+        self._visible[client] = now
+        return now
+
+    def filter(self, client: Hashable, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the part of ``state`` relevant to ``client``.
+
+        Call :meth:`index` with the same state once per tick first.
+        """
+        before = set(self._visible.get(client, set()))
+        seen = self.visible(client)
+        if seen is None:
+            return state
+        tracked = set(self.grid.positions)
+        view = {
+            k: v
+            for k, v in state.items()
+            if entity_of(k) is None or entity_of(k) in seen or entity_of(k) not in tracked
+        }
+        for entity in seen - before:
+            view[entity + ".gone"] = False
+        for entity in before - seen:
+            view[entity + ".gone"] = True
+        return view
@@ -0,0 +1,299 @@
+"""Headless load generator for the networking path.
+
+``python -m hololive_coliseum.load_test --clients 50 --duration 10`` starts a
+host :class:`NetworkManager` on localhost and that many simulated clients in
+the same process. Each client sends ``client_join``, ``find``, ``ping``,
+state and reliable messages at its own rate per second, and the host is
+polled in a loop like a game would poll it every frame.
+
+The report gives message throughput, p50/p99 time spent inside the host's
+``poll()`` (per call that handled traffic) and how many datagrams never
+arrived in either direction. ``--json`` prints it as one line so results can
+be stored and compared between versions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from . import node_registry
+from .network import NetworkManager
+
+# messages per second each client sends of every kind
+DEFAULT_RATES: Dict[str, float] = {
+    "join": 0.5,
+    "find": 1.0,
+    "ping": 2.0,
+    "state": 30.0,
+    "reliable": 5.0,
+}
+
+
+@contextlib.contextmanager
+def _private_registry(nodes_file: str | None):
+    """Point ``node_registry`` at ``nodes_file`` for the length of a run.
+
+    The host registers itself like any router, so without this it would land
+    in the player's node list and gossip with the built-in nodes. ``None``
+    uses a temporary file. The previous settings are restored afterwards.
+    """
+    with contextlib.ExitStack() as stack:
+        if nodes_file is None:
+            run_dir = stack.enter_context(tempfile.TemporaryDirectory())
+            nodes_file = os.path.join(run_dir, "nodes.json")
+        saved = node_registry.NODES_FILE, node_registry.DEFAULT_NODES
+        node_registry.NODES_FILE, node_registry.DEFAULT_NODES = nodes_file, []
+        try:
+            yield
+        finally:
+            node_registry.NODES_FILE, node_registry.DEFAULT_NODES = saved
+            key = os.path.abspath(os.fspath(nodes_file))
+            registry = node_registry._REGISTRIES.pop(key, None)
+            if registry is not None:
+                registry.flush()
+
+
+def _percentile(values: List[float], q: float) -> float | None:
+    """Return the nearest-rank ``q`` percentile of ``values``."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class SimulatedClient:
+    """One client sending a configurable mix of traffic to a host."""
+
+    def __init__(
+        self,
+        index: int,
+        address: Tuple[str, int],
+        rates: Dict[str, float],
+        secret: bytes | None = None,
+        seed: int | None = None,
+        aead_key: bytes | None = None,
+    ) -> None:
+        self.index = index
+        self.manager = NetworkManager(address=address, secret=secret, aead_key=aead_key)
+        self.rates = rates
+        self.random = random.Random(seed)
+        self.sent: Dict[str, int] = dict.fromkeys(rates, 0)
+        self.replies = {"pong": 0, "games": 0}
+        self._due: Dict[str, float] = {}
+
+    def start(self, now: float) -> None:
+        # spread first sends so clients do not fire in lockstep
+        for kind, rate in self.rates.items():
+            if rate > 0:
+                self._due[kind] = now + self.random.uniform(0, 1 / rate)
+
+    def _send(self, kind: str) -> None:
+        manager = self.manager
+        if kind == "join":
+            manager.register_client([manager.address])
+        elif kind == "find":
+            manager._send(manager._encode({"type": "find"}), manager.address)
+        elif kind == "ping":
+            manager._send(manager._encode({"type": "ping"}), manager.address)
+        elif kind == "state":
+            manager.send_state(
+                {
+                    "player.x": self.random.uniform(0, 800),
+                    "player.y": self.random.uniform(0, 600),
+                    "player.health": self.random.randint(0, 100),
+                }
+            )
+        elif kind == "reliable":
+            manager.send_reliable({"type": "chat", "client": self.index})
+        self.sent[kind] += 1
+
+    def step(self, now: float) -> None:
+        """Send everything that has come due, then drain replies."""
+        for kind, due in self._due.items():
+            interval = 1 / self.rates[kind]
+            while due <= now:
+                try:
+                    self._send(kind)
+                except OSError:
+                    pass
+                due += interval
+            self._due[kind] = due
+        self.drain()
+
+    def drain(self) -> None:
+        """Handle replies and acks without sending new traffic."""
+        for _, msg in self.manager.poll():
+            if msg.get("type") in self.replies:
+                self.replies[msg["type"]] += 1
+        self.manager.process_reliable()
+
+    def close(self) -> None:
+        self.manager.sock.close()
+
+
+def run(
+    clients: int = 10,
+    duration: float = 5.0,
+    rates: Dict[str, float] | None = None,
+    secret: bytes | None = None,
+    interval: float = 0.001,
+    seed: int = 0,
+    aead_key: bytes | None = None,
+    nodes_file: str | None = None,
+) -> Dict[str, Any]:
+    """Run one load test and return its report.
+
+    The host's node registry lives in ``nodes_file``, a temporary file by
+    default, never in the game's own node list.
+    """
+    with _private_registry(nodes_file):
+        return _run(clients, duration, rates, secret, interval, seed, aead_key)
+
+
+def _run(
+    clients: int,
+    duration: float,
+    rates: Dict[str, float] | None,
+    secret: bytes | None,
+    interval: float,
+    seed: int,
+    aead_key: bytes | None,
+) -> Dict[str, Any]:
+    rates = dict(DEFAULT_RATES if rates is None else rates)
+    host = NetworkManager(
+        host=True, address=("127.0.0.1", 0), secret=secret, aead_key=aead_key
+    )
+    address = host.sock.getsockname()
+    sims = [
+        SimulatedClient(i, address, rates, secret, seed + i, aead_key)
+        for i in range(clients)
+    ]
+    poll_times: List[float] = []
+    messages = 0
+    start = time.monotonic()
+    for sim in sims:
+        sim.start(start)
+    end = start + duration
+    try:
+        while True:
+            now = time.monotonic()
+            if now >= end:
+                break
+            for sim in sims:
+                sim.step(now)
+            before = host.packets_received
+            t0 = time.perf_counter()
+            messages += len(host.poll())
+            elapsed = time.perf_counter() - t0
+            if host.packets_received != before:
+                poll_times.append(elapsed)
+            host.gossip_tick(now)
+            time.sleep(interval)
+        # let in-flight datagrams land before counting drops
+        time.sleep(0.05)
+        messages += len(host.poll())
+        time.sleep(0.05)
+        for sim in sims:
+            sim.drain()
+        elapsed = time.monotonic() - start
+        return _report(host, sims, poll_times, messages, elapsed)
+    finally:
+        for sim in sims:
+            sim.close()
+        host.sock.close()
+
+
+def _report(
+    host: NetworkManager,
+    sims: List[SimulatedClient],
+    poll_times: List[float],
+    messages: int,
+    elapsed: float,
+) -> Dict[str, Any]:
+    sent: Dict[str, int] = {}
+    replies: Dict[str, int] = {}
+    for sim in sims:
+        for kind, count in sim.sent.items():
+            sent[kind] = sent.get(kind, 0) + count
+        for kind, count in sim.replies.items():
+            replies[kind] = replies.get(kind, 0) + count
+    client_datagrams = sum(sim.manager.packets_sent for sim in sims)
+    client_received = sum(sim.manager.packets_received for sim in sims)
+    p50 = _percentile(poll_times, 50)
+    p99 = _percentile(poll_times, 99)
+    return {
+        "clients": len(sims),
+        "duration": elapsed,
+        "sent": sent,
+        "replies": replies,
+        "datagrams_received": host.packets_received,
+        "bytes_received": host.bytes_received,
+        "datagrams_per_sec": host.packets_received / elapsed if elapsed else 0.0,
+        "messages_per_sec": messages / elapsed if elapsed else 0.0,
+        "poll_calls": len(poll_times),
+        "poll_p50_ms": None if p50 is None else p50 * 1000,
+        "poll_p99_ms": None if p99 is None else p99 * 1000,
+        "dropped_to_host": max(0, client_datagrams - host.packets_received),
+        "dropped_to_clients": max(0, host.packets_sent - client_received),
+        "rejected": host.packets_rejected,
+        "retransmits": sum(sim.manager.retransmits for sim in sims),
+        "reliable_expired": sum(sim.manager.reliable_expired for sim in sims),
+        "duplicates_dropped": host.duplicates_dropped,
+    }
+
+
+def _format(report: Dict[str, Any]) -> str:
+    def ms(value: float | None) -> str:
+        return "n/a" if value is None else f"{value:.3f} ms"
+
+    lines = [
+        f"clients            {report['clients']}",
+        f"duration           {report['duration']:.2f} s",
+        f"sent               {report['sent']}",
+        f"replies            {report['replies']}",
+        f"datagrams/s        {report['datagrams_per_sec']:.0f}",
+        f"messages/s         {report['messages_per_sec']:.0f}",
+        f"poll p50 / p99     {ms(report['poll_p50_ms'])} / {ms(report['poll_p99_ms'])}",
+        f"dropped to host    {report['dropped_to_host']}",
+        f"dropped to clients {report['dropped_to_clients']}",
+        f"retransmits        {report['retransmits']} ({report['reliable_expired']} expired)",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv: List[str] | None = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Load test the networking path.")
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--secret", type=lambda s: s.encode("utf-8"), default=None)
+    parser.add_argument(
+        "--aead-key", type=lambda s: s.encode("utf-8"), default=None,
+        help="encrypt with ChaCha20-Poly1305 instead of signing with --secret",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    for kind, rate in DEFAULT_RATES.items():
+        parser.add_argument(
+            f"--{kind}-rate", type=float, default=rate,
+            help=f"{kind} messages per second per client (default {rate})",
+        )
+    args = parser.parse_args(argv)
+    rates = {kind: getattr(args, f"{kind}_rate") for kind in DEFAULT_RATES}
+    report = run(
+        args.clients, args.duration, rates, args.secret, seed=args.seed,
+        aead_key=args.aead_key,
+    )
+    print(json.dumps(report) if args.json else _format(report))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Deterministic lockstep over input bitmasks.
+
+Peers exchange nothing but their per-frame inputs and each one simulates
+the match locally. A frame runs only once every player's input for it is
+known. Local inputs are scheduled ``input_delay`` frames ahead so the
+remote copy normally arrives before it is needed, and every packet repeats
+the last ``redundancy`` inputs so a lost datagram costs nothing. Spectators
+run the same session without a local player and simply listen.
+
+When more consecutive packets are lost than the history covers, a stalled
+session asks for the missing input with an ``inputs_request`` message (see
+:meth:`LockstepSession.requests`); the peer that owns the input answers with
+an ``inputs_resend`` message from :meth:`LockstepSession.answer`, built from
+its log of recent local inputs. The answer has its own type so a host's
+:class:`InputReceiver`, which drops inputs older than the newest it has
+seen, passes it on instead of filtering it out.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Tuple
+
+from .input_history import InputHistory, InputReceiver, is_inputs
+
+
+class LockstepSession:
+    """Advance a deterministic simulation once all inputs for a frame are in.
+
+    ``simulate(inputs)`` runs one frame with one bitmask per player. Input
+    ``seq`` ``n`` from any player applies to frame ``n - 1 + input_delay``;
+    the first ``input_delay`` frames run with empty inputs. ``local`` is the
+    local player's index or ``None`` for a spectator.
+    """
+
+    def __init__(
+        self,
+        simulate: Callable[[Tuple[int, ...]], None],
+        players: int = 2,
+        local: int | None = 0,
+        input_delay: int = 2,
+        redundancy: int = 8,
+        resend_after: int = 4,
+        log_size: int = 256,
+    ) -> None:
+        self.simulate = simulate
+        self.players = players
+        self.local = local
+        self.input_delay = input_delay
+        self.resend_after = resend_after
+        self.log_size = log_size
+        self.frame = 0
+        self.stalls = 0
+        self.resend_requests = 0
+        self.inputs_dropped = 0
+        self.history = InputHistory(redundancy)
+        self._receivers = [InputReceiver() for _ in range(players)]
+        self._inputs: List[Dict[int, int]] = [{} for _ in range(players)]
+        # local inputs by seq, kept to answer resend requests
+        self._log: Dict[int, int] = {}
+        self._waiting = 0
+
+    def add_local_input(self, bits: int) -> Dict[str, Any]:
+        """Schedule the local input and return the ``inputs`` message to send.
+
+        While the session is stalled the input would land ever further ahead
+        of the simulation, so it is dropped (``inputs_dropped``) and the last
+        message is repeated instead.
+        """
+        if self.local is None:
+            raise ValueError("spectators have no local input")
+        if self.history.seq > self.frame:
+            self.inputs_dropped += 1
+            return self.history.message(self.local)
+        seq = self.history.push(bits)
+        self._inputs[self.local][seq - 1 + self.input_delay] = bits
+        self._log[seq] = bits
+        self._log.pop(seq - self.log_size, None)
+        return self.history.message(self.local)
+
+    def receive(self, msg: Dict[str, Any]) -> None:
+        """Take a remote ``inputs`` or ``inputs_resend`` message."""
+        player = msg.get("player")
+        if not isinstance(player, int) or not 0 <= player < self.players or player == self.local:
+            return
+        if not is_inputs(msg):
+            return
+        seq, history = msg["seq"], msg["history"]
+        if msg.get("type") != "inputs_resend":
+            self._receivers[player].receive(msg)
+        # fill every gap, even inputs the receiver already counted as lost
+        inputs = self._inputs[player]
+        for i, bits in enumerate(history):
+            frame = seq - i - 1 + self.input_delay
+            if frame < self.frame:
+                break
+            inputs.setdefault(frame, bits)
+
+    def requests(self) -> List[Dict[str, Any]]:
+        """Return ``inputs_request`` messages once stalled ``resend_after`` times.
+
+        Each names a player and the input ``seq`` the current frame waits for.
+        """
+        if self._waiting < self.resend_after or self.ready():
+            return []
+        self._waiting = 0
+        seq = self.frame + 1 - self.input_delay
+        missing = [
+            {"type": "inputs_request", "player": player, "seq": seq}
+            for player, inputs in enumerate(self._inputs)
+            if player != self.local and self.frame not in inputs
+        ]
+        self.resend_requests += len(missing)
+        return missing
+
+    def answer(self, msg: Dict[str, Any]) -> Dict[str, Any] | None:
+        """Return an ``inputs_resend`` message covering a request for our inputs."""
+        seq = msg.get("seq")
+        if msg.get("player") != self.local or not isinstance(seq, int) or seq not in self._log:
+            return None
+        last = min(seq + self.history.size - 1, self.history.seq)
+        history = [self._log[s] for s in range(last, seq - 1, -1)]
+        return {"type": "inputs_resend", "seq": last, "player": self.local, "history": history}
+
+    def ready(self) -> bool:
+        if self.frame < self.input_delay:
+            return True
+        return all(self.frame in inputs for inputs in self._inputs)
+
+    def advance(self) -> bool:
+        """Simulate the next frame, or return ``False`` while inputs are missing."""
+        if not self.ready():
+            self.stalls += 1
+            self._waiting += 1
+            return False
+        self._waiting = 0
+        inputs = tuple(inputs.pop(self.frame, 0) for inputs in self._inputs)
+        self.simulate(inputs)
+        self.frame += 1
+        return True
@@ -1,17 +1,44 @@
-import json
+import heapq
+import itertools
+import random
 import socket
 import time
-from typing import Any, List, Tuple, Dict
-import hmac
-import hashlib
+from typing import Any, List, Tuple
 
 from .holographic_compression import compress_packet, decompress_packet
+from .packet_framing import (
+    EPOCH_HEADER,
+    FRAG_TAG,
+    PacketSigner,
+    Reassembler,
+    pack_ack_header,
+    pack_bundle,
+    pack_epoch_header,
+    split_fragments,
+    unpack_ack_header,
+    unpack_bundle,
+    unpack_epoch_header,
+)
+from .packet_crypto import SessionCipher
+from .reliability import AckWindow, OrderedChannel, acked_sequences
+from .wire_codec import decode_message, encode_message, is_binary
 
 from .state_sync import StateSync
+from .send_scheduler import SendScheduler
+from .interest import InterestManager
+from .input_history import InputReceiver, is_inputs
+from .gossip import GossipTable, parse_addr
+from .chain_sync import ChainSync
+from .peer_stats import PeerStatsTable
 
 from .node_registry import add_node, load_nodes
 from .node_registry import prune_nodes
-from typing import Any, List, Tuple
+from .probe import NodeProber
+
+
+def _is_seq(value: Any) -> bool:
+    """Return True if ``value`` is usable as a sequence number."""
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= 0xFFFFFFFF
 
 
 class NetworkManager:
@@ -21,6 +48,46 @@ class NetworkManager:
     find available games on the local network. Router nodes keep track of game
     hosts **and** individual clients so the mesh knows which players are online
     at any moment.
+
+    With ``coalesce`` enabled outgoing packets are queued per destination and
+    packed into bundles of at most ``mtu`` bytes when :meth:`flush` is called,
+    normally once per tick. Any datagram body that would still exceed
+    ``mtu`` is split into fragments which the receiver reassembles in
+    ``fragments``, a bounded :class:`Reassembler`.
+
+    Hot message types (state deltas, acks, pings and inputs) use the binary
+    codec from :mod:`wire_codec` unless ``binary`` is disabled; everything
+    else is sent as a JSON pointcloud packet.
+
+    Hosts given a ``state_budget`` schedule state updates per client: each
+    client gets the highest-priority changed fields that fit in that many
+    bytes per tick (see :mod:`send_scheduler`). An ``interest`` manager
+    further limits each client's updates to entities near its own player.
+
+    With an ``aead_key`` every datagram is encrypted and authenticated with
+    ChaCha20-Poly1305 under a per-session key (see :mod:`packet_crypto`);
+    it takes the place of the ``secret`` HMAC, and ``encrypt_key`` is not
+    needed on top of it.
+
+    ``reuse_port`` lets several host processes bind the same port (see
+    :mod:`router_daemon`).
+
+    Client ``inputs`` messages repeat recent inputs; hosts pass them on with
+    a ``new`` list holding only the ``(seq, bits)`` pairs not seen before and
+    report recovery through :meth:`input_stats`.
+
+    Nodes keep their blockchains in step with :mod:`chain_sync`: hosts send
+    a ``chain_status`` with each anti-entropy digest and when answering an
+    announcement, and fetch only the blocks they are missing.
+
+    ``peer_stats`` holds per-peer RTT, loss, resend and byte counts gathered
+    from normal traffic; :meth:`ping` adds RTT samples for idle links.
+
+    Every datagram carries the sender's random ``epoch``. When a peer shows
+    up with a new one it has restarted, so its ack window, ordered channels,
+    input stream and delta baselines are reset, and state deltas from it are
+    delivered with an ``epoch`` field that tells :class:`StateSync` to start
+    over too.
     """
 
     def __init__(
@@ -29,27 +96,59 @@ class NetworkManager:
         address: Tuple[str, int] = ("", 50007),
         secret: bytes | None = None,
         encrypt_key: bytes | None = None,
+        coalesce: bool = False,
+        mtu: int = 1200,
+        binary: bool = True,
+        state_budget: int | None = None,
+        interest: InterestManager | None = None,
+        reuse_port: bool = False,
+        aead_key: bytes | None = None,
     ) -> None:
         self.host = host
         self.address = address
         self.secret = secret
         self.encrypt_key = encrypt_key
-    Hosts respond to broadcast discovery packets so clients can
-    automatically find available games on the local network.
-    """
-
-    def __init__(self, host: bool = False, address: Tuple[str, int] = ("", 50007)) -> None:
-        self.host = host
-        self.address = address
+        self.coalesce = coalesce
+        self.mtu = mtu
+        self.binary = binary
+        self.aead_key = aead_key
+        self._cipher = SessionCipher(aead_key) if aead_key is not None else None
+        self._signer = (
+            PacketSigner(secret) if secret is not None and self._cipher is None else None
+        )
+        self.packets_rejected = 0
+        self._outbox: dict[Tuple[str, int], List[bytes]] = {}
+        self.fragments = Reassembler()
+        self.fragments_sent = 0
+        self._fragment_ids = itertools.count(random.randrange(1 << 31))
+        self.packets_sent = 0
+        self.bytes_sent = 0
+        self.packets_received = 0
+        self.bytes_received = 0
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sock.setblocking(False)
         if host:
+            if reuse_port:
+                # several router processes share the port; the kernel spreads
+                # senders across them
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
             self.sock.bind(address)
             self.clients: set[Tuple[str, int]] = set()
             # addresses of connected game hosts
             self.games: set[Tuple[str, int]] = set()
             # addresses of individual clients registered with this router
             self.live_clients: set[Tuple[str, int]] = set()
+            # versioned copy of both lists shared with other routers
+            self.gossip = GossipTable()
+            self.digest_interval = 5.0
+            self._next_digest = 0.0
+            # entries expire unless re-registered or heartbeated in time;
+            # entries learned from other routers get twice as long
+            self.lease_time = 30.0
+            self.leases_expired = 0
+            self._leases: dict[Tuple[str, Tuple[str, int]], float] = {}
+            self._lease_heap: list[tuple[float, Tuple[str, Tuple[str, int]]]] = []
+            self._stamped: dict[Tuple[str, Tuple[str, int]], float] = {}
             add_node(self.sock.getsockname())
         else:
             self.sock.bind(("", 0))
@@ -57,31 +156,200 @@ class NetworkManager:
         # allow broadcast for discovery
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
         self._sync = StateSync()
-        self._reliable_seq = 0
+        self.scheduler = SendScheduler(state_budget) if state_budget else None
+        self.interest = interest
+        # per-client delta state when clients receive different views
+        self._client_syncs: dict[Tuple[str, int], StateSync] = {}
+        # next reliable sequence number per destination
+        self._reliable_seq: dict[Tuple[str, int], int] = {}
+        # receipts of each peer's reliable packets, piggybacked on our datagrams
+        self._ack_windows: dict[Tuple[str, int], AckWindow] = {}
+        # ordered delivery state per (peer, channel) for both directions
+        self._channel_seq: dict[Tuple[Tuple[str, int], Any], int] = {}
+        self._channels: dict[Tuple[Tuple[str, int], Any], OrderedChannel] = {}
+        self.duplicates_dropped = 0
+        # random id of this session and the last one seen from each peer
+        self.epoch = random.getrandbits(32)
+        self._peer_epochs: dict[Tuple[str, int], int] = {}
+        self._retired_epochs: dict[Tuple[str, int], int] = {}
+        self.sessions_reset = 0
+        # redundant input streams from clients, see :mod:`input_history`
+        self.input_receivers: dict[Tuple[str, int], InputReceiver] = {}
+        # entity driven by each client's inputs, see :meth:`bind_input`
+        self.input_entities: dict[Tuple[str, int], str] = {}
         self._pending_acks: dict[
             Tuple[Tuple[str, int], int], tuple[bytes, float, int, int]
         ] = {}
+        # (deadline, tiebreak, key, sent) ordered by resend deadline; entries
+        # whose packet was acked or resent since are skipped when popped
+        self._resend_heap: list[
+            tuple[float, int, Tuple[Tuple[str, int], int], float]
+        ] = []
+        self._resend_order = itertools.count()
         self.ack_timeout = 0.2
-
-    def _sign(self, msg: dict[str, Any]) -> str:
-        raw = json.dumps(msg, sort_keys=True, separators=(",", ":")).encode("utf-8")
-        return hmac.new(self.secret or b"", raw, hashlib.sha256).hexdigest()
+        self.retransmits = 0
+        self.reliable_expired = 0
+        self.acks_received = 0
+        self.ack_latency_total = 0.0
+        self.peer_stats = PeerStatsTable()
+        self._next_stats_expiry = 0.0
+        self.chain_sync = ChainSync()
+        # reliable packets sent more than once, excluded from RTT samples
+        self._resent: set[Tuple[Tuple[str, int], int]] = set()
+        # outstanding pings from :meth:`ping` by nonce
+        self._pings: dict[int, tuple[Tuple[str, int], float]] = {}
+        self._ping_nonces = itertools.count(random.randrange(1 << 31))
 
     def _encode(self, msg: dict[str, Any]) -> bytes:
-        if self.secret is not None:
-            msg = msg.copy()
-            msg["sig"] = self._sign(msg)
-        return compress_packet(msg, key=self.encrypt_key)
+        packet = encode_message(msg, key=self.encrypt_key) if self.binary else None
+        if packet is None:
+            packet = compress_packet(msg, key=self.encrypt_key)
+        return packet
 
     def _decode(self, data: bytes) -> dict[str, Any] | None:
-        msg = decompress_packet(data, key=self.encrypt_key)
-        if msg is None:
-            return None
-        if self.secret is not None:
-            sig = msg.pop("sig", None)
-            if sig is None or not hmac.compare_digest(self._sign(msg), sig):
+        if is_binary(data):
+            return decode_message(data, key=self.encrypt_key)
+        return decompress_packet(data, key=self.encrypt_key)
+
+    def _frame(self, body: bytes, addr: Tuple[str, int]) -> bytes:
+        """Add the epoch and ack headers for ``addr`` and sign the datagram."""
+        window = self._ack_windows.get(addr)
+        header = window.header() if window is not None else None
+        if header is not None:
+            body = pack_ack_header(header[0], header[1], body)
+        body = pack_epoch_header(self.epoch, body)
+        if self._cipher is not None:
+            return self._cipher.seal(body)
+        if self._signer is not None:
+            body = self._signer.sign(body)
+        return body
+
+    def _unframe(self, datagram: bytes, addr: Tuple[str, int]) -> bytes | None:
+        """Verify a datagram, apply its headers and return the body."""
+        size = len(datagram)
+        if self._cipher is not None:
+            datagram = self._cipher.open(datagram)
+            if datagram is None:
+                self.packets_rejected += 1
+                return None
+        elif self._signer is not None:
+            # check the MAC before spending any time on decoding
+            datagram = self._signer.verify(datagram)
+            if datagram is None:
+                self.packets_rejected += 1
                 return None
-        return msg
+        epoch = unpack_epoch_header(datagram)
+        if epoch is not None:
+            epoch, datagram = epoch
+            if not self._check_epoch(addr, epoch):
+                return None
+        # only genuine datagrams create or refresh peer statistics
+        self.peer_stats.received(addr, size)
+        header = unpack_ack_header(datagram)
+        if header is not None:
+            latest, bits, datagram = header
+            for seq in acked_sequences(latest, bits):
+                self._ack_received((addr, seq))
+        if datagram.startswith(FRAG_TAG):
+            # nothing to decode until the last fragment arrives
+            return self.fragments.add(addr, datagram)
+        return datagram
+
+    def _check_epoch(self, addr: Tuple[str, int], epoch: int) -> bool:
+        """Track the session of ``addr``; ``False`` means a stale datagram."""
+        known = self._peer_epochs.get(addr)
+        if known == epoch:
+            return True
+        if self._retired_epochs.get(addr) == epoch:
+            # sent before the restart but delivered after it
+            return False
+        self._peer_epochs[addr] = epoch
+        if known is not None:
+            self._retired_epochs[addr] = known
+            self._forget_session(addr)
+        return True
+
+    def _forget_session(self, addr: Tuple[str, int]) -> None:
+        """Drop sequencing state kept for a peer that restarted."""
+        self.sessions_reset += 1
+        self._ack_windows.pop(addr, None)
+        self._reliable_seq.pop(addr, None)
+        for key in [k for k in self._pending_acks if k[0] == addr]:
+            del self._pending_acks[key]
+            self._resent.discard(key)
+        for table in (self._channels, self._channel_seq):
+            for key in [k for k in table if k[0] == addr]:
+                del table[key]
+        receiver = self.input_receivers.get(addr)
+        if receiver is not None:
+            receiver.latest = 0
+        # the peer lost our delta baseline; the next update must be complete
+        self._client_syncs.pop(addr, None)
+        if self.scheduler is not None:
+            self.scheduler.forget(addr)
+        self._sync.last_state = {}
+
+    def _decode_all(self, datagram: bytes, addr: Tuple[str, int]) -> List[dict[str, Any]]:
+        """Decode every valid packet carried by a possibly bundled datagram."""
+        body = self._unframe(datagram, addr)
+        if not body:
+            return []
+        messages = []
+        for packet in unpack_bundle(body):
+            data = self._decode(packet)
+            if data is not None:
+                messages.append(data)
+        return messages
+
+    def _send(self, payload: bytes, addr: Tuple[str, int]) -> None:
+        """Send an encoded packet now or queue it for :meth:`flush`."""
+        if self.coalesce:
+            self._outbox.setdefault(addr, []).append(payload)
+            return
+        self._transmit(payload, addr)
+
+    def _body_budget(self) -> int:
+        # room left in ``mtu`` after the headers and MAC added by _frame
+        protection = self._cipher or self._signer
+        return self.mtu - EPOCH_HEADER - 9 - (protection.size if protection else 0)
+
+    def _transmit(self, body: bytes, addr: Tuple[str, int]) -> None:
+        """Frame ``body`` and write it to ``addr``, fragmenting it past ``mtu``."""
+        budget = self._body_budget()
+        if len(body) > budget:
+            for fragment in split_fragments(body, next(self._fragment_ids), budget):
+                self._transmit(fragment, addr)
+                self.fragments_sent += 1
+            return
+        datagram = self._frame(body, addr)
+        self._write(datagram, addr)
+        self.packets_sent += 1
+        self.bytes_sent += len(datagram)
+        self.peer_stats.sent(addr, len(datagram))
+
+    def _write(self, datagram: bytes, addr: Tuple[str, int]) -> None:
+        self.sock.sendto(datagram, addr)
+
+    def flush(self) -> None:
+        """Send queued packets, one bundled datagram per destination and MTU."""
+        outbox, self._outbox = self._outbox, {}
+        budget = self._body_budget()
+        for addr, payloads in outbox.items():
+            for datagram in pack_bundle(payloads, budget):
+                try:
+                    self._transmit(datagram, addr)
+                except OSError:
+                    pass
+        self._flush_acks()
+
+    def _flush_acks(self) -> None:
+        """Send header-only datagrams to peers with unreported receipts."""
+        for addr, window in self._ack_windows.items():
+            if window.dirty:
+                try:
+                    self._transmit(b"", addr)
+                except OSError:
+                    window.dirty = False
 
     def broadcast_announce(self, nodes: List[Tuple[str, int]] | None = None) -> None:
         """Broadcast our presence to known nodes."""
@@ -90,7 +358,7 @@ class NetworkManager:
         msg = self._encode({"type": "announce"})
         for node in nodes:
             try:
-                self.sock.sendto(msg, tuple(node))
+                self._send(msg, tuple(node))
             except OSError:
                 pass
 
@@ -101,7 +369,7 @@ class NetworkManager:
         msg = self._encode({"type": "register"})
         for node in nodes:
             try:
-                self.sock.sendto(msg, tuple(node))
+                self._send(msg, tuple(node))
             except OSError:
                 pass
 
@@ -112,16 +380,30 @@ class NetworkManager:
         msg = self._encode({"type": "client_join"})
         for node in nodes:
             try:
-                self.sock.sendto(msg, tuple(node))
+                self._send(msg, tuple(node))
+            except OSError:
+                pass
+
+    def heartbeat(self, nodes: List[Tuple[str, int]] | None = None) -> None:
+        """Renew this game's or client's registration leases on router nodes."""
+        if nodes is None:
+            nodes = load_nodes()
+        msg = self._encode({"type": "heartbeat"})
+        for node in nodes:
+            try:
+                self._send(msg, tuple(node))
             except OSError:
                 pass
 
     def refresh_nodes(self) -> None:
         """Prune unreachable nodes from the registry."""
-        prune_nodes(lambda n: NetworkManager.ping_node(n, timeout=self.ack_timeout))
+        latencies = NetworkManager.ping_nodes(
+            load_nodes(), timeout=self.ack_timeout, secret=self.secret, aead_key=self.aead_key
+        )
+        prune_nodes(latencies.get)
 
     def broadcast_games(self, nodes: List[Tuple[str, int]] | None = None) -> None:
-        """Share our current game list with other nodes."""
+        """Push our complete game list, e.g. to routers without gossip."""
         if not self.host:
             return
         if nodes is None:
@@ -131,12 +413,12 @@ class NetworkManager:
             if node == self.sock.getsockname():
                 continue
             try:
-                self.sock.sendto(payload, tuple(node))
+                self._send(payload, tuple(node))
             except OSError:
                 pass
 
     def broadcast_clients(self, nodes: List[Tuple[str, int]] | None = None) -> None:
-        """Share our active client list with other nodes."""
+        """Push our complete client list, e.g. to routers without gossip."""
         if not self.host:
             return
         if nodes is None:
@@ -146,42 +428,151 @@ class NetworkManager:
             if node == self.sock.getsockname():
                 continue
             try:
-                self.sock.sendto(payload, tuple(node))
+                self._send(payload, tuple(node))
             except OSError:
                 pass
 
+    def _set_entry(self, table: str, addr: Tuple[str, int], alive: bool = True) -> None:
+        """Change a router list locally and gossip the change."""
+        if self.gossip.set(table, addr, alive):
+            self._apply_entry(table, addr, alive)
+            self.gossip_round()
+
+    def _apply_entry(
+        self, table: str, addr: Tuple[str, int], alive: bool, ttl: float | None = None
+    ) -> None:
+        target = self.games if table == "games" else self.live_clients
+        key = (table, addr)
+        if alive:
+            target.add(addr)
+            self._lease(key, self.lease_time * 2 if ttl is None else ttl)
+        else:
+            target.discard(addr)
+            self._leases.pop(key, None)
+            self._stamped.pop(key, None)
+
+    def _lease(self, key: Tuple[str, Tuple[str, int]], ttl: float) -> None:
+        expiry = time.monotonic() + ttl
+        self._leases[key] = expiry
+        heapq.heappush(self._lease_heap, (expiry, key))
+
+    def _refresh(self, table: str, addr: Tuple[str, int]) -> None:
+        """Renew the lease of a game or client registered with this router."""
+        key = (table, addr)
+        now = time.monotonic()
+        # re-stamp about twice per lease so other routers renew theirs too
+        touch = now - self._stamped.get(key, now - self.lease_time) >= self.lease_time / 2
+        if self.gossip.set(table, addr, True, touch=touch):
+            self._stamped[key] = now
+            self._apply_entry(table, addr, True, self.lease_time)
+            self.gossip_round()
+        else:
+            self._lease(key, self.lease_time)
+
+    def expire_leases(self, now: float | None = None) -> int:
+        """Drop entries whose lease ran out and gossip their removal."""
+        if not self.host:
+            return 0
+        if now is None:
+            now = time.monotonic()
+        expired = 0
+        while self._lease_heap and self._lease_heap[0][0] <= now:
+            expiry, key = heapq.heappop(self._lease_heap)
+            # skip heap entries superseded by a later renewal
+            if self._leases.get(key) != expiry:
+                continue
+            del self._leases[key]
+            if self.gossip.set(key[0], key[1], False):
+                self._apply_entry(key[0], key[1], False)
+                expired += 1
+        if expired:
+            self.leases_expired += expired
+            self.gossip_round()
+        return expired
+
+    def _gossip_to(self, node: Tuple[str, int]) -> None:
+        """Send ``node`` everything it lacks, ``MAX_ENTRIES`` per datagram."""
+        while True:
+            msg = self.gossip.delta_for(node)
+            if msg is None:
+                return
+            try:
+                self._send(self._encode(msg), node)
+            except OSError:
+                self.gossip.forget_peer(node)
+                return
+
+    def gossip_round(self, nodes: List[Tuple[str, int]] | None = None) -> None:
+        """Send every router the list entries it has not seen yet."""
+        if not self.host:
+            return
+        if nodes is None:
+            nodes = load_nodes()
+        me = self.sock.getsockname()
+        for node in nodes:
+            if tuple(node) != me:
+                self._gossip_to(tuple(node))
+
+    def _send_digest(self, node: Tuple[str, int]) -> None:
+        try:
+            self._send(self._encode(self.gossip.digest()), node)
+        except OSError:
+            pass
+
+    def announce_chain(self, nodes: List[Tuple[str, int]] | None = None) -> None:
+        """Tell nodes our chain height and tip so longer chains get synced."""
+        if nodes is None:
+            nodes = load_nodes()
+        try:
+            payload = self._encode(self.chain_sync.status())
+        except (KeyError, TypeError):
+            return
+        me = self.sock.getsockname()
+        for node in nodes:
+            if tuple(node) == me:
+                continue
+            try:
+                self._send(payload, tuple(node))
+            except OSError:
+                pass
+
+    def gossip_tick(self, now: float | None = None) -> None:
+        """Expire leases and run anti-entropy every ``digest_interval``."""
+        if not self.host:
+            return
+        if now is None:
+            now = time.monotonic()
+        self.expire_leases(now)
+        if now < self._next_digest:
+            return
+        self._next_digest = now + self.digest_interval
+        me = self.sock.getsockname()
+        peers = [tuple(node) for node in load_nodes() if tuple(node) != me]
+        if peers:
+            peer = random.choice(peers)
+            self._send_digest(peer)
+            self.announce_chain([peer])
+
     @staticmethod
     def request_games(
         node: Tuple[str, int],
         timeout: float = 0.5,
         process_host=None,
         secret: bytes | None = None,
+        aead_key: bytes | None = None,
     ) -> List[Tuple[str, int]]:
-        """Ask a router node for known game hosts."""
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(timeout)
-        enc = NetworkManager(secret=secret)
-        msg = enc._encode({"type": "find"})
-        sock.sendto(msg, node)
-        games: List[Tuple[str, int]] = []
-        start = time.monotonic()
-        while True:
-            if process_host is not None:
-                process_host()
-            try:
-                packet, _ = sock.recvfrom(4096)
-            except socket.timeout:
-                break
-            data = enc._decode(packet)
-            if data is None:
-                continue
-            if data.get("type") == "games":
-                for host, port in data.get("games", []):
-                    games.append((host, int(port)))
-            if time.monotonic() - start > timeout:
-                break
-        sock.close()
-        return games
+        """Ask a router node for known game hosts.
+
+        Returns as soon as the node answers instead of waiting out ``timeout``.
+        """
+        enc = NetworkManager(secret=secret, aead_key=aead_key)
+        prober = NodeProber(enc)
+        try:
+            futures = prober.find_games([node])
+            prober.wait(timeout, process_host)
+        finally:
+            enc.sock.close()
+        return futures[tuple(node)].result()
 
     @staticmethod
     def request_clients(
@@ -189,51 +580,81 @@ class NetworkManager:
         timeout: float = 0.5,
         process_host=None,
         secret: bytes | None = None,
+        aead_key: bytes | None = None,
     ) -> List[Tuple[str, int]]:
-        """Ask a router node for known live clients."""
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(timeout)
-        enc = NetworkManager(secret=secret)
-        msg = enc._encode({"type": "list_clients"})
-        sock.sendto(msg, node)
-        clients: List[Tuple[str, int]] = []
-        start = time.monotonic()
-        while True:
-            if process_host is not None:
-                process_host()
-            try:
-                packet, _ = sock.recvfrom(4096)
-            except socket.timeout:
-                break
-            data = enc._decode(packet)
-            if data is None:
-                continue
-            if data.get("type") == "clients":
-                for host, port in data.get("clients", []):
-                    clients.append((host, int(port)))
-            if time.monotonic() - start > timeout:
-                break
-        sock.close()
-        return clients
+        """Ask a router node for known live clients.
+
+        Returns as soon as the node answers instead of waiting out ``timeout``.
+        """
+        enc = NetworkManager(secret=secret, aead_key=aead_key)
+        prober = NodeProber(enc)
+        try:
+            futures = prober.list_clients([node])
+            prober.wait(timeout, process_host)
+        finally:
+            enc.sock.close()
+        return futures[tuple(node)].result()
 
     def send_state(self, data: dict[str, Any]) -> None:
         """Send a state update using delta compression."""
+        if self.host and self.input_entities:
+            data = self._stamp_inputs(data)
+        if self.host and (self.scheduler is not None or self.interest is not None):
+            self._send_state_per_client(data)
+            return
         payload = self._encode(self._sync.encode(data))
-        
-    def send_state(self, data: dict[str, Any]) -> None:
-        """Send a state update using delta compression."""
-        payload = self._encode(self._sync.encode(data))
-        
-    def send_state(self, data: dict[str, Any]) -> None:
-        payload = json.dumps(data).encode("utf-8")
         if self.host:
             for client in list(self.clients):
                 try:
-                    self.sock.sendto(payload, client)
+                    self._send(payload, client)
                 except OSError:
                     pass
         else:
-            self.sock.sendto(payload, self.address)
+            self._send(payload, self.address)
+
+    def send_input(self, msg: dict[str, Any]) -> None:
+        """Send an ``input`` or ``inputs`` message to the host or peer."""
+        self._send(self._encode(msg), self.address)
+
+    def bind_input(self, addr: Tuple[str, int], entity: str) -> None:
+        """Publish the last input applied from ``addr`` as ``<entity>.input_seq``.
+
+        Clients predicting ``entity`` reconcile against that field.
+        """
+        self.input_entities[tuple(addr)] = entity
+
+    def _stamp_inputs(self, data: dict[str, Any]) -> dict[str, Any]:
+        stamped = dict(data)
+        for addr, entity in self.input_entities.items():
+            receiver = self.input_receivers.get(addr)
+            if receiver is not None and receiver.latest:
+                stamped[entity + ".input_seq"] = receiver.latest
+        return stamped
+
+    def input_stats(self) -> dict[str, int]:
+        """Total inputs received, recovered from history and lost by clients."""
+        totals = {"received": 0, "recovered": 0, "lost": 0}
+        for receiver in self.input_receivers.values():
+            totals["received"] += receiver.received
+            totals["recovered"] += receiver.recovered
+            totals["lost"] += receiver.lost
+        return totals
+
+    def _send_state_per_client(self, data: dict[str, Any]) -> None:
+        if self.interest is not None:
+            self.interest.index(data)
+        for client in list(self.clients):
+            view = data if self.interest is None else self.interest.filter(client, data)
+            if self.scheduler is not None:
+                delta = self.scheduler.select(client, view)
+                if delta is None:
+                    continue
+            else:
+                delta = self._client_syncs.setdefault(client, StateSync()).encode(view)
+            try:
+                self._send(self._encode(delta), client)
+            except OSError:
+                pass
 
     def send_reliable(
         self,
@@ -241,57 +662,296 @@ class NetworkManager:
         addr: Tuple[str, int] | None = None,
         max_retries: int = 5,
         importance: int = 1,
+        channel: Any = None,
     ) -> None:
         """Send a packet that will be resent until acknowledged.
 
         ``importance`` controls how quickly resends occur and how many
         attempts are made. Higher values mean more frequent retries.
+        Sequence numbers are counted per destination so the receiver can
+        acknowledge them with a compact ack header. Packets sharing a
+        ``channel`` are delivered to the receiver in the order they were sent.
         """
-        self._reliable_seq += 1
-        seq = self._reliable_seq
-        packet = data.copy()
-        packet["reliable"] = True
-        packet["seq"] = seq
-        payload = self._encode(packet)
         if addr is None:
             dests = list(self.clients) if self.host else [self.address]
         else:
             dests = [addr]
         now = time.monotonic()
         for dest in dests:
+            seq = self._reliable_seq.get(dest, 0) + 1
+            self._reliable_seq[dest] = seq
+            packet = data.copy()
+            packet["reliable"] = True
+            packet["seq"] = seq
+            if channel is not None:
+                cseq = self._channel_seq.get((dest, channel), 0) + 1
+                self._channel_seq[(dest, channel)] = cseq
+                packet["channel"] = channel
+                packet["cseq"] = cseq
+            payload = self._encode(packet)
             try:
-                self.sock.sendto(payload, dest)
-                self._pending_acks[(dest, seq)] = (
-                    payload,
-                    now,
-                    max_retries * importance,
-                    importance,
-                )
+                self._send(payload, dest)
+                self._track_reliable((dest, seq), payload, now, max_retries * importance, importance)
+                self.peer_stats[dest].reliable_sent += 1
             except OSError:
                 pass
 
+    def _track_reliable(
+        self,
+        key: Tuple[Tuple[str, int], int],
+        payload: bytes,
+        sent: float,
+        retries: int,
+        importance: int,
+    ) -> None:
+        self._pending_acks[key] = (payload, sent, retries, importance)
+        deadline = sent + self.ack_timeout / importance
+        heapq.heappush(self._resend_heap, (deadline, next(self._resend_order), key, sent))
+
     def process_reliable(self) -> None:
-        """Resend any unacknowledged reliable packets."""
+        """Resend unacknowledged reliable packets whose deadline has passed.
+
+        Only packets that are due are touched, so the cost per call does not
+        grow with the number of packets in flight.
+        """
         now = time.monotonic()
-        for key, (payload, sent, retries, importance) in list(
-            self._pending_acks.items()
-        ):
-            if now - sent < self.ack_timeout / importance:
+        heap = self._resend_heap
+        while heap and heap[0][0] <= now:
+            _, _, key, queued = heapq.heappop(heap)
+            entry = self._pending_acks.get(key)
+            if entry is None or entry[1] != queued:
                 continue
-            addr, seq = key
+            payload, _, retries, importance = entry
             if retries <= 0:
                 del self._pending_acks[key]
+                self._resent.discard(key)
+                self.reliable_expired += 1
+                self.peer_stats[key[0]].expired += 1
                 continue
             try:
-                self.sock.sendto(payload, addr)
-                self._pending_acks[key] = (
-                    payload,
-                    now,
-                    retries - 1,
-                    importance,
-                )
+                self._send(payload, key[0])
             except OSError:
                 del self._pending_acks[key]
+                self._resent.discard(key)
+                continue
+            self.retransmits += 1
+            self.peer_stats[key[0]].resends += 1
+            self._resent.add(key)
+            self._track_reliable(key, payload, now, retries - 1, importance)
+
+    def _ack_received(self, key: Tuple[Tuple[str, int], int]) -> None:
+        entry = self._pending_acks.pop(key, None)
+        if entry is not None:
+            latency = time.monotonic() - entry[1]
+            self.acks_received += 1
+            self.ack_latency_total += latency
+            if key in self._resent:
+                self._resent.discard(key)
+            else:
+                self.peer_stats[key[0]].observe_rtt(latency)
+
+    def average_ack_latency(self) -> float | None:
+        """Return the mean time from (re)send to ack, or ``None`` if no acks."""
+        if not self.acks_received:
+            return None
+        return self.ack_latency_total / self.acks_received
+
+    def ping(self, nodes: List[Tuple[str, int]] | None = None) -> None:
+        """Ping peers so their ``peer_stats`` get RTT samples.
+
+        Defaults to the connected clients on a host and the host on a client.
+        Replies are consumed by :meth:`poll`; unanswered pings expire after
+        ``ack_timeout`` times ten.
+        """
+        if nodes is None:
+            nodes = list(self.clients) if self.host else [self.address]
+        now = time.monotonic()
+        horizon = now - self.ack_timeout * 10
+        for nonce in [n for n, (_, sent) in self._pings.items() if sent < horizon]:
+            del self._pings[nonce]
+        for node in nodes:
+            nonce = next(self._ping_nonces) & 0xFFFFFFFF
+            try:
+                self._send(self._encode({"type": "ping", "nonce": nonce}), tuple(node))
+            except OSError:
+                continue
+            self._pings[nonce] = (tuple(node), now)
+
+    @staticmethod
+    def _reply(request: dict[str, Any], resp: dict[str, Any]) -> dict[str, Any]:
+        """Echo the probe nonce of ``request`` into ``resp``."""
+        if "nonce" in request:
+            resp["nonce"] = request["nonce"]
+        return resp
+
+    def _handle_packet(
+        self, packet: bytes, addr: Tuple[str, int]
+    ) -> List[dict[str, Any]]:
+        """Process one packet and return the messages the game should see.
+
+        Duplicate reliable packets are dropped here and messages on an
+        ordered channel are held back until their predecessors arrive.
+        """
+        data = self._decode(packet)
+        if data is None:
+            return []
+        seq = data.get("seq")
+        if data.get("type") == "ack":
+            if _is_seq(seq):
+                self._ack_received((addr, seq))
+            return []
+        if not (data.get("reliable") and "seq" in data):
+            if "type" not in data and addr in self._peer_epochs:
+                # lets StateSync notice that the sender restarted
+                data["epoch"] = self._peer_epochs[addr]
+            msg = self._dispatch(data, addr)
+            return [] if msg is None else [msg]
+        if not _is_seq(seq):
+            # a malformed header cannot be acked or ordered
+            return []
+        if "channel" in data and not (
+            isinstance(data["channel"], (str, int)) and _is_seq(data.get("cseq", 0))
+        ):
+            return []
+        window = self._ack_windows.setdefault(addr, AckWindow())
+        is_new = window.record(seq)
+        if not window.covers(seq):
+            # too old for the ack header, acknowledge it explicitly
+            self._send(self._encode({"type": "ack", "seq": seq}), addr)
+        if not is_new:
+            # a resend whose ack was lost; the game already has it
+            self.duplicates_dropped += 1
+            return []
+        if "channel" in data:
+            channel = self._channels.setdefault((addr, data["channel"]), OrderedChannel())
+            ready = channel.push(data.get("cseq", 0), data)
+        else:
+            ready = [data]
+        messages = []
+        for data in ready:
+            msg = self._dispatch(data, addr)
+            if msg is not None:
+                messages.append(msg)
+        return messages
+
+    def _dispatch(
+        self, data: dict[str, Any], addr: Tuple[str, int]
+    ) -> dict[str, Any] | None:
+        """Handle one message and return it if the game should see it.
+
+        Control traffic such as announcements, registrations and pings is
+        answered here and ``None`` is returned.
+        """
+        msg_type = data.get("type")
+        if msg_type == "announce":
+            add_node(addr)
+            if self.host:
+                self.clients.add(addr)
+                # exchange clocks so each side sends only what the other lacks
+                self._send_digest(addr)
+                self._gossip_to(addr)
+                self.announce_chain([addr])
+            return None
+        if msg_type == "register" and self.host:
+            # save address of a game host for DNS-like routing
+            self._refresh("games", addr)
+            return None
+        if msg_type == "client_join" and self.host:
+            self._refresh("clients", addr)
+            return None
+        if msg_type == "heartbeat" and self.host:
+            for table in ("games", "clients"):
+                if addr in (self.games if table == "games" else self.live_clients):
+                    self._refresh(table, addr)
+            return None
+        if msg_type == "gossip" and self.host:
+            gaps = self.gossip.gaps
+            for (table, entry), alive in self.gossip.receive(data):
+                self._apply_entry(table, entry, alive)
+            if self.gossip.gaps != gaps:
+                # we missed an earlier delta; ask for a resync
+                self._send_digest(addr)
+            return None
+        if msg_type == "digest" and self.host:
+            self.gossip.receive_digest(addr, data)
+            self._gossip_to(addr)
+            if self.gossip.behind(data):
+                self._send_digest(addr)
+            return None
+        if msg_type == "find" and self.host:
+            resp = self._encode(self._reply(data, {"type": "games", "games": list(self.games)}))
+            self._send(resp, addr)
+            return None
+        if msg_type in ("games_update", "clients_update") and self.host:
+            # full lists from routers without gossip join the versioned tables
+            table = "games" if msg_type == "games_update" else "clients"
+            entries = data.get(table, [])
+            if not isinstance(entries, list):
+                return None
+            changed = False
+            for host_port in map(parse_addr, entries):
+                if host_port is None:
+                    continue
+                if self.gossip.set(table, host_port):
+                    self._apply_entry(table, host_port, True)
+                    changed = True
+            if changed:
+                self.gossip_round()
+            return None
+        if msg_type == "list_clients" and self.host:
+            resp = self._encode(
+                self._reply(data, {"type": "clients", "clients": list(self.live_clients)})
+            )
+            self._send(resp, addr)
+            return None
+        if isinstance(msg_type, str) and msg_type.startswith("chain_"):
+            # block-range sync, see :mod:`chain_sync`
+            for reply in self.chain_sync.handle(addr, data):
+                self.send_reliable(reply, addr)
+            return None
+        if msg_type == "ping":
+            # reply with a pong for latency checks
+            resp = self._encode(self._reply(data, {"type": "pong"}))
+            self._send(resp, addr)
+            return None
+        nonce = data.get("nonce")
+        if msg_type == "pong" and isinstance(nonce, int) and nonce in self._pings:
+            peer, sent = self._pings.pop(nonce)
+            if peer == addr:
+                self.peer_stats[addr].observe_rtt(time.monotonic() - sent)
+            return None
+        if msg_type == "inputs" and self.host:
+            # keep only inputs this client has not delivered before
+            receiver = self.input_receivers.setdefault(addr, InputReceiver())
+            new = receiver.receive(data)
+            self.clients.add(addr)
+            return dict(data, new=new) if new else None
+        if msg_type == "inputs_resend" and not is_inputs(data):
+            # answers to lockstep resend requests bypass the receiver above
+            return None
+        if self.host:
+            if msg_type == "discover":
+                # respond to discovery with address for client to connect
+                resp = self._encode({"type": "host"})
+                self._send(resp, addr)
+                return None
+            self.clients.add(addr)
+        return data
+
+    def _receive(
+        self, datagram: bytes, addr: Tuple[str, int]
+    ) -> List[Tuple[Tuple[str, int], dict[str, Any]]]:
+        """Unpack a datagram and return the game messages it carried."""
+        self.packets_received += 1
+        self.bytes_received += len(datagram)
+        body = self._unframe(datagram, addr)
+        if not body:
+            return []
+        messages = []
+        for packet in unpack_bundle(body):
+            for data in self._handle_packet(packet, addr):
+                messages.append((addr, data))
+        return messages
 
     def poll(self) -> List[Tuple[Tuple[str, int], dict[str, Any]]]:
         messages = []
@@ -300,71 +960,31 @@ class NetworkManager:
                 packet, addr = self.sock.recvfrom(4096)
             except BlockingIOError:
                 break
-            data = self._decode(packet)
-            if data is None:
-                continue
-            msg_type = data.get("type")
-            if msg_type == "ack":
-                self._pending_acks.pop((addr, data.get("seq")), None)
-                continue
-            if data.get("reliable") and "seq" in data:
-                ack = self._encode({"type": "ack", "seq": data["seq"]})
-                self.sock.sendto(ack, addr)
-            if msg_type == "announce":
-                add_node(addr)
-                if self.host:
-                    self.clients.add(addr)
-                    # share our known games and clients with the new node
-                    self.broadcast_games([addr])
-                    self.broadcast_clients([addr])
-                continue
-            if msg_type == "register" and self.host:
-                # save address of a game host for DNS-like routing
-                self.games.add(addr)
-                # notify peers about the updated list
-                self.broadcast_games()
-                continue
-            if msg_type == "client_join" and self.host:
-                self.live_clients.add(addr)
-                self.broadcast_clients()
-                continue
-            if msg_type == "find" and self.host:
-                resp = self._encode({"type": "games", "games": list(self.games)})
-                self.sock.sendto(resp, addr)
-                continue
-            if msg_type == "games_update" and self.host:
-                for host_port in data.get("games", []):
-                    self.games.add(tuple(host_port))
-                continue
-            if msg_type == "clients_update" and self.host:
-                for host_port in data.get("clients", []):
-                    self.live_clients.add(tuple(host_port))
-                continue
-            if msg_type == "list_clients" and self.host:
-                resp = self._encode({"type": "clients", "clients": list(self.live_clients)})
-                self.sock.sendto(resp, addr)
-                continue
-            if msg_type == "ping":
-                # reply with a pong for latency checks
-                resp = self._encode({"type": "pong"})
-                self.sock.sendto(resp, addr)
-                continue
-            if self.host:
-                if msg_type == "discover":
-                    # respond to discovery with address for client to connect
-                    resp = self._encode({"type": "host"})
-            try:
-                data = json.loads(packet.decode("utf-8"))
-            except json.JSONDecodeError:
-                continue
-            if self.host:
-                if data.get("type") == "discover":
-                    # respond to discovery with address for client to connect
-                    resp = json.dumps({"type": "host"}).encode("utf-8")
-                    self.sock.sendto(resp, addr)
-                    continue
-                self.clients.add(addr)
-            messages.append((addr, data))
+            messages.extend(self._receive(packet, addr))
+        messages.extend(self.housekeeping())
+        if not self.coalesce:
+            self._flush_acks()
+        return messages
+
+    def housekeeping(
+        self, now: float | None = None
+    ) -> List[Tuple[Tuple[str, int], dict[str, Any]]]:
+        """Periodic upkeep shared by ``poll`` and the async resend loop.
+
+        Returns game messages released from ordered channels on the way.
+        """
+        messages = []
+        for (addr, _), channel in list(self._channels.items()):
+            # release channels still blocked on a message the sender gave up on
+            for data in channel.expire():
+                msg = self._dispatch(data, addr)
+                if msg is not None:
+                    messages.append((addr, msg))
+        if now is None:
+            now = time.monotonic()
+        if now >= self._next_stats_expiry:
+            self._next_stats_expiry = now + self.peer_stats.max_idle / 4
+            self.peer_stats.expire(now)
         return messages
 
     @staticmethod
@@ -374,37 +994,29 @@ class NetworkManager:
         broadcast_address: str = "255.255.255.255",
         process_host=None,
         secret: bytes | None = None,
+        aead_key: bytes | None = None,
     ) -> List[Tuple[str, int]]:
         """Broadcast a discovery packet and return responding server addresses."""
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-        sock.bind(("", 0))
-        sock.settimeout(timeout)
-        enc = NetworkManager(secret=secret)
-        msg = enc._encode({"type": "discover"})
-        msg = json.dumps({"type": "discover"}).encode("utf-8")
-        sock.sendto(msg, (broadcast_address, port))
+        enc = NetworkManager(secret=secret, aead_key=aead_key)
+        enc.sock.settimeout(timeout)
         hosts: List[Tuple[str, int]] = []
         start = time.monotonic()
-        while True:
-            if process_host is not None:
-                process_host()
-            try:
-                packet, addr = sock.recvfrom(4096)
-            except socket.timeout:
-                break
-            data = enc._decode(packet)
-            if data is None:
-
-            try:
-                data = json.loads(packet.decode("utf-8"))
-            except json.JSONDecodeError:
-                continue
-            if data.get("type") == "host":
-                hosts.append(addr)
-            if time.monotonic() - start > timeout:
-                break
-        sock.close()
+        try:
+            # framed like any other packet so hosts with a secret or key accept it
+            enc._transmit(enc._encode({"type": "discover"}), (broadcast_address, port))
+            while True:
+                if process_host is not None:
+                    process_host()
+                try:
+                    packet, addr = enc.sock.recvfrom(4096)
+                except socket.timeout:
+                    break
+                if any(data.get("type") == "host" for data in enc._decode_all(packet, addr)):
+                    hosts.append(addr)
+                if time.monotonic() - start > timeout:
+                    break
+        finally:
+            enc.sock.close()
         return hosts
 
     @staticmethod
@@ -413,31 +1025,34 @@ class NetworkManager:
         timeout: float = 0.2,
         process_host=None,
         secret: bytes | None = None,
+        aead_key: bytes | None = None,
     ) -> float | None:
         """Return round-trip latency to addr in seconds or None if unreachable."""
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(timeout)
-        enc = NetworkManager(secret=secret)
-        msg = enc._encode({"type": "ping"})
-        start = time.monotonic()
-        try:
-            sock.sendto(msg, addr)
-            while True:
-                if process_host is not None:
-                    process_host()
-                packet, _ = sock.recvfrom(4096)
-                break
-        except (socket.timeout, OSError):
-            sock.close()
-            return None
-        sock.close()
+        return NetworkManager.ping_nodes(
+            [addr], timeout, process_host, secret, aead_key
+        )[tuple(addr)]
+
+    @staticmethod
+    def ping_nodes(
+        nodes: List[Tuple[str, int]],
+        timeout: float = 0.2,
+        process_host=None,
+        secret: bytes | None = None,
+        aead_key: bytes | None = None,
+    ) -> dict[Tuple[str, int], float | None]:
+        """Ping every node at once and return latencies keyed by node.
+
+        Unreachable nodes map to ``None``. The call returns as soon as every
+        node has answered.
+        """
+        enc = NetworkManager(secret=secret, aead_key=aead_key)
+        prober = NodeProber(enc)
         try:
-            data = enc._decode(packet)
-        except json.JSONDecodeError:
-            return None
-        if data.get("type") != "pong":
-            return None
-        return time.monotonic() - start
+            futures = prober.ping(nodes)
+            prober.wait(timeout, process_host)
+        finally:
+            enc.sock.close()
+        return {node: fut.result() for node, fut in futures.items()}
 
     @staticmethod
     def select_best_node(
@@ -445,9 +1060,13 @@ class NetworkManager:
         ping_func=None,
         timeout: float = 0.2,
     ) -> Tuple[str, int] | None:
-        """Return the node with the lowest latency from a list of addresses."""
+        """Return the node with the lowest latency from a list of addresses.
+
+        Without ``ping_func`` all nodes are probed concurrently.
+        """
         if ping_func is None:
-            ping_func = lambda n: NetworkManager.ping_node(n, timeout)
+            latencies = NetworkManager.ping_nodes(nodes, timeout)
+            ping_func = lambda n: latencies[tuple(n)]
         best = None
         best_latency = float("inf")
         for node in nodes:
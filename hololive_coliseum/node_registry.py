@@ -1,6 +1,14 @@
+import atexit
 import json
 import os
-from typing import List, Tuple
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no fork, so one process owns the file
+    fcntl = None
 
 # Directory used by save_manager; ensure it exists
 SAVE_DIR = os.path.join(os.path.dirname(__file__), '..', 'SavedGames')
@@ -10,39 +18,157 @@ NODES_FILE = os.path.join(SAVE_DIR, 'nodes.json')
 # Built-in nodes that ship with the game for discovery
 DEFAULT_NODES: List[Tuple[str, int]] = [("127.0.0.1", 50007)]
 
+# seconds to wait after a change before writing the registry to disk
+FLUSH_DELAY = 1.0
 
-def load_nodes() -> List[Tuple[str, int]]:
-    """Return a list of known nodes from file plus defaults."""
-    nodes: List[Tuple[str, int]] = list(DEFAULT_NODES)
-    if os.path.exists(NODES_FILE):
+
+class NodeRegistry:
+    """Known nodes kept in memory and written to disk behind a timer.
+
+    The file is read once on creation. Changes only touch the in-memory set;
+    the first change arms a timer that writes the whole list ``delay``
+    seconds later through a temporary file and an atomic rename, so bursts
+    of announcements cost one write. Each write first merges in nodes other
+    processes saved since (under an advisory lock where ``fcntl`` exists),
+    except the ones this registry removed, so processes sharing the file do
+    not erase each other's additions.
+    """
+
+    def __init__(
+        self, path, defaults: Iterable[Tuple[str, int]] = (), delay: float = FLUSH_DELAY
+    ) -> None:
+        self.path = path
+        self.delay = delay
+        self.writes = 0
+        self._defaults = [tuple(node) for node in defaults]
+        # dict keys double as an insertion ordered set
+        self._nodes: Dict[Tuple[str, int], None] = dict.fromkeys(self._defaults)
+        self._lock = threading.Lock()
+        # serializes whole flushes so an older snapshot never replaces a newer
+        self._write_lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._dirty = False
+        # nodes dropped by replace() that a merge must not bring back
+        self._removed: Set[Tuple[str, int]] = set()
+        for node in self._read():
+            self._nodes.setdefault(node, None)
+
+    def _read(self) -> List[Tuple[str, int]]:
+        if not os.path.exists(self.path):
+            return []
         try:
-            with open(NODES_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            for host, port in data:
-                nodes.append((host, int(port)))
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return [(host, int(port)) for host, port in json.load(f)]
         except (json.JSONDecodeError, ValueError, TypeError):
-            pass
-    # remove duplicates preserving order
-    unique: List[Tuple[str, int]] = []
-    for node in nodes:
-        if node not in unique:
-            unique.append(node)
-    return unique
+            return []
+
+    def nodes(self) -> List[Tuple[str, int]]:
+        with self._lock:
+            return list(self._nodes)
+
+    def __contains__(self, node) -> bool:
+        return tuple(node) in self._nodes
+
+    def add(self, node: Tuple[str, int]) -> bool:
+        """Add ``node`` and return True if it was new."""
+        node = tuple(node)
+        if node in self._nodes:
+            return False
+        with self._lock:
+            self._nodes[node] = None
+            self._removed.discard(node)
+            self._mark_dirty()
+        return True
+
+    def replace(self, nodes: Iterable[Tuple[str, int]]) -> None:
+        """Swap in a new node list; defaults are always kept."""
+        with self._lock:
+            old = self._nodes
+            self._nodes = dict.fromkeys(self._defaults)
+            for node in nodes:
+                self._nodes.setdefault(tuple(node), None)
+            self._removed.update(node for node in old if node not in self._nodes)
+            self._removed.difference_update(self._nodes)
+            self._mark_dirty()
+
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Merge with the file and write pending changes to disk now."""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+            directory = os.path.dirname(os.fspath(self.path)) or '.'
+            os.makedirs(directory, exist_ok=True)
+            with open(f"{os.fspath(self.path)}.lock", 'a') as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                on_disk = self._read()
+                with self._lock:
+                    for node in on_disk:
+                        if node not in self._removed:
+                            self._nodes.setdefault(node, None)
+                    self._removed.clear()
+                    data = [list(node) for node in self._nodes]
+                fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(data, f)
+                    os.replace(tmp, self.path)
+                except BaseException:
+                    os.unlink(tmp)
+                    raise
+            self.writes += 1
+
+
+_REGISTRIES: Dict[str, NodeRegistry] = {}
+
+
+def get_registry() -> NodeRegistry:
+    """Return the shared registry for the current ``NODES_FILE``."""
+    key = os.path.abspath(os.fspath(NODES_FILE))
+    registry = _REGISTRIES.get(key)
+    if registry is None:
+        registry = _REGISTRIES[key] = NodeRegistry(NODES_FILE, DEFAULT_NODES)
+    return registry
+
+
+@atexit.register
+def flush_all() -> None:
+    """Write every registry with pending changes."""
+    for registry in list(_REGISTRIES.values()):
+        registry.flush()
+
+
+def load_nodes() -> List[Tuple[str, int]]:
+    """Return a list of known nodes from file plus defaults."""
+    return get_registry().nodes()
 
 
 def save_nodes(nodes: List[Tuple[str, int]]) -> None:
-    """Persist the node list to disk."""
-    os.makedirs(os.path.dirname(NODES_FILE), exist_ok=True)
-    with open(NODES_FILE, 'w', encoding='utf-8') as f:
-        json.dump(nodes, f)
+    """Persist the node list to disk.
+
+    ``DEFAULT_NODES`` are always kept, so they are written alongside
+    ``nodes`` even when the caller left them out.
+    """
+    registry = get_registry()
+    registry.replace(nodes)
+    registry.flush()
 
 
 def add_node(node: Tuple[str, int]) -> None:
     """Add a node to the registry if not already present."""
-    nodes = load_nodes()
-    if node not in nodes:
-        nodes.append(node)
-        save_nodes(nodes)
+    get_registry().add(node)
 
 
 def prune_nodes(ping_func, timeout: float = 0.2) -> None:
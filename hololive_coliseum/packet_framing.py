@@ -0,0 +1,280 @@
+"""Binary framing for datagrams that carry encoded packets.
+
+Plain packets from :func:`compress_packet` are base64 text, so a datagram that
+starts with a control byte below ``0x20`` is a frame built by this module.
+
+Bodies too large for one datagram are cut into fragments tagged with a
+message id, index and count, and :class:`Reassembler` puts them back
+together on the receiving side.
+
+An epoch header names the sender's session so a receiver can tell that a
+peer restarted on the same address and drop the sequencing state it kept
+for the old session.
+"""
+
+import hashlib
+import hmac
+import struct
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple
+
+BUNDLE_TAG = b"\x01"
+ACK_TAG = b"\x02"
+FRAG_TAG = b"\x03"
+EPOCH_TAG = b"\x04"
+_LEN = struct.Struct("!H")
+_ACK = struct.Struct("!II")
+_EPOCH = struct.Struct("!I")
+EPOCH_HEADER = len(EPOCH_TAG) + _EPOCH.size
+# message id, fragment index, fragment count
+_FRAG = struct.Struct("!IHH")
+FRAG_HEADER = len(FRAG_TAG) + _FRAG.size
+
+
+def _bundle(payloads: List[bytes]) -> bytes:
+    parts = [BUNDLE_TAG]
+    for payload in payloads:
+        parts.append(_LEN.pack(len(payload)))
+        parts.append(payload)
+    return b"".join(parts)
+
+
+def pack_bundle(payloads: Iterable[bytes], mtu: int = 1200) -> List[bytes]:
+    """Pack ``payloads`` into as few datagrams of at most ``mtu`` bytes as possible.
+
+    A datagram holding a single payload is sent unframed. Payloads that do not
+    fit in a bundle on their own are also passed through unchanged.
+    """
+    datagrams: List[bytes] = []
+    current: List[bytes] = []
+    size = len(BUNDLE_TAG)
+
+    def close() -> None:
+        if len(current) == 1:
+            datagrams.append(current[0])
+        elif current:
+            datagrams.append(_bundle(current))
+
+    for payload in payloads:
+        entry = _LEN.size + len(payload)
+        if len(payload) > 0xFFFF or len(BUNDLE_TAG) + entry > mtu:
+            close()
+            current, size = [], len(BUNDLE_TAG)
+            datagrams.append(payload)
+            continue
+        if current and size + entry > mtu:
+            close()
+            current, size = [], len(BUNDLE_TAG)
+        current.append(payload)
+        size += entry
+    close()
+    return datagrams
+
+
+def unpack_bundle(data: bytes) -> List[bytes]:
+    """Return the packets contained in a datagram.
+
+    Unframed datagrams are returned as a single packet. A truncated bundle
+    yields no packets at all.
+    """
+    if not data.startswith(BUNDLE_TAG):
+        return [data]
+    payloads: List[bytes] = []
+    pos = len(BUNDLE_TAG)
+    while pos < len(data):
+        if pos + _LEN.size > len(data):
+            return []
+        (length,) = _LEN.unpack_from(data, pos)
+        pos += _LEN.size
+        if pos + length > len(data):
+            return []
+        payloads.append(data[pos:pos + length])
+        pos += length
+    return payloads
+
+
+def pack_ack_header(latest: int, bits: int, body: bytes) -> bytes:
+    """Prefix ``body`` with an ack header for the peer's reliable packets."""
+    return ACK_TAG + _ACK.pack(latest & 0xFFFFFFFF, bits) + body
+
+
+def unpack_ack_header(data: bytes) -> tuple[int, int, bytes] | None:
+    """Split an ack header from ``data`` or return ``None`` if there is none."""
+    if not data.startswith(ACK_TAG) or len(data) < len(ACK_TAG) + _ACK.size:
+        return None
+    latest, bits = _ACK.unpack_from(data, len(ACK_TAG))
+    return latest, bits, data[len(ACK_TAG) + _ACK.size:]
+
+
+def pack_epoch_header(epoch: int, body: bytes) -> bytes:
+    """Prefix ``body`` with the sender's session epoch."""
+    return EPOCH_TAG + _EPOCH.pack(epoch & 0xFFFFFFFF) + body
+
+
+def unpack_epoch_header(data: bytes) -> tuple[int, bytes] | None:
+    """Split an epoch header from ``data`` or return ``None`` if there is none."""
+    if not data.startswith(EPOCH_TAG) or len(data) < EPOCH_HEADER:
+        return None
+    (epoch,) = _EPOCH.unpack_from(data, len(EPOCH_TAG))
+    return epoch, data[EPOCH_HEADER:]
+
+
+def split_fragments(body: bytes, msg_id: int, size: int) -> List[bytes]:
+    """Split ``body`` into numbered fragments of at most ``size`` bytes each."""
+    chunk = size - FRAG_HEADER
+    if chunk <= 0:
+        raise ValueError("fragment size too small for the header")
+    count = -(-len(body) // chunk)
+    if count > 0xFFFF:
+        raise ValueError("payload needs too many fragments")
+    msg_id &= 0xFFFFFFFF
+    return [
+        FRAG_TAG + _FRAG.pack(msg_id, index, count) + body[index * chunk:(index + 1) * chunk]
+        for index in range(count)
+    ]
+
+
+def unpack_fragment(data: bytes) -> Tuple[int, int, int, bytes] | None:
+    """Return ``(msg_id, index, count, chunk)`` or ``None`` if not a fragment."""
+    if not data.startswith(FRAG_TAG) or len(data) < FRAG_HEADER:
+        return None
+    msg_id, index, count = _FRAG.unpack_from(data, len(FRAG_TAG))
+    if count == 0 or index >= count:
+        return None
+    return msg_id, index, count, data[FRAG_HEADER:]
+
+
+class _Partial:
+    __slots__ = ("count", "chunks", "size", "started")
+
+    def __init__(self, count: int, started: float) -> None:
+        self.count = count
+        self.chunks: Dict[int, bytes] = {}
+        self.size = 0
+        self.started = started
+
+
+class Reassembler:
+    """Rebuild fragmented payloads in a bounded buffer.
+
+    Partial payloads are dropped ``timeout`` seconds after their first
+    fragment arrived. At most ``max_partial`` of them are kept, holding no
+    more than ``max_bytes`` in total, and no payload may exceed
+    ``max_message`` bytes; when a limit is hit the oldest partial payloads
+    are evicted first.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 2.0,
+        max_partial: int = 64,
+        max_bytes: int = 1 << 20,
+        max_message: int = 256 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.timeout = timeout
+        self.max_partial = max_partial
+        self.max_bytes = max_bytes
+        self.max_message = max_message
+        self.clock = clock
+        self.buffered = 0
+        self.completed = 0
+        self.expired = 0
+        self.evicted = 0
+        self.rejected = 0
+        # insertion order is arrival order of each payload's first fragment
+        self._partial: "OrderedDict[Tuple[Hashable, int], _Partial]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._partial)
+
+    def _drop(self, key: Tuple[Hashable, int]) -> None:
+        partial = self._partial.pop(key)
+        self.buffered -= partial.size
+
+    def expire(self, now: float | None = None) -> int:
+        """Drop partial payloads older than ``timeout``; return how many."""
+        if now is None:
+            now = self.clock()
+        dropped = 0
+        while self._partial:
+            key, partial = next(iter(self._partial.items()))
+            if now - partial.started < self.timeout:
+                break
+            self._drop(key)
+            dropped += 1
+        self.expired += dropped
+        return dropped
+
+    def add(self, peer: Hashable, data: bytes) -> bytes | None:
+        """Store one fragment from ``peer``; return the payload once complete."""
+        fragment = unpack_fragment(data)
+        if fragment is None:
+            self.rejected += 1
+            return None
+        msg_id, index, count, chunk = fragment
+        now = self.clock()
+        self.expire(now)
+        key = (peer, msg_id)
+        partial = self._partial.get(key)
+        if partial is None:
+            if count == 1:
+                self.completed += 1
+                return chunk
+            partial = _Partial(count, now)
+            self._partial[key] = partial
+        elif partial.count != count:
+            self.rejected += 1
+            return None
+        if index in partial.chunks:
+            return None
+        if partial.size + len(chunk) > self.max_message:
+            self._drop(key)
+            self.rejected += 1
+            return None
+        partial.chunks[index] = chunk
+        partial.size += len(chunk)
+        self.buffered += len(chunk)
+        if len(partial.chunks) == count:
+            self._drop(key)
+            self.completed += 1
+            return b"".join(partial.chunks[i] for i in range(count))
+        while self._partial and (
+            len(self._partial) > self.max_partial or self.buffered > self.max_bytes
+        ):
+            oldest = next(iter(self._partial))
+            self._drop(oldest)
+            self.evicted += 1
+        return None
+
+
+class PacketSigner:
+    """Append and check an HMAC-SHA256 trailer over encoded datagram bytes.
+
+    The keyed hash state is computed once from ``secret`` and copied for each
+    datagram, so signing never re-serializes a message and forged datagrams
+    are rejected before any header, decompression or parsing work happens.
+    """
+
+    def __init__(self, secret: bytes) -> None:
+        self._mac = hmac.new(secret, digestmod=hashlib.sha256)
+        self.size = self._mac.digest_size
+
+    def _digest(self, payload: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(payload)
+        return mac.digest()
+
+    def sign(self, payload: bytes) -> bytes:
+        """Return ``payload`` followed by its MAC."""
+        return payload + self._digest(payload)
+
+    def verify(self, packet: bytes) -> bytes | None:
+        """Return the payload of ``packet`` or ``None`` if the MAC is wrong."""
+        if len(packet) <= self.size:
+            return None
+        payload, tag = packet[:-self.size], packet[-self.size:]
+        if not hmac.compare_digest(self._digest(payload), tag):
+            return None
+        return payload
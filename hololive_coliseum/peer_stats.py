@@ -0,0 +1,184 @@
+"""Per-peer link statistics.
+
+:class:`NetworkManager` fills a :class:`PeerStatsTable` as a side effect of
+traffic it already handles: every datagram in or out counts towards its
+peer's packet and byte totals, acks of reliable packets and answered pings
+give round-trip samples, and resends and expiries of reliable packets give
+the loss estimate. Nothing extra is sent on the wire.
+
+Round-trip times are smoothed as in RFC 6298: ``srtt`` is an EWMA with gain
+1/8 and ``rttvar`` the mean deviation with gain 1/4. Following Karn's rule,
+acks of resent packets are not sampled since they cannot be matched to one
+transmission.
+
+Only datagrams that passed verification are counted as received, and peers
+that have sent nothing for ``max_idle`` seconds are dropped by
+:meth:`PeerStatsTable.expire`, so the table stays bounded.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+RTT_GAIN = 1 / 8
+RTTVAR_GAIN = 1 / 4
+
+
+class PeerStats:
+    """Counters and smoothed round-trip time for one peer."""
+
+    def __init__(self) -> None:
+        self.srtt: float | None = None
+        self.rttvar = 0.0
+        self.rtt_samples = 0
+        self.packets_in = 0
+        self.packets_out = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.reliable_sent = 0
+        self.resends = 0
+        self.expired = 0
+        self.last_seen: float | None = None
+        self.created = time.monotonic()
+
+    def observe_rtt(self, sample: float) -> None:
+        if self.srtt is None:
+            self.srtt = sample
+            self.rttvar = sample / 2
+        else:
+            self.rttvar += RTTVAR_GAIN * (abs(self.srtt - sample) - self.rttvar)
+            self.srtt += RTT_GAIN * (sample - self.srtt)
+        self.rtt_samples += 1
+
+    @property
+    def loss(self) -> float | None:
+        """Share of reliable transmissions that went unacknowledged.
+
+        Every resend means the previous copy or its ack was lost, and an
+        expired packet lost its last copy too.
+        """
+        attempts = self.reliable_sent + self.resends
+        if not attempts:
+            return None
+        return (self.resends + self.expired) / attempts
+
+    @property
+    def rto(self) -> float | None:
+        """Suggested resend timeout, ``srtt + 4 * rttvar``."""
+        if self.srtt is None:
+            return None
+        return self.srtt + 4 * self.rttvar
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "srtt": self.srtt,
+            "rttvar": self.rttvar,
+            "rtt_samples": self.rtt_samples,
+            "loss": self.loss,
+            "resends": self.resends,
+            "expired": self.expired,
+            "reliable_sent": self.reliable_sent,
+            "packets_in": self.packets_in,
+            "packets_out": self.packets_out,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "last_seen": self.last_seen,
+        }
+
+
+class PeerStatsTable:
+    """:class:`PeerStats` keyed by peer address, created on first use."""
+
+    def __init__(self, max_idle: float = 60.0) -> None:
+        self.peers: Dict[Tuple[str, int], PeerStats] = {}
+        self.max_idle = max_idle
+        self.evicted = 0
+
+    def __getitem__(self, addr: Tuple[str, int]) -> PeerStats:
+        stats = self.peers.get(addr)
+        if stats is None:
+            stats = self.peers[addr] = PeerStats()
+        return stats
+
+    def __contains__(self, addr) -> bool:
+        return tuple(addr) in self.peers
+
+    def __len__(self) -> int:
+        return len(self.peers)
+
+    def get(self, addr: Tuple[str, int]) -> PeerStats | None:
+        return self.peers.get(tuple(addr))
+
+    def forget(self, addr: Tuple[str, int]) -> None:
+        self.peers.pop(tuple(addr), None)
+
+    def expire(self, now: float | None = None) -> int:
+        """Drop peers not heard from for ``max_idle`` seconds; return how many."""
+        if now is None:
+            now = time.monotonic()
+        horizon = now - self.max_idle
+        idle = [
+            addr
+            for addr, stats in self.peers.items()
+            if (stats.created if stats.last_seen is None else stats.last_seen) < horizon
+        ]
+        for addr in idle:
+            del self.peers[addr]
+        self.evicted += len(idle)
+        return len(idle)
+
+    def sent(self, addr: Tuple[str, int], size: int) -> None:
+        stats = self[addr]
+        stats.packets_out += 1
+        stats.bytes_out += size
+
+    def received(self, addr: Tuple[str, int], size: int) -> None:
+        stats = self[addr]
+        stats.packets_in += 1
+        stats.bytes_in += size
+        stats.last_seen = time.monotonic()
+
+    def snapshot(self) -> Dict[Tuple[str, int], Dict[str, Any]]:
+        """Return every peer's statistics as plain dictionaries."""
+        return {addr: stats.as_dict() for addr, stats in self.peers.items()}
+
+    def best(self, nodes: Iterable[Tuple[str, int]]) -> Tuple[str, int] | None:
+        """Return the measured node with the lowest smoothed RTT."""
+        best = None
+        best_rtt = float("inf")
+        for node in nodes:
+            stats = self.peers.get(tuple(node))
+            if stats is not None and stats.srtt is not None and stats.srtt < best_rtt:
+                best = tuple(node)
+                best_rtt = stats.srtt
+        return best
+
+
+def overlay_lines(table: PeerStatsTable, limit: int = 8) -> List[str]:
+    """Return one text line per peer, most active first."""
+    peers = sorted(
+        table.peers.items(),
+        key=lambda item: item[1].packets_in + item[1].packets_out,
+        reverse=True,
+    )
+    lines = []
+    for (host, port), stats in peers[:limit]:
+        rtt = "--" if stats.srtt is None else f"{stats.srtt * 1000:.0f}±{stats.rttvar * 1000:.0f}ms"
+        loss = "--" if stats.loss is None else f"{stats.loss * 100:.1f}%"
+        lines.append(
+            f"{host}:{port} rtt {rtt} loss {loss} rs {stats.resends} "
+            f"in {stats.bytes_in // 1024}K out {stats.bytes_out // 1024}K"
+        )
+    return lines
+
+
+def draw_overlay(
+    surface, font, table: PeerStatsTable, pos: Tuple[int, int] = (10, 40), color=(255, 255, 0)
+) -> None:
+    """Blit :func:`overlay_lines` onto a pygame ``surface`` using ``font``."""
+    x, y = pos
+    for line in overlay_lines(table) or ["no peers"]:
+        text = font.render(line, True, color)
+        surface.blit(text, (x, y))
+        y += text.get_height()
@@ -0,0 +1,234 @@
+"""Client-side prediction and server reconciliation.
+
+An online client runs its own player through the normal ``handle_input`` and
+physics code the moment a key is pressed instead of waiting a round trip for
+the host. Every input frame gets a sequence number and is kept in a ring
+buffer until the host confirms it. Each ``inputs`` message sent to the host
+repeats the last ``redundancy`` inputs so a dropped datagram does not lose
+one. The host stamps the last input it applied as ``"<entity>.input_seq"``
+in its state (see :meth:`NetworkManager.bind_input`); when such an
+authoritative update arrives the client resets its player to it and replays
+the inputs the host has not seen yet.
+
+Inputs travel as bitmasks (see :data:`INPUT_ACTIONS`) so they fit the binary
+``inputs`` message and can be replayed through :class:`InputKeys`.
+
+The host only publishes movement. Cooldowns and ability timers are in the
+client's own clock, so the predictor snapshots them after every input and
+restores the snapshot of the confirmed input before replaying the rest.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+import pygame
+
+from .input_history import InputHistory
+
+INPUT_ACTIONS = (
+    "left",
+    "right",
+    "jump",
+    "block",
+    "parry",
+    "dodge",
+    "shoot",
+    "melee",
+    "special",
+)
+
+DEFAULT_KEY_BINDINGS = {
+    "left": pygame.K_LEFT,
+    "right": pygame.K_RIGHT,
+    "jump": pygame.K_SPACE,
+    "block": pygame.K_LSHIFT,
+    "parry": pygame.K_c,
+    "dodge": pygame.K_LCTRL,
+    "shoot": pygame.K_z,
+    "melee": pygame.K_x,
+    "special": pygame.K_v,
+}
+
+
+def pack_input(keys, key_bindings: Dict[str, int] | None = None) -> int:
+    """Return the input bitmask for a pygame key state."""
+    bindings = {**DEFAULT_KEY_BINDINGS, **(key_bindings or {})}
+    bits = 0
+    for i, action in enumerate(INPUT_ACTIONS):
+        if keys[bindings[action]]:
+            bits |= 1 << i
+    return bits
+
+
+class InputKeys:
+    """Key state rebuilt from an input bitmask, indexable like pygame's."""
+
+    def __init__(self, bits: int, key_bindings: Dict[str, int] | None = None) -> None:
+        bindings = {**DEFAULT_KEY_BINDINGS, **(key_bindings or {})}
+        self._pressed = {
+            bindings[action] for i, action in enumerate(INPUT_ACTIONS) if bits >> i & 1
+        }
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self._pressed
+
+
+# player attributes besides position and velocity that decide how an input
+# plays out; subclasses only have some of them
+PLAYER_STATE = (
+    "on_ground",
+    "direction",
+    "blocking",
+    "parrying",
+    "last_parry",
+    "dodging",
+    "dodge_end",
+    "last_dodge",
+    "last_shot",
+    "last_melee",
+    "last_special",
+    "dashing",
+    "dash_end",
+    "diving",
+    "shield_active",
+    "shield_end",
+    "mana",
+    "gravity_multiplier",
+    "friction_multiplier",
+)
+
+
+def player_fields(player, entity: str) -> Dict[str, Any]:
+    """Return the state fields the host publishes for a player."""
+    return {
+        entity + ".x": player.pos.x,
+        entity + ".y": player.pos.y,
+        entity + ".vx": player.velocity.x,
+        entity + ".vy": player.velocity.y,
+        entity + ".on_ground": player.on_ground,
+    }
+
+
+def snapshot_player(player) -> Dict[str, Any]:
+    """Return the movement and ability state of ``player`` by attribute name."""
+    fields = {
+        "x": player.pos.x,
+        "y": player.pos.y,
+        "vx": player.velocity.x,
+        "vy": player.velocity.y,
+    }
+    for name in PLAYER_STATE:
+        if hasattr(player, name):
+            fields[name] = getattr(player, name)
+    return fields
+
+
+def restore_player(player, fields: Dict[str, Any]) -> None:
+    """Move ``player`` to ``fields`` keyed by attribute name."""
+    player.pos.x = fields.get("x", player.pos.x)
+    player.pos.y = fields.get("y", player.pos.y)
+    player.velocity.x = fields.get("vx", player.velocity.x)
+    player.velocity.y = fields.get("vy", player.velocity.y)
+    for name in PLAYER_STATE:
+        if name in fields and hasattr(player, name):
+            setattr(player, name, fields[name])
+    player.rect.topleft = (int(player.pos.x), int(player.pos.y))
+
+
+class Predictor:
+    """Predict the local player and reconcile it with host updates.
+
+    ``step(bits, now)`` advances the local player by one frame of input and
+    ``restore(fields)`` resets it from authoritative fields. The optional
+    ``snapshot()`` is taken after every input; on reconcile the snapshot of
+    the confirmed input is restored first and the host's fields override it.
+    Use :meth:`for_player` to wire all three to a :class:`PlayerCharacter`.
+    """
+
+    def __init__(
+        self,
+        entity: str,
+        step: Callable[[int, int], None],
+        restore: Callable[[Dict[str, Any]], None],
+        capacity: int = 128,
+        redundancy: int = 8,
+        snapshot: Callable[[], Dict[str, Any]] | None = None,
+    ) -> None:
+        self.entity = entity
+        self.step = step
+        self.restore = restore
+        self.snapshot = snapshot
+        self.history = InputHistory(redundancy)
+        self.acked = 0
+        self.replayed = 0
+        self._inputs: Deque[Tuple[int, int, int, Dict[str, Any] | None]] = deque(
+            maxlen=capacity
+        )
+
+    @classmethod
+    def for_player(
+        cls,
+        player,
+        entity: str,
+        ground_y: int,
+        key_bindings: Dict[str, int] | None = None,
+        capacity: int = 128,
+        redundancy: int = 8,
+    ) -> "Predictor":
+        # handle_input's own fallback lacks dodge and the attacks
+        bindings = {**DEFAULT_KEY_BINDINGS, **(key_bindings or {})}
+
+        def step(bits: int, now: int) -> None:
+            player.handle_input(InputKeys(bits, bindings), now, bindings)
+            player.update(ground_y, now)
+
+        def restore(fields: Dict[str, Any]) -> None:
+            restore_player(player, fields)
+
+        return cls(
+            entity, step, restore, capacity, redundancy, lambda: snapshot_player(player)
+        )
+
+    @property
+    def pending(self) -> int:
+        """Number of inputs the host has not confirmed yet."""
+        return len(self._inputs)
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the newest input."""
+        return self.history.seq
+
+    def apply(self, bits: int, now: int, player: int = 0) -> Dict[str, Any]:
+        """Run one input frame locally and return the ``inputs`` message to send."""
+        seq = self.history.push(bits)
+        self.step(bits, now)
+        local = self.snapshot() if self.snapshot is not None else None
+        self._inputs.append((seq, bits, now, local))
+        return self.history.message(player)
+
+    def reconcile(self, state: Dict[str, Any]) -> bool:
+        """Apply an authoritative state and replay unconfirmed inputs.
+
+        ``state`` is the full state returned by :meth:`StateSync.apply`.
+        Returns ``True`` if the update confirmed new inputs for our entity.
+        """
+        acked = state.get(self.entity + ".input_seq")
+        if not isinstance(acked, int) or acked <= self.acked:
+            return False
+        self.acked = acked
+        confirmed = None
+        while self._inputs and self._inputs[0][0] <= acked:
+            confirmed = self._inputs.popleft()
+        prefix = self.entity + "."
+        fields: Dict[str, Any] = {}
+        if confirmed is not None and confirmed[0] == acked and confirmed[3] is not None:
+            fields.update(confirmed[3])
+        fields.update((k[len(prefix):], v) for k, v in state.items() if k.startswith(prefix))
+        self.restore(fields)
+        for _, bits, now, _ in self._inputs:
+            self.step(bits, now)
+        self.replayed += len(self._inputs)
+        return True
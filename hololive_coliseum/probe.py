@@ -0,0 +1,143 @@
+"""Concurrent probing of router nodes.
+
+:class:`NodeProber` sends nonce-tagged ``ping``, ``find`` and ``list_clients``
+requests to many nodes at once over the socket of a single client
+:class:`NetworkManager` and resolves a :class:`concurrent.futures.Future` for
+each node as replies arrive. Waiting stops as soon as every node has answered.
+A reply only counts when it comes from the probed node's address, and
+malformed lists resolve to the empty default.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+import select
+import socket
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Tuple
+
+from .gossip import parse_addr
+
+if TYPE_CHECKING:
+    from .network import NetworkManager
+
+_REPLIES = {"ping": "pong", "find": "games", "list_clients": "clients"}
+
+
+class NodeProber:
+    """Track outstanding probes sent through ``manager``'s socket.
+
+    The manager should be a client instance dedicated to probing; its socket
+    is read directly so nothing else may poll it while probes are pending.
+    """
+
+    def __init__(self, manager: "NetworkManager") -> None:
+        self.manager = manager
+        self._nonces = itertools.count(random.randrange(1 << 31))
+        # nonce -> (future, request type, send time, address replies come from)
+        self._pending: Dict[int, Tuple[Future, str, float, Tuple[str, int]]] = {}
+
+    def _probe(self, nodes: Iterable[Tuple[str, int]], msg_type: str) -> Dict[Tuple[str, int], Future]:
+        futures: Dict[Tuple[str, int], Future] = {}
+        for node in nodes:
+            node = tuple(node)
+            fut: Future = Future()
+            fut.set_running_or_notify_cancel()
+            futures[node] = fut
+            nonce = next(self._nonces) & 0xFFFFFFFF
+            try:
+                source = (socket.gethostbyname(node[0]), node[1])
+                self.manager._send(self.manager._encode({"type": msg_type, "nonce": nonce}), node)
+            except OSError:
+                fut.set_result(self._default(msg_type))
+                continue
+            self._pending[nonce] = (fut, msg_type, time.monotonic(), source)
+        self.manager.flush()
+        return futures
+
+    @staticmethod
+    def _default(msg_type: str) -> Any:
+        return None if msg_type == "ping" else []
+
+    def ping(self, nodes: Iterable[Tuple[str, int]]) -> Dict[Tuple[str, int], Future]:
+        """Ping ``nodes``; each future resolves to a latency or ``None``."""
+        return self._probe(nodes, "ping")
+
+    def find_games(self, nodes: Iterable[Tuple[str, int]]) -> Dict[Tuple[str, int], Future]:
+        """Ask ``nodes`` for their game lists."""
+        return self._probe(nodes, "find")
+
+    def list_clients(self, nodes: Iterable[Tuple[str, int]]) -> Dict[Tuple[str, int], Future]:
+        """Ask ``nodes`` for their live client lists."""
+        return self._probe(nodes, "list_clients")
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _resolve(self, data: dict[str, Any], addr: Tuple[str, int], now: float) -> None:
+        nonce = data.get("nonce")
+        if not isinstance(nonce, int):
+            return
+        entry = self._pending.get(nonce)
+        if entry is None:
+            return
+        fut, msg_type, sent, source = entry
+        if data.get("type") != _REPLIES[msg_type] or tuple(addr[:2]) != source:
+            return
+        del self._pending[nonce]
+        if msg_type == "ping":
+            fut.set_result(now - sent)
+            self.manager.peer_stats[addr].observe_rtt(now - sent)
+            return
+        entries = data.get("games" if msg_type == "find" else "clients")
+        if not isinstance(entries, list):
+            fut.set_result([])
+            return
+        parsed = [parse_addr(entry) for entry in entries]
+        fut.set_result([entry for entry in parsed if entry is not None])
+
+    def wait(self, timeout: float, process_host: Callable[[], Any] | None = None) -> None:
+        """Collect replies until every probe is answered or ``timeout`` passes.
+
+        Probes still outstanding at the deadline resolve to ``None`` for pings
+        and an empty list otherwise. ``process_host`` is called between reads
+        so tests can drive an in-process router.
+        """
+        sock = self.manager.sock
+        deadline = time.monotonic() + timeout
+        while self._pending:
+            if process_host is not None:
+                process_host()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            wait = min(remaining, 0.005) if process_host is not None else remaining
+            try:
+                ready, _, _ = select.select([sock], [], [], wait)
+            except (OSError, ValueError):
+                break
+            if not ready:
+                continue
+            while True:
+                try:
+                    packet, addr = sock.recvfrom(4096)
+                except (BlockingIOError, OSError):
+                    break
+                now = time.monotonic()
+                for data in self.manager._decode_all(packet, addr):
+                    self._resolve(data, addr, now)
+        for fut, msg_type, _, _ in self._pending.values():
+            fut.set_result(self._default(msg_type))
+        self._pending.clear()
+
+
+def merge_lists(futures: Dict[Tuple[str, int], Future]) -> List[Tuple[str, int]]:
+    """Combine list results from several nodes without duplicates."""
+    seen: Dict[Tuple[str, int], None] = {}
+    for fut in futures.values():
+        for entry in fut.result():
+            seen.setdefault(entry, None)
+    return list(seen)
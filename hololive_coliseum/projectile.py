@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import pygame
 
 PROJECTILE_SPEED = 10
@@ -10,19 +12,17 @@ class Projectile(pygame.sprite.Sprite):
         self,
         x: int,
         y: int,
-        direction: pygame.math.Vector2,
+        direction: pygame.math.Vector2 | int,
         from_enemy: bool = False,
     ) -> None:
-
-class Projectile(pygame.sprite.Sprite):
-    """Simple projectile moving horizontally."""
-
-    def __init__(self, x: int, y: int, direction: int) -> None:
         super().__init__()
         self.image = pygame.Surface((10, 4))
         self.image.fill((255, 0, 0))
         self.rect = self.image.get_rect(center=(x, y))
         self.from_enemy = from_enemy
+        if not isinstance(direction, pygame.math.Vector2):
+            # older callers pass a horizontal facing of -1 or 1
+            direction = pygame.math.Vector2(direction, 0)
         if direction.length_squared() == 0:
             direction = pygame.math.Vector2(1, 0)
         self.velocity = direction.normalize() * PROJECTILE_SPEED
@@ -118,8 +118,3 @@ class PiercingProjectile(Projectile):
         super().__init__(x, y, direction)
         self.pierce = True
         self.image.fill((255, 105, 180))
-
-        self.velocity = pygame.math.Vector2(direction * PROJECTILE_SPEED, 0)
-
-    def update(self) -> None:
-        self.rect.move_ip(self.velocity.x, self.velocity.y)
@@ -0,0 +1,153 @@
+"""Receive-side bookkeeping for reliable packets.
+
+Reliable packets carry a per-peer sequence number. Instead of answering each
+one with an ``ack`` datagram, the receiver remembers the latest sequence it
+has seen from a peer plus a 32-bit field of the ones before it and stamps
+that pair on every datagram it sends back to the peer.
+
+The same window suppresses duplicates created by resends whose ack was lost,
+and :class:`OrderedChannel` restores send order for messages that need it.
+Both are per peer session: when a peer restarts with a new epoch (see
+:mod:`packet_framing`) its window and channels are discarded.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, Iterator, List
+
+ACK_BITS = 32
+_MASK = (1 << ACK_BITS) - 1
+
+
+class AckWindow:
+    """Track which reliable sequence numbers were received from one peer.
+
+    ``bits`` has bit ``i`` set when ``latest - 1 - i`` was received. ``dirty``
+    is set whenever there is news the peer has not been told about yet.
+    For duplicate detection every sequence up to ``floor`` counts as received
+    and later receipts are kept in a set of at most ``max_gap`` entries; when
+    it overflows the floor skips gaps whose packets the sender gave up on.
+    """
+
+    def __init__(self, max_gap: int = 1024) -> None:
+        self.latest: int | None = None
+        self.bits = 0
+        self.dirty = False
+        self.floor = 0
+        self.max_gap = max_gap
+        self._above: set[int] = set()
+
+    def record(self, seq: int) -> bool:
+        """Mark ``seq`` as received and return ``False`` if it is a duplicate."""
+        self.dirty = True
+        if self.latest is None:
+            self.latest = seq
+        elif seq > self.latest:
+            shift = seq - self.latest
+            if shift > ACK_BITS:
+                self.bits = 0
+            else:
+                self.bits = ((self.bits << shift) | (1 << (shift - 1))) & _MASK
+            self.latest = seq
+        elif seq < self.latest and self.covers(seq):
+            self.bits |= 1 << (self.latest - seq - 1)
+        return self._remember(seq)
+
+    def _remember(self, seq: int) -> bool:
+        if seq <= self.floor or seq in self._above:
+            return False
+        self._above.add(seq)
+        while self.floor + 1 in self._above:
+            self.floor += 1
+            self._above.discard(self.floor)
+        if len(self._above) > self.max_gap:
+            self.floor = min(self._above)
+            self._above.discard(self.floor)
+            while self.floor + 1 in self._above:
+                self.floor += 1
+                self._above.discard(self.floor)
+        return True
+
+    def covers(self, seq: int) -> bool:
+        """Return True if ``seq`` can be acknowledged through the header."""
+        return self.latest is not None and 0 <= self.latest - seq <= ACK_BITS
+
+    def header(self) -> tuple[int, int] | None:
+        """Return ``(latest, bits)`` to piggyback or ``None`` before any receipt."""
+        if self.latest is None:
+            return None
+        self.dirty = False
+        return self.latest, self.bits
+
+
+def acked_sequences(latest: int, bits: int) -> Iterator[int]:
+    """Yield every sequence number acknowledged by an ack header."""
+    yield latest
+    i = 0
+    while bits:
+        if bits & 1:
+            yield latest - 1 - i
+        bits >>= 1
+        i += 1
+
+
+class OrderedChannel:
+    """Release messages of one peer's channel in ``cseq`` order.
+
+    Out-of-order messages wait in a buffer. The missing message is assumed
+    lost for good, and delivery skips ahead, once the channel has been
+    blocked on it for ``timeout`` seconds (longer than a sender keeps
+    resending) or more than ``max_buffer`` messages are waiting. Call
+    :meth:`expire` periodically so a blocked channel is released even when
+    nothing else arrives on it.
+    """
+
+    def __init__(
+        self,
+        max_buffer: int = 64,
+        timeout: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.expected = 1
+        self.max_buffer = max_buffer
+        self.timeout = timeout
+        self.clock = clock
+        self.skipped = 0
+        self._buffer: Dict[int, Any] = {}
+        self._blocked_since: float | None = None
+
+    def push(self, cseq: int, msg: Any) -> List[Any]:
+        """Add ``msg`` and return every message that is now deliverable."""
+        if cseq < self.expected:
+            return []
+        self._buffer[cseq] = msg
+        if len(self._buffer) > self.max_buffer:
+            self._skip()
+        return self._drain()
+
+    def expire(self) -> List[Any]:
+        """Skip a gap that has blocked the channel past ``timeout``."""
+        if self._blocked_since is None:
+            return []
+        if self.clock() - self._blocked_since < self.timeout:
+            return []
+        self._skip()
+        return self._drain()
+
+    def _skip(self) -> None:
+        oldest = min(self._buffer)
+        self.skipped += oldest - self.expected
+        self.expected = oldest
+
+    def _drain(self) -> List[Any]:
+        ready = []
+        while self.expected in self._buffer:
+            ready.append(self._buffer.pop(self.expected))
+            self.expected += 1
+        if not self._buffer:
+            self._blocked_since = None
+        elif ready or self._blocked_since is None:
+            # waiting on a new gap from now on
+            self._blocked_since = self.clock()
+        return ready
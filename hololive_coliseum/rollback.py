@@ -0,0 +1,176 @@
+"""Rollback session for 1v1 matches.
+
+Both peers run the full simulation. Each frame the local input is applied at
+once and the remote player's input is predicted by repeating the last one
+received. A snapshot of the whole world is saved before every simulated
+frame; when a real remote input arrives that differs from the prediction,
+the world is restored to the snapshot of that frame and re-simulated up to
+the present before the next frame runs.
+
+The simulation is driven through three callables so it stays separate from
+rendering: ``simulate(inputs)`` advances the world by one frame given one
+input bitmask per player, ``save()`` returns a snapshot and ``load(snapshot)``
+restores it.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+FRAME_TIME = 1 / 60
+
+
+class RollbackSession:
+    """Advance a deterministic simulation with input prediction and rollback.
+
+    ``max_rollback`` bounds how many frames the session may run ahead of the
+    last frame confirmed by every player; :meth:`advance` stalls beyond that.
+    """
+
+    def __init__(
+        self,
+        simulate: Callable[[Tuple[int, ...]], None],
+        save: Callable[[], Any],
+        load: Callable[[Any], None],
+        players: int = 2,
+        local: int = 0,
+        max_rollback: int = 8,
+        frame_budget: float = FRAME_TIME,
+        history: int = 600,
+    ) -> None:
+        self.simulate = simulate
+        self.save = save
+        self.load = load
+        self.players = players
+        self.local = local
+        self.max_rollback = max_rollback
+        self.frame_budget = frame_budget
+        self.frame = 0
+        self.rollbacks = 0
+        self.max_depth = 0
+        self.over_budget = 0
+        self.last_depth = 0
+        self.last_resim = 0.0
+        # (frame, rollback depth, seconds spent re-simulating)
+        self.history: Deque[Tuple[int, int, float]] = deque(maxlen=history)
+        self._inputs: List[Dict[int, int]] = [{} for _ in range(players)]
+        self._latest: List[Tuple[int, int]] = [(-1, 0)] * players
+        self._confirmed = [-1] * players
+        self._snapshots: Dict[int, Any] = {}
+        self._used: Dict[int, Tuple[int, ...]] = {}
+        self._rollback_from: int | None = None
+
+    @property
+    def confirmed_frame(self) -> int:
+        """Last frame for which every player's input is known."""
+        return min(self._confirmed)
+
+    def add_local_input(self, bits: int) -> Dict[str, Any]:
+        """Set the local input for the next frame and return the message to send."""
+        self._store(self.local, self.frame, bits)
+        return {"type": "input", "seq": self.frame, "frame": self.frame, "bits": bits}
+
+    def add_remote_input(self, player: int, frame: int, bits: int) -> None:
+        """Record a remote input; schedules a rollback if it was mispredicted."""
+        if frame <= self.confirmed_frame or frame in self._inputs[player]:
+            return
+        self._store(player, frame, bits)
+        used = self._used.get(frame)
+        if used is not None and used[player] != bits:
+            if self._rollback_from is None or frame < self._rollback_from:
+                self._rollback_from = frame
+
+    def _store(self, player: int, frame: int, bits: int) -> None:
+        inputs = self._inputs[player]
+        inputs[frame] = bits
+        if frame > self._latest[player][0]:
+            self._latest[player] = (frame, bits)
+        while self._confirmed[player] + 1 in inputs:
+            self._confirmed[player] += 1
+
+    def _input_for(self, player: int, frame: int) -> int:
+        bits = self._inputs[player].get(frame)
+        if bits is not None:
+            return bits
+        # predict by repeating the most recent input received
+        return self._latest[player][1]
+
+    def _run_frame(self, frame: int) -> None:
+        self._snapshots[frame] = self.save()
+        inputs = tuple(self._input_for(p, frame) for p in range(self.players))
+        self._used[frame] = inputs
+        self.simulate(inputs)
+
+    def can_advance(self) -> bool:
+        return self.frame - self.confirmed_frame <= self.max_rollback
+
+    def advance(self) -> bool:
+        """Simulate the next frame, rolling back first if needed.
+
+        Returns ``False`` without simulating when too far ahead of the
+        remote player.
+        """
+        if not self.can_advance():
+            return False
+        depth = 0
+        start = time.perf_counter()
+        if self._rollback_from is not None:
+            first = self._rollback_from
+            self._rollback_from = None
+            depth = self.frame - first
+            self.load(self._snapshots[first])
+            for frame in range(first, self.frame):
+                self._run_frame(frame)
+        resim = time.perf_counter() - start
+        self._run_frame(self.frame)
+        if time.perf_counter() - start > self.frame_budget:
+            self.over_budget += 1
+        self.frame += 1
+        if depth:
+            self.rollbacks += 1
+            self.max_depth = max(self.max_depth, depth)
+        self.last_depth = depth
+        self.last_resim = resim
+        self.history.append((self.frame - 1, depth, resim))
+        self._trim()
+        return True
+
+    def _trim(self) -> None:
+        # frames every player confirmed can no longer be rolled back to
+        floor = min(self.confirmed_frame, self.frame - 1)
+        for frame in [f for f in self._snapshots if f <= floor]:
+            del self._snapshots[frame]
+            self._used.pop(frame, None)
+            for inputs in self._inputs:
+                inputs.pop(frame, None)
+
+    def stats(self) -> Dict[str, float]:
+        """Summarise rollback depth and re-simulation time over ``history``."""
+        frames = len(self.history)
+        rolled = [(d, t) for _, d, t in self.history if d]
+        return {
+            "frames": frames,
+            "rollbacks": len(rolled),
+            "max_depth": max((d for d, _ in rolled), default=0),
+            "avg_depth": sum(d for d, _ in rolled) / len(rolled) if rolled else 0.0,
+            "avg_resim_ms": sum(t for _, t in rolled) * 1000 / len(rolled) if rolled else 0.0,
+        }
+
+
+def run_frames(
+    session: RollbackSession, elapsed: float, accumulator: float = 0.0
+) -> Tuple[int, float]:
+    """Advance ``session`` by however many fixed frames ``elapsed`` covers.
+
+    Returns the number of frames simulated and the leftover time to pass
+    back in next call, so rendering can run at any rate.
+    """
+    accumulator += elapsed
+    ran = 0
+    while accumulator >= FRAME_TIME and session.advance():
+        accumulator -= FRAME_TIME
+        ran += 1
+    # do not bank time while stalled or the session would race to catch up
+    return ran, min(accumulator, FRAME_TIME * session.max_rollback)
@@ -0,0 +1,250 @@
+"""Headless multi-process router node.
+
+``python -m hololive_coliseum.router_daemon --workers 4`` forks that many
+router processes bound to one UDP port with ``SO_REUSEPORT``, so the kernel
+spreads senders across them and decoding, HMAC checks and decompression use
+every core. Each worker is a normal host :class:`NetworkManager`.
+
+Workers keep their games and clients tables consistent the same way routers
+on different machines do: they send each other versioned gossip deltas
+(:mod:`gossip`), here as JSON over Unix datagram sockets in a private run
+directory, plus a digest every ``sync_interval`` seconds to repair losses.
+When a secret or AEAD key is configured those messages carry an HMAC too.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import select
+import shutil
+import signal
+import socket
+import stat
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from .network import NetworkManager
+from .packet_framing import PacketSigner
+
+
+def socket_path(run_dir: str, index: int) -> str:
+    return os.path.join(run_dir, f"worker-{index}.sock")
+
+
+def prepare_run_dir(run_dir: str) -> None:
+    """Create ``run_dir`` private to this user or refuse one that is not.
+
+    Anyone who can write there could replace a worker socket and feed the
+    workers forged table entries.
+    """
+    os.makedirs(run_dir, mode=0o700, exist_ok=True)
+    info = os.lstat(run_dir)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"{run_dir} is not a directory")
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise PermissionError(f"{run_dir} is owned by another user")
+    if info.st_mode & 0o077:
+        raise PermissionError(f"{run_dir} is accessible to other users")
+
+
+class RouterWorker:
+    """One router process plus its local sync channel to sibling workers."""
+
+    def __init__(
+        self,
+        index: int,
+        workers: int,
+        address: Tuple[str, int],
+        run_dir: str,
+        secret: bytes | None = None,
+        sync_interval: float = 1.0,
+        aead_key: bytes | None = None,
+    ) -> None:
+        self.manager = NetworkManager(
+            host=True, address=address, secret=secret, aead_key=aead_key, reuse_port=True
+        )
+        self.path = socket_path(run_dir, index)
+        self.siblings = [socket_path(run_dir, i) for i in range(workers) if i != index]
+        self.sync_interval = sync_interval
+        self._next_sync = 0.0
+        self.running = True
+        if secret is None and aead_key is not None:
+            # never reuse the encryption key itself as a MAC key
+            secret = hmac.new(aead_key, b"router-local-sync", hashlib.sha256).digest()
+        self.signer = PacketSigner(secret) if secret is not None else None
+        self.rejected = 0
+        prepare_run_dir(run_dir)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.local = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.local.bind(self.path)
+        self.local.setblocking(False)
+
+    def _send_local(self, msg: Dict[str, Any], path: str) -> None:
+        data = json.dumps(msg).encode("utf-8")
+        if self.signer is not None:
+            data = self.signer.sign(data)
+        try:
+            self.local.sendto(data, path)
+        except OSError:
+            # sibling not up yet or its queue is full; the next digest resyncs
+            self.manager.gossip.forget_peer(path)
+
+    def sync_siblings(self) -> None:
+        """Send each sibling the table entries it has not seen."""
+        gossip = self.manager.gossip
+        for path in self.siblings:
+            msg = gossip.delta_for(path)
+            if msg is not None:
+                self._send_local(msg, path)
+
+    def _receive_local(self) -> None:
+        gossip = self.manager.gossip
+        while True:
+            try:
+                data, path = self.local.recvfrom(65536)
+            except (BlockingIOError, OSError):
+                break
+            if path not in self.siblings:
+                self.rejected += 1
+                continue
+            if self.signer is not None:
+                data = self.signer.verify(data)
+                if data is None:
+                    self.rejected += 1
+                    continue
+            try:
+                msg = json.loads(data)
+            except ValueError:
+                self.rejected += 1
+                continue
+            if not isinstance(msg, dict):
+                self.rejected += 1
+                continue
+            if msg.get("type") == "gossip":
+                gaps = gossip.gaps
+                for (table, entry), alive in gossip.receive(msg):
+                    self.manager._apply_entry(table, entry, alive)
+                if gossip.gaps != gaps:
+                    self._send_local(gossip.digest(), path)
+            elif msg.get("type") == "digest":
+                gossip.receive_digest(path, msg)
+                reply = gossip.delta_for(path)
+                if reply is not None:
+                    self._send_local(reply, path)
+                if gossip.behind(msg):
+                    self._send_local(gossip.digest(), path)
+
+    def step(self, timeout: float = 0.05) -> None:
+        """Wait up to ``timeout`` for traffic and process one round of it."""
+        try:
+            select.select([self.manager.sock, self.local], [], [], timeout)
+        except (OSError, ValueError):
+            return
+        self.manager.poll()
+        self._receive_local()
+        now = time.monotonic()
+        self.manager.gossip_tick(now)
+        if now >= self._next_sync:
+            self._next_sync = now + self.sync_interval
+            for path in self.siblings:
+                self._send_local(self.manager.gossip.digest(), path)
+        self.sync_siblings()
+        self.manager.flush()
+
+    def serve_forever(self) -> None:
+        while self.running:
+            self.step()
+
+    def close(self) -> None:
+        self.running = False
+        self.manager.sock.close()
+        self.local.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def _run_worker(index: int, workers: int, args: argparse.Namespace) -> None:
+    worker = RouterWorker(
+        index, workers, (args.host, args.port), args.run_dir, args.secret,
+        aead_key=args.aead_key,
+    )
+
+    def stop(signum, frame) -> None:
+        worker.running = False
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    try:
+        worker.serve_forever()
+    finally:
+        worker.close()
+
+
+def _serve(args: argparse.Namespace) -> None:
+    workers = max(1, args.workers)
+    if workers == 1 or not hasattr(os, "fork"):
+        _run_worker(0, 1, args)
+        return
+    children = []
+    for index in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _run_worker(index, workers, args)
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    def forward(signum, frame) -> None:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for pid in children:
+        while True:
+            try:
+                os.waitpid(pid, 0)
+                break
+            except InterruptedError:
+                continue
+            except ChildProcessError:
+                break
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a headless router node.")
+    parser.add_argument("--host", default="")
+    parser.add_argument("--port", type=int, default=50007)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--secret", type=lambda s: s.encode("utf-8"), default=None)
+    parser.add_argument(
+        "--aead-key", type=lambda s: s.encode("utf-8"), default=None,
+        help="encrypt with ChaCha20-Poly1305 instead of signing with --secret",
+    )
+    parser.add_argument(
+        "--run-dir", default=None,
+        help="directory for the worker sockets; a fresh private one by default",
+    )
+    args = parser.parse_args(argv)
+    created = args.run_dir is None
+    if created:
+        args.run_dir = tempfile.mkdtemp(prefix=f"hololive-router-{args.port}-")
+    try:
+        _serve(args)
+    finally:
+        if created:
+            shutil.rmtree(args.run_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
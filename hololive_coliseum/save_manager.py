@@ -3,8 +3,6 @@
 import json
 import os
 import shutil
-import json
-import os
 from typing import Any
 
 SAVE_DIR = os.path.join(os.path.dirname(__file__), '..', 'SavedGames')
@@ -23,7 +21,6 @@ def load_settings() -> dict[str, Any]:
                 return json.load(f)
             except json.JSONDecodeError:
                 return {}
-            return json.load(f)
     return {}
 
 
@@ -31,13 +28,12 @@ def save_settings(data: dict[str, Any]) -> None:
     """Save settings to the `SavedGames` directory, creating it if missing."""
     path = _settings_file()
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    path = _settings_file()
     with open(path, 'w', encoding='utf-8') as f:
         json.dump(data, f)
 
 
 def wipe_saves() -> None:
-    """Delete all files in the save directory if it exists."""
+    """Delete everything in the save directory, creating it if missing."""
     if not os.path.exists(SAVE_DIR):
         os.makedirs(SAVE_DIR, exist_ok=True)
         return
@@ -48,9 +44,5 @@ def wipe_saves() -> None:
                 shutil.rmtree(path)
             else:
                 os.remove(path)
-    for fname in os.listdir(SAVE_DIR):
-        path = os.path.join(SAVE_DIR, fname)
-        try:
-            os.remove(path)
         except OSError:
             pass
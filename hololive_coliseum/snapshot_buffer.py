@@ -0,0 +1,150 @@
+"""Client-side jitter buffer and snapshot interpolation.
+
+State deltas can arrive late, early or out of order. :class:`SnapshotBuffer`
+releases them to a :class:`StateSync` strictly in ``seq`` order, keeps the
+resulting full snapshots on a host timeline and renders remote entities a
+short delay in the past by interpolating numeric fields between the two
+snapshots around the render time. The delay starts at 100 ms, which is
+also its floor, and grows when the measured jitter needs more.
+
+The host timeline is ``seq * interval`` unless deltas carry a ``t`` field
+with the host's send time in seconds. A delta with a new ``epoch`` (added
+by :class:`NetworkManager` when the host restarts) clears the buffer.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+from .state_sync import StateSync
+
+
+def lerp_state(a: Dict[str, Any], b: Dict[str, Any], t: float) -> Dict[str, Any]:
+    """Blend numeric fields of two snapshots; other fields snap to the nearer one."""
+    out = dict(a if t < 0.5 else b)
+    for key, va in a.items():
+        vb = b.get(key)
+        if (
+            isinstance(va, (int, float))
+            and isinstance(vb, (int, float))
+            and not isinstance(va, bool)
+            and not isinstance(vb, bool)
+        ):
+            out[key] = va + (vb - va) * t
+    return out
+
+
+class SnapshotBuffer:
+    """Order deltas, drop stale ones and interpolate the rendered state."""
+
+    def __init__(
+        self,
+        interval: float = 1 / 60,
+        delay: float = 0.1,
+        min_delay: float = 0.1,
+        max_delay: float = 0.3,
+        capacity: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.interval = interval
+        self.delay = delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.sync = StateSync()
+        self.jitter = 0.0
+        self.stale_dropped = 0
+        self.skipped = 0
+        self._offset: float | None = None
+        self._last_transit: float | None = None
+        self._pending: Dict[int, Tuple[Dict[str, Any], float]] = {}
+        self._snapshots: Deque[Tuple[float, Dict[str, Any]]] = deque(maxlen=capacity)
+
+    def _host_time(self, delta: Dict[str, Any]) -> float:
+        if isinstance(delta.get("t"), (int, float)):
+            return float(delta["t"])
+        return delta["seq"] * self.interval
+
+    def push(self, delta: Dict[str, Any]) -> None:
+        """Add a received delta; stale and duplicate deltas are ignored."""
+        seq = delta.get("seq")
+        if not isinstance(seq, int):
+            return
+        epoch = delta.get("epoch")
+        if epoch is not None and epoch != self.sync.epoch:
+            self._restart(epoch)
+        if seq <= self.sync.seq or seq in self._pending:
+            self.stale_dropped += 1
+            return
+        now = self.clock()
+        host_time = self._host_time(delta)
+        self._observe(now - host_time)
+        self._pending[seq] = (delta, host_time)
+        self._release(now)
+
+    def _restart(self, epoch: int) -> None:
+        # a restarted host begins its seq and timeline again
+        self.sync = StateSync()
+        self.sync.epoch = epoch
+        self._pending.clear()
+        self._snapshots.clear()
+        self._offset = None
+        self._last_transit = None
+
+    def _observe(self, transit: float) -> None:
+        # RFC 3550 style jitter estimate from the change in transit time
+        if self._last_transit is not None:
+            diff = abs(transit - self._last_transit)
+            self.jitter += (diff - self.jitter) / 16
+        self._last_transit = transit
+        # the least delayed packet defines the host-to-local clock offset
+        if self._offset is None or transit < self._offset:
+            self._offset = transit
+        else:
+            self._offset += (transit - self._offset) * 0.001
+        # two send intervals plus four times the jitter, never under the floor
+        target = 2 * self.interval + 4 * self.jitter
+        self.delay = min(self.max_delay, max(self.min_delay, target))
+
+    def _release(self, now: float) -> None:
+        while self._pending:
+            nxt = self.sync.seq + 1
+            if nxt not in self._pending:
+                oldest = min(self._pending)
+                # wait for the missing delta until rendering runs past the
+                # newest released snapshot, then give it up as lost
+                if self._snapshots and self.render_time(now) <= self._snapshots[-1][0]:
+                    return
+                self.skipped += oldest - nxt
+                nxt = oldest
+            delta, host_time = self._pending.pop(nxt)
+            self.sync.seq = nxt - 1
+            state = self.sync.apply(delta)
+            self._snapshots.append((host_time, state))
+
+    def render_time(self, now: float | None = None) -> float:
+        """Host time currently being rendered."""
+        if now is None:
+            now = self.clock()
+        if self._offset is None:
+            return 0.0
+        return now - self._offset - self.delay
+
+    def sample(self, now: float | None = None) -> Dict[str, Any]:
+        """Return the interpolated state for the current render time."""
+        if now is None:
+            now = self.clock()
+        self._release(now)
+        if not self._snapshots:
+            return {}
+        target = self.render_time(now)
+        snaps = self._snapshots
+        if target <= snaps[0][0]:
+            return dict(snaps[0][1])
+        for (ta, a), (tb, b) in zip(snaps, list(snaps)[1:]):
+            if ta <= target <= tb:
+                t = 0.0 if tb == ta else (target - ta) / (tb - ta)
+                return lerp_state(a, b, t)
+        return dict(snaps[-1][1])
@@ -8,6 +8,8 @@ class StateSync:
     def __init__(self) -> None:
         self.last_state: Dict[str, Any] = {}
         self.seq: int = 0
+        # sender session the received deltas belong to, if known
+        self.epoch: int | None = None
 
     def encode(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Return the delta from the previous state with a sequence number."""
@@ -18,11 +20,23 @@ class StateSync:
         return delta
 
     def apply(self, delta: Dict[str, Any]) -> Dict[str, Any]:
-        """Apply a delta update and return the resulting state."""
+        """Apply a delta update and return the resulting state.
+
+        Deltas older than the last applied one are ignored so a late packet
+        cannot roll fields back. A delta with a different ``epoch`` comes
+        from a restarted sender, so the sequence and state start over.
+        """
+        epoch = delta.get('epoch')
+        if epoch is not None and epoch != self.epoch:
+            self.epoch = epoch
+            self.seq = 0
+            self.last_state = {}
         if 'seq' in delta:
+            if delta['seq'] < self.seq:
+                return self.last_state.copy()
             self.seq = delta['seq']
         for k, v in delta.items():
-            if k == 'seq':
+            if k in ('seq', 'epoch'):
                 continue
             self.last_state[k] = v
         return self.last_state.copy()
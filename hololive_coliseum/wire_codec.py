@@ -0,0 +1,219 @@
+"""Schema-driven binary codec for high-frequency gameplay packets.
+
+Every schema owns a one byte type tag in the ``0x10``-``0x1f`` range, which
+keeps binary packets distinguishable from JSON pointcloud packets (base64
+text) and from the frames in :mod:`packet_framing`. Messages that do not match
+a registered schema exactly return ``None`` so callers fall back to JSON.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+from .holographic_compression import _xor
+
+
+class MessageSchema:
+    """Fixed layout for one message ``type`` packed with :mod:`struct`."""
+
+    def __init__(self, tag: int, msg_type: str, fields: Sequence[Tuple[str, str]]) -> None:
+        self.tag = tag
+        self.msg_type = msg_type
+        self.names = [name for name, _ in fields]
+        self.struct = struct.Struct("!" + "".join(fmt for _, fmt in fields))
+        self._keys = set(self.names) | {"type"}
+
+    def matches(self, msg: Dict[str, Any]) -> bool:
+        return msg.get("type") == self.msg_type and msg.keys() == self._keys
+
+    def pack(self, msg: Dict[str, Any]) -> bytes | None:
+        try:
+            return self.struct.pack(*(msg[name] for name in self.names))
+        except struct.error:
+            return None
+
+    def unpack(self, body: bytes) -> Dict[str, Any] | None:
+        if len(body) != self.struct.size:
+            return None
+        msg: Dict[str, Any] = {"type": self.msg_type}
+        msg.update(zip(self.names, self.struct.unpack(body)))
+        return msg
+
+
+class StateSchema:
+    """Layout for :class:`StateSync` deltas: a ``seq`` plus scalar fields.
+
+    Each field is written as its UTF-8 name, a value kind byte and the packed
+    value, so deltas with any set of keys stay compact without JSON.
+    """
+
+    _SEQ = struct.Struct("!IB")
+    _KINDS = {
+        b"i": struct.Struct("!i"),
+        b"q": struct.Struct("!q"),
+        b"d": struct.Struct("!d"),
+    }
+
+    def __init__(self, tag: int) -> None:
+        self.tag = tag
+        self.msg_type = None
+
+    def matches(self, msg: Dict[str, Any]) -> bool:
+        return "type" not in msg and isinstance(msg.get("seq"), int)
+
+    def _pack_value(self, value: Any) -> bytes | None:
+        if value is None:
+            return b"n"
+        if value is True or value is False:
+            return b"t" if value else b"f"
+        if isinstance(value, int):
+            kind = b"i" if -(2 ** 31) <= value < 2 ** 31 else b"q"
+            try:
+                return kind + self._KINDS[kind].pack(value)
+            except struct.error:
+                return None
+        if isinstance(value, float):
+            return b"d" + self._KINDS[b"d"].pack(value)
+        if isinstance(value, str):
+            raw = value.encode("utf-8")
+            if len(raw) > 255:
+                return None
+            return b"s" + bytes([len(raw)]) + raw
+        return None
+
+    def pack(self, msg: Dict[str, Any]) -> bytes | None:
+        fields = [(k, v) for k, v in msg.items() if k != "seq"]
+        if len(fields) > 255:
+            return None
+        try:
+            parts = [self._SEQ.pack(msg["seq"], len(fields))]
+        except struct.error:
+            return None
+        for key, value in fields:
+            name = key.encode("utf-8")
+            packed = self._pack_value(value)
+            if len(name) > 255 or packed is None:
+                return None
+            parts.append(bytes([len(name)]) + name + packed)
+        return b"".join(parts)
+
+    def unpack(self, body: bytes) -> Dict[str, Any] | None:
+        try:
+            seq, count = self._SEQ.unpack_from(body)
+            pos = self._SEQ.size
+            msg: Dict[str, Any] = {}
+            for _ in range(count):
+                size = body[pos]
+                key = body[pos + 1:pos + 1 + size].decode("utf-8")
+                pos += 1 + size
+                kind = body[pos:pos + 1]
+                pos += 1
+                if kind in self._KINDS:
+                    fmt = self._KINDS[kind]
+                    (msg[key],) = fmt.unpack_from(body, pos)
+                    pos += fmt.size
+                elif kind == b"s":
+                    size = body[pos]
+                    msg[key] = body[pos + 1:pos + 1 + size].decode("utf-8")
+                    pos += 1 + size
+                elif kind in (b"t", b"f", b"n"):
+                    msg[key] = {b"t": True, b"f": False, b"n": None}[kind]
+                else:
+                    return None
+        except (IndexError, struct.error, UnicodeDecodeError):
+            return None
+        if pos != len(body):
+            return None
+        msg["seq"] = seq
+        return msg
+
+
+class InputHistorySchema:
+    """Layout for ``inputs`` messages carrying the last few input bitmasks.
+
+    ``seq`` numbers the newest input and ``history`` lists bitmasks newest
+    first, so input ``seq - i`` is ``history[i]``.
+    """
+
+    _HEAD = struct.Struct("!IBB")
+
+    def __init__(self, tag: int) -> None:
+        self.tag = tag
+        self.msg_type = "inputs"
+
+    def matches(self, msg: Dict[str, Any]) -> bool:
+        keys = {"type", "seq", "player", "history"}
+        return msg.get("type") == "inputs" and msg.keys() == keys
+
+    def pack(self, msg: Dict[str, Any]) -> bytes | None:
+        history = msg["history"]
+        try:
+            return self._HEAD.pack(msg["seq"], msg["player"], len(history)) + struct.pack(
+                f"!{len(history)}H", *history
+            )
+        except (struct.error, TypeError):
+            # not a bitmask list; the message goes out in the generic format
+            return None
+
+    def unpack(self, body: bytes) -> Dict[str, Any] | None:
+        try:
+            seq, player, count = self._HEAD.unpack_from(body)
+            history = list(struct.unpack_from(f"!{count}H", body, self._HEAD.size))
+        except struct.error:
+            return None
+        if len(body) != self._HEAD.size + 2 * count:
+            return None
+        return {"type": "inputs", "seq": seq, "player": player, "history": history}
+
+
+_Schema = Union[MessageSchema, StateSchema, InputHistorySchema]
+_BY_TAG: Dict[int, _Schema] = {}
+_SCHEMAS: List[_Schema] = []
+
+
+def register_schema(schema: _Schema) -> None:
+    """Add ``schema`` to the registry used by :func:`encode_message`."""
+    if not 0x10 <= schema.tag <= 0x1F:
+        raise ValueError("binary schema tags must be in 0x10-0x1f")
+    if schema.tag in _BY_TAG:
+        raise ValueError(f"duplicate schema tag: {schema.tag:#x}")
+    _BY_TAG[schema.tag] = schema
+    _SCHEMAS.append(schema)
+
+
+register_schema(StateSchema(0x10))
+register_schema(MessageSchema(0x11, "ack", [("seq", "I")]))
+register_schema(MessageSchema(0x12, "ping", [("nonce", "I")]))
+register_schema(MessageSchema(0x13, "pong", [("nonce", "I")]))
+register_schema(MessageSchema(0x14, "input", [("seq", "I"), ("frame", "I"), ("bits", "I")]))
+register_schema(InputHistorySchema(0x15))
+
+
+def is_binary(data: bytes) -> bool:
+    """Return True if ``data`` starts with a registered schema tag."""
+    return bool(data) and data[0] in _BY_TAG
+
+
+def encode_message(msg: Dict[str, Any], key: bytes | None = None) -> bytes | None:
+    """Pack ``msg`` with the first matching schema or return ``None``."""
+    for schema in _SCHEMAS:
+        if schema.matches(msg):
+            body = schema.pack(msg)
+            if body is None:
+                return None
+            if key:
+                body = _xor(body, key)
+            return bytes([schema.tag]) + body
+    return None
+
+
+def decode_message(data: bytes, key: bytes | None = None) -> Dict[str, Any] | None:
+    """Unpack a packet produced by :func:`encode_message`."""
+    schema = _BY_TAG.get(data[0]) if data else None
+    if schema is None:
+        return None
+    body = data[1:]
+    if key:
+        body = _xor(body, key)
+    return schema.unpack(body)
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.async_network import AsyncNetworkManager
+from hololive_coliseum.network import NetworkManager
+
+
+def test_async_receive_state(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    async def run():
+        host = AsyncNetworkManager(host=True, address=("127.0.0.1", 0))
+        await host.start()
+        client = NetworkManager(host=False, address=host.sock.getsockname())
+        client.send_state({"x": 1})
+        addr, msg = await asyncio.wait_for(host.recv(), 1.0)
+        assert msg["x"] == 1
+        assert addr[1] == client.sock.getsockname()[1]
+        host.close()
+        client.sock.close()
+
+    asyncio.run(run())
+
+
+def test_async_answers_control_messages(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    async def run():
+        async with AsyncNetworkManager(host=True, address=("127.0.0.1", 0)) as router:
+            addr = router.sock.getsockname()
+            loop = asyncio.get_running_loop()
+            latency = await loop.run_in_executor(
+                None, lambda: NetworkManager.ping_node(addr, timeout=0.5)
+            )
+            assert latency is not None
+            # control packets never reach the message stream
+            assert router.poll() == []
+
+    asyncio.run(run())
+
+
+def test_async_iterator_ends_on_close(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    async def run():
+        host = AsyncNetworkManager(host=True, address=("127.0.0.1", 0))
+        await host.start()
+        client = NetworkManager(host=False, address=host.sock.getsockname())
+        client.send_state({"x": 2})
+        received = []
+        async for _, msg in host:
+            received.append(msg)
+            host.close()
+        assert received[0]["x"] == 2
+        client.sock.close()
+
+    asyncio.run(run())
+
+
+def test_async_manager_evicts_idle_peer_stats(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    async def run():
+        host = AsyncNetworkManager(host=True, address=("127.0.0.1", 0))
+        host.peer_stats.max_idle = 0.05
+        await host.start()
+        client = NetworkManager(host=False, address=host.sock.getsockname())
+        client.send_state({"x": 3})
+        await asyncio.wait_for(host.recv(), 1.0)
+        assert len(host.peer_stats) == 1
+        # only the background loop runs; nobody calls poll()
+        await asyncio.sleep(host.ack_timeout)
+        assert len(host.peer_stats) == 0 and host.peer_stats.evicted == 1
+        host.close()
+        client.sock.close()
+
+    asyncio.run(run())
+
+
+def test_async_manager_skips_a_message_the_sender_gave_up_on(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    async def run():
+        host = AsyncNetworkManager(host=True, address=("127.0.0.1", 0))
+        await host.start()
+        sender = NetworkManager(host=False, address=("127.0.0.1", 9))
+        for n in range(3):
+            sender.send_reliable({"type": "event", "n": n}, channel="c")
+        first, _, third = [entry[0] for _, entry in sorted(sender._pending_acks.items())]
+        src = ("127.0.0.1", 40003)
+        host._datagram_received(first, src)
+        host._datagram_received(third, src)
+        _, msg = await asyncio.wait_for(host.recv(), 1.0)
+        assert msg["n"] == 0 and host.poll() == []
+        host._channels[(src, "c")].timeout = 0
+        # released by the background loop, not by a poll() call
+        _, msg = await asyncio.wait_for(host.recv(), 1.0)
+        assert msg["n"] == 2
+        host.close()
+        sender.sock.close()
+
+    asyncio.run(run())
+
+
+def test_async_manager_forwards_options(tmp_path, monkeypatch):
+    import socket
+    from hololive_coliseum.interest import InterestManager
+
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    interest = InterestManager()
+    reuse = hasattr(socket, "SO_REUSEPORT")
+    first = AsyncNetworkManager(
+        host=True, address=("127.0.0.1", 0), binary=False, state_budget=600,
+        interest=interest, reuse_port=reuse,
+    )
+    assert first.binary is False
+    assert first.scheduler is not None and first.interest is interest
+    if reuse:
+        second = AsyncNetworkManager(
+            host=True, address=first.sock.getsockname(), reuse_port=True
+        )
+        second.sock.close()
+    first.sock.close()
@@ -0,0 +1,126 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.blockchain import _hash_block, verify_chain
+from hololive_coliseum.chain_sync import ChainSync
+from hololive_coliseum.network import NetworkManager
+
+
+def _extend(chain, count, tag):
+    chain = list(chain)
+    for _ in range(count):
+        block = {
+            'index': len(chain),
+            'game_id': f'{tag}{len(chain)}',
+            'players': ['a', 'b'],
+            'winner': 'a',
+            'bet': 0,
+            'timestamp': 0,
+            'prev_hash': chain[-1]['hash'] if chain else '',
+        }
+        block['hash'] = _hash_block(block)
+        chain.append(block)
+    return chain
+
+
+class Node:
+    def __init__(self, chain, **kwargs):
+        self.chain = chain
+        self.saves = 0
+        self.sync = ChainSync(load=lambda: self.chain, save=self._save, **kwargs)
+
+    def _save(self, chain):
+        self.chain = chain
+        self.saves += 1
+
+
+def _run(a, b, first):
+    """Exchange messages between two nodes until they go quiet."""
+    queue = [(b, a, first)]
+    messages = 0
+    while queue:
+        src, dst, msg = queue.pop(0)
+        messages += 1
+        queue.extend((dst, src, reply) for reply in dst.sync.handle(src, msg))
+    return messages
+
+
+def test_peer_ahead_sends_only_missing_blocks():
+    base = _extend([], 100, 'g')
+    a = Node(base)
+    b = Node(_extend(base, 70, 'g'))
+    _run(a, b, b.sync.status())
+    assert a.chain == b.chain and verify_chain(a.chain)
+    assert a.sync.hash_requests == 1
+    assert a.sync.blocks_received == 70
+    assert a.sync.synced == 1 and a.sync.session is None
+
+
+def test_fork_found_by_binary_search():
+    base = _extend([], 200, 'g')
+    a = Node(_extend(base, 10, 'x'))
+    b = Node(_extend(base, 40, 'y'))
+    _run(a, b, b.sync.status())
+    assert a.chain == b.chain
+    assert a.sync.blocks_received == 40
+    assert a.sync.hash_requests <= 10
+
+
+def test_shorter_chain_is_never_adopted():
+    base = _extend([], 20, 'g')
+    a = Node(_extend(base, 5, 'x'))
+    b = Node(_extend(base, 2, 'y'))
+    original = a.chain
+    _run(a, b, b.sync.status())
+    # a answered with its own status, so b synced from a instead
+    assert a.chain == original and a.saves == 0
+    assert b.chain == original
+
+
+def test_window_limits_outstanding_requests():
+    a = Node([], batch=10, window=3)
+    b = Node(_extend([], 95, 'g'))
+    requests = a.sync.handle(b, b.sync.status())
+    assert [r['start'] for r in requests] == [0, 10, 20]
+    # answer out of order; the next request follows each answer
+    reply = b.sync.handle(a, requests[2])[0]
+    assert a.sync.handle(b, reply)[0]['start'] == 30
+    assert a.saves == 0
+    for request in requests[:2]:
+        a.sync.handle(b, b.sync.handle(a, request)[0])
+    assert len(a.chain) == 30
+
+
+def test_tampered_batch_is_rejected():
+    a = Node([])
+    b = Node(_extend([], 5, 'g'))
+    request = a.sync.handle(b, b.sync.status())[0]
+    reply = b.sync.handle(a, request)[0]
+    reply['blocks'][2] = dict(reply['blocks'][2], winner='b')
+    assert a.sync.handle(b, reply) == []
+    assert a.sync.rejected == 1 and a.chain == []
+    assert a.sync.session is None
+
+
+def test_nodes_sync_over_network(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    a = NetworkManager(host=True, address=("127.0.0.1", 0))
+    b = NetworkManager(host=True, address=("127.0.0.1", 0))
+    a_node = Node(_extend([], 10, 'g'))
+    b_node = Node(_extend(a_node.chain, 150, 'g'))
+    a.chain_sync = a_node.sync
+    b.chain_sync = b_node.sync
+    b.announce_chain([a.sock.getsockname()])
+    deadline = time.time() + 3
+    while a_node.chain != b_node.chain and time.time() < deadline:
+        time.sleep(0.005)
+        a.poll()
+        b.poll()
+    assert a_node.chain == b_node.chain
+    a.sock.close()
+    b.sock.close()
@@ -309,6 +309,9 @@ def test_accounts_menu(tmp_path, monkeypatch):
 
 def test_start_and_stop_node(tmp_path, monkeypatch):
     monkeypatch.setattr("hololive_coliseum.save_manager.SAVE_DIR", tmp_path)
+    monkeypatch.setattr("hololive_coliseum.node_registry.SAVE_DIR", tmp_path)
+    monkeypatch.setattr("hololive_coliseum.node_registry.NODES_FILE", tmp_path / "nodes.json")
+    monkeypatch.setattr("hololive_coliseum.node_registry.DEFAULT_NODES", [])
     from hololive_coliseum.game import Game
 
     game = Game()
@@ -319,6 +322,32 @@ def test_start_and_stop_node(tmp_path, monkeypatch):
     assert game.network_manager is None
     assert not game.node_hosting
 
+
+def test_f3_toggles_net_stats_overlay(tmp_path, monkeypatch):
+    monkeypatch.setattr("hololive_coliseum.save_manager.SAVE_DIR", tmp_path)
+    monkeypatch.setattr("hololive_coliseum.node_registry.SAVE_DIR", tmp_path)
+    monkeypatch.setattr("hololive_coliseum.node_registry.NODES_FILE", tmp_path / "nodes.json")
+    monkeypatch.setattr("hololive_coliseum.node_registry.DEFAULT_NODES", [])
+    import pygame
+
+    from hololive_coliseum.game import Game
+
+    game = Game(width=400, height=300)
+    game.start_node()
+    game.network_manager.peer_stats.received(("127.0.0.1", 5000), 100)
+    game.screen.fill((0, 0, 0))
+    blank = pygame.image.tobytes(game.screen, "RGB")
+    game._draw_net_stats()
+    assert pygame.image.tobytes(game.screen, "RGB") == blank
+    game.show_net_stats = True
+    game._draw_net_stats()
+    assert pygame.image.tobytes(game.screen, "RGB") != blank
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, {"key": pygame.K_F3}))
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    game.run()
+    assert not game.show_net_stats
+    game.stop_node()
+
 def test_game_over_state(tmp_path, monkeypatch):
     monkeypatch.setattr("hololive_coliseum.save_manager.SAVE_DIR", tmp_path)
     import pygame
@@ -487,7 +516,3 @@ def test_play_again_returns_to_char(tmp_path, monkeypatch):
     game.run()
     assert game.state == "char"
     pygame.quit()
-    monkeypatch.setattr('hololive_coliseum.save_manager.SAVE_DIR', tmp_path)
-    from hololive_coliseum.game import Game
-    game = Game()
-    assert game.mp_type_options == ["Offline", "Online"]
@@ -0,0 +1,206 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.gossip import GossipTable
+from hololive_coliseum.network import NetworkManager
+from hololive_coliseum.node_registry import add_node
+
+
+def test_delta_only_carries_new_entries():
+    a, b = GossipTable("a"), GossipTable("b")
+    for i in range(10):
+        a.set("games", ("10.0.0.%d" % i, 1))
+    msg = a.delta_for("b")
+    assert len(msg["entries"]) == 10
+    b.receive(msg)
+    assert sorted(b.live("games")) == sorted(a.live("games"))
+    assert a.delta_for("b") is None
+    a.set("clients", ("10.0.1.1", 2))
+    a.set("games", ("10.0.0.3", 1), alive=False)
+    msg = a.delta_for("b")
+    assert len(msg["entries"]) == 2
+    b.receive(msg)
+    assert ("10.0.0.3", 1) not in b.live("games")
+    assert b.live("clients") == [("10.0.1.1", 2)]
+
+
+def test_lost_delta_is_repaired_by_digest():
+    a, b = GossipTable("a"), GossipTable("b")
+    a.set("games", ("h", 1))
+    a.delta_for("b")  # lost on the way
+    a.set("games", ("h", 2))
+    assert b.receive(a.delta_for("b")) == [] and b.gaps == 1
+    a.receive_digest("b", b.digest())
+    b.receive(a.delta_for("b"))
+    assert sorted(b.live("games")) == [("h", 1), ("h", 2)]
+    assert b.clock == a.clock
+
+
+def test_large_delta_is_split():
+    a, b = GossipTable("a"), GossipTable("b")
+    for i in range(10):
+        a.set("games", ("h", i))
+    first = a.delta_for("b", limit=4)
+    second = a.delta_for("b", limit=4)
+    third = a.delta_for("b", limit=4)
+    assert [len(m["entries"]) for m in (first, second, third)] == [4, 4, 2]
+    for msg in (first, second, third):
+        b.receive(msg)
+    assert len(b.live("games")) == 10 and b.gaps == 0
+
+
+def test_newest_write_wins_across_origins():
+    a, b, c = GossipTable("a"), GossipTable("b"), GossipTable("c")
+    a.set("games", ("h", 1))
+    b.receive(a.delta_for("b"))
+    b.set("games", ("h", 1), alive=False)
+    c.receive(b.delta_for("c"))
+    c.receive(a.delta_for("c"))
+    assert c.live("games") == []
+
+
+def test_malformed_gossip_is_ignored():
+    table = GossipTable("a")
+    for msg in (
+        {"type": "gossip", "clock": [1], "since": {}, "entries": []},
+        {"type": "gossip", "clock": {"b": "1"}, "since": {}, "entries": []},
+        {"type": "gossip", "clock": {"b": 1}, "since": {"b": [0]}, "entries": []},
+        {"type": "gossip", "clock": {"b": 1}, "since": {}, "entries": 5},
+    ):
+        assert table.receive(msg) == []
+    assert table.rejected == 4
+    bad_entries = [["g", "h", "x", "b", 1, True], ["g", "h", 1, ["b"], 1, True],
+                   ["g", "h", 2, "b", "1", True], ["g", ["h"], 3, "b", 1, True]]
+    msg = {"type": "gossip", "clock": {"b": 1}, "since": {}, "entries": bad_entries}
+    assert table.receive(msg) == [] and table.live("games") == []
+    for clock in ({"a": "b"}, [1], "x", {"a": -1}):
+        table.receive_digest("peer", {"type": "digest", "clock": clock})
+        assert not table.behind({"type": "digest", "clock": clock})
+    assert table.rejected == 8 and "peer" not in table._peers
+
+
+def test_router_survives_malformed_lists(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    router = NetworkManager(host=True, address=("127.0.0.1", 0))
+    src = ("127.0.0.1", 40010)
+    for msg in (
+        {"type": "games_update", "games": [1]},
+        {"type": "games_update", "games": 7},
+        {"type": "clients_update", "clients": [["h"], ["h", "p"], [1, 2]]},
+        {"type": "gossip", "clock": [1], "since": {}, "entries": []},
+        {"type": "digest", "clock": {"a": "b"}},
+    ):
+        assert router._receive(router._encode(msg), src) == []
+    assert not router.games and not router.live_clients
+    router._receive(router._encode({"type": "games_update", "games": [["h", 5]]}), src)
+    assert ("h", 5) in router.games
+    router.sock.close()
+
+
+def test_routers_gossip_registrations(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    routers = [NetworkManager(host=True, address=("127.0.0.1", 0)) for _ in range(3)]
+    for router in routers:
+        add_node(router.sock.getsockname())
+
+    def settle():
+        for _ in range(3):
+            time.sleep(0.01)
+            for router in routers:
+                router.poll()
+
+    host = NetworkManager(host=False, address=routers[0].sock.getsockname())
+    host.register_game([routers[0].sock.getsockname()])
+    settle()
+    port = host.sock.getsockname()[1]
+    assert all(any(p == port for _, p in r.games) for r in routers)
+    sent = routers[0].bytes_sent
+    # a second registration is not news and sends nothing
+    host.register_game([routers[0].sock.getsockname()])
+    settle()
+    assert routers[0].bytes_sent == sent
+    # an entry whose gossip was lost reaches a peer through anti-entropy
+    routers[2].gossip.set("games", ("9.9.9.9", 9))
+    routers[2].gossip_tick(now=0.0)
+    settle()
+    assert any(("9.9.9.9", 9) in r.games for r in routers[:2])
+    for sock in [host.sock] + [r.sock for r in routers]:
+        sock.close()
+
+
+def test_new_router_receives_a_large_table_at_once(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    old = NetworkManager(host=True, address=("127.0.0.1", 0))
+    for i in range(200):
+        old.gossip.set("games", ("10.0.%d.%d" % (i // 250, i % 250), 7000))
+    new = NetworkManager(host=True, address=("127.0.0.1", 0))
+    new.broadcast_announce([old.sock.getsockname()])
+    for _ in range(4):
+        time.sleep(0.01)
+        old.poll()
+        new.poll()
+    assert len(new.games) == 200
+    old.sock.close()
+    new.sock.close()
+
+
+def test_leases_expire_and_propagate(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    router1 = NetworkManager(host=True, address=("127.0.0.1", 0))
+    router2 = NetworkManager(host=True, address=("127.0.0.1", 0))
+    addr1 = router1.sock.getsockname()
+    add_node(router2.sock.getsockname())
+    for router in (router1, router2):
+        router.lease_time = 0.1
+    game = NetworkManager(host=False, address=addr1)
+    client = NetworkManager(host=False, address=addr1)
+    game.register_game([addr1])
+    client.register_client([addr1])
+
+    def settle():
+        for _ in range(2):
+            time.sleep(0.01)
+            router1.poll()
+            router2.poll()
+
+    settle()
+    assert len(router2.games) == 1 and len(router2.live_clients) == 1
+    time.sleep(0.06)
+    game.heartbeat([addr1])
+    settle()
+    time.sleep(0.03)
+    # the game renewed its lease, the client did not
+    assert router1.expire_leases() == 1
+    assert len(router1.games) == 1 and not router1.live_clients
+    settle()
+    assert len(router2.games) == 1 and not router2.live_clients
+    assert router1.expire_leases(now=time.monotonic() + 1) == 1
+    settle()
+    assert not router1.games and not router2.games
+    assert router1.leases_expired == 2
+    for sock in (game.sock, client.sock, router1.sock, router2.sock):
+        sock.close()
+
+
+def test_renewals_leave_one_live_lease(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    router = NetworkManager(host=True, address=("127.0.0.1", 0))
+    for _ in range(50):
+        router._refresh("games", ("10.0.0.1", 1))
+    assert len(router._leases) == 1
+    assert router.expire_leases(now=time.monotonic() + router.lease_time + 1) == 1
+    assert not router._lease_heap
+    router.sock.close()
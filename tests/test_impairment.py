@@ -0,0 +1,102 @@
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.impairment import ImpairedSocket, impair
+from hololive_coliseum.network import NetworkManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _pair():
+    rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rx.bind(("127.0.0.1", 0))
+    rx.setblocking(False)
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    return tx, rx
+
+
+def _drain(rx):
+    got = []
+    time.sleep(0.01)
+    while True:
+        try:
+            got.append(rx.recvfrom(4096)[0])
+        except BlockingIOError:
+            return got
+
+
+def test_seeded_loss_is_reproducible():
+    patterns = []
+    for _ in range(2):
+        tx, rx = _pair()
+        wrapped = ImpairedSocket(tx, loss=0.3, seed=7)
+        for i in range(100):
+            wrapped.sendto(bytes([i]), rx.getsockname())
+        patterns.append(_drain(rx))
+        assert wrapped.dropped == 100 - len(patterns[-1])
+        tx.close()
+        rx.close()
+    assert patterns[0] == patterns[1]
+    assert 15 < 100 - len(patterns[0]) < 45
+
+
+def test_latency_holds_datagrams_until_due():
+    clock = FakeClock()
+    tx, rx = _pair()
+    wrapped = ImpairedSocket(tx, latency=0.1, jitter=0.05, seed=1, clock=clock)
+    wrapped.sendto(b"a", rx.getsockname())
+    assert wrapped.pending == 1 and _drain(rx) == []
+    clock.now = 0.16
+    assert wrapped.pump() == 1
+    assert _drain(rx) == [b"a"]
+    tx.close()
+    rx.close()
+
+
+def test_duplicates_and_reordering():
+    clock = FakeClock()
+    tx, rx = _pair()
+    wrapped = ImpairedSocket(tx, duplicate=1.0, reorder=0.5, seed=3, clock=clock)
+    for i in range(20):
+        wrapped.sendto(bytes([i]), rx.getsockname())
+        clock.now += 0.001
+    clock.now += 1
+    wrapped.pump()
+    got = _drain(rx)
+    assert len(got) == 40 and wrapped.duplicated == 20
+    assert wrapped.reordered and got != sorted(got)
+    tx.close()
+    rx.close()
+
+
+def test_reliable_delivery_survives_impaired_link(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    host = NetworkManager(host=True, address=("127.0.0.1", 0))
+    client = NetworkManager(host=False, address=host.sock.getsockname())
+    client.ack_timeout = 0.02
+    impair(client, latency=0.005, jitter=0.005, loss=0.4, seed=11)
+    for i in range(10):
+        client.send_reliable({"type": "chat", "n": i}, max_retries=20)
+    received = set()
+    deadline = time.time() + 3
+    while len(received) < 10 and time.time() < deadline:
+        time.sleep(0.005)
+        client.process_reliable()
+        client.poll()
+        received.update(msg["n"] for _, msg in host.poll() if msg.get("type") == "chat")
+    assert received == set(range(10))
+    assert client.sock.dropped > 0 and client.retransmits > 0
+    host.sock.close()
+    client.sock.close()
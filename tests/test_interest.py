@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.interest import InterestManager, SpatialGrid, drop_departed
+from hololive_coliseum.network import NetworkManager
+from hololive_coliseum.state_sync import StateSync
+
+
+def test_grid_query_radius():
+    grid = SpatialGrid(50)
+    grid.insert("a", 0, 0)
+    grid.insert("b", 30, 40)
+    grid.insert("c", 200, 0)
+    assert sorted(e for e, _ in grid.query(0, 0, 50)) == ["a", "b"]
+
+
+def test_filter_with_enter_and_leave_handoff():
+    interest = InterestManager(radius=100, margin=20)
+    interest.set_view("c1", "p1")
+    state = {"p1.x": 0, "p1.y": 0, "p2.x": 90, "p2.y": 0, "score": 3}
+    interest.index(state)
+    view = interest.filter("c1", state)
+    assert view["p2.x"] == 90 and view["score"] == 3
+    assert view["p2.gone"] is False
+    # inside the margin the entity stays visible
+    state["p2.x"] = 110
+    interest.index(state)
+    view = interest.filter("c1", state)
+    assert view["p2.x"] == 110 and "p2.gone" not in view
+    state["p2.x"] = 130
+    interest.index(state)
+    view = interest.filter("c1", state)
+    assert "p2.x" not in view and view["p2.gone"] is True
+    # clients without a view receive everything
+    assert interest.filter("c2", state) == state
+
+
+def test_host_sends_only_nearby_entities(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    interest = InterestManager(radius=100, margin=0)
+    host = NetworkManager(host=True, address=("127.0.0.1", 0), interest=interest)
+    addr = host.sock.getsockname()
+    client = NetworkManager(host=False, address=addr)
+    client.send_state({"hello": 1})
+    time.sleep(0.01)
+    host.poll()
+    interest.set_view(next(iter(host.clients)), "p1")
+    host.send_state({"p1.x": 0, "p1.y": 0, "p2.x": 500, "p2.y": 0})
+    time.sleep(0.01)
+    sync = StateSync()
+    state = drop_departed(sync.apply(client.poll()[0][1]))
+    assert state["p1.x"] == 0 and "p2.x" not in state
+    host.sock.close()
+    client.sock.close()
@@ -0,0 +1,32 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum import load_test, node_registry
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert load_test._percentile(values, 50) == 50.0
+    assert load_test._percentile(values, 99) == 99.0
+    assert load_test._percentile([], 50) is None
+
+
+def test_run_reports_traffic(tmp_path):
+    before = node_registry.NODES_FILE, node_registry.DEFAULT_NODES
+    nodes_file = str(tmp_path / "nodes.json")
+    rates = {"join": 5.0, "find": 10.0, "ping": 10.0, "state": 30.0, "reliable": 10.0}
+    report = load_test.run(
+        clients=3, duration=0.3, rates=rates, secret=b"k", nodes_file=nodes_file
+    )
+    # the run's host went to its own registry, which is gone from the module
+    assert (node_registry.NODES_FILE, node_registry.DEFAULT_NODES) == before
+    assert os.path.exists(nodes_file)
+    assert report["clients"] == 3
+    assert all(report["sent"][kind] > 0 for kind in rates)
+    assert report["datagrams_received"] > 0 and report["poll_calls"] > 0
+    assert report["poll_p50_ms"] <= report["poll_p99_ms"]
+    assert report["replies"]["pong"] > 0 and report["replies"]["games"] > 0
+    assert report["dropped_to_host"] == 0
+    assert report["rejected"] == 0
@@ -0,0 +1,194 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.holographic_compression import compress_packet
+from hololive_coliseum.input_history import InputHistory, InputReceiver
+from hololive_coliseum.lockstep import LockstepSession
+from hololive_coliseum.network import NetworkManager
+from hololive_coliseum.wire_codec import decode_message, encode_message
+
+
+class World:
+    def __init__(self):
+        self.frames = []
+
+    def simulate(self, inputs):
+        self.frames.append(inputs)
+
+
+def test_inputs_message_is_binary_and_compact():
+    hist = InputHistory(size=8)
+    for bits in range(10):
+        hist.push(bits)
+    msg = hist.message(player=1)
+    assert msg["seq"] == 10 and msg["history"] == [9, 8, 7, 6, 5, 4, 3, 2]
+    packet = encode_message(msg)
+    assert packet is not None and len(packet) == 1 + 6 + 16
+    assert decode_message(packet) == msg
+
+
+def test_receiver_recovers_from_history():
+    hist, recv = InputHistory(size=3), InputReceiver()
+    msgs = []
+    for bits in (1, 2, 3, 4):
+        hist.push(bits)
+        msgs.append(hist.message())
+    assert recv.receive(msgs[0]) == [(1, 1)]
+    # message 2 and 3 were dropped; 4 still carries both
+    assert recv.receive(msgs[3]) == [(2, 2), (3, 3), (4, 4)]
+    assert recv.receive(msgs[2]) == [] and recv.lost == 0
+
+
+def test_receiver_counts_inputs_beyond_history():
+    hist, recv = InputHistory(size=2), InputReceiver()
+    for bits in range(5):
+        hist.push(bits)
+    assert recv.receive(hist.message()) == [(4, 3), (5, 4)]
+    assert recv.lost == 3
+
+
+def test_malformed_inputs_are_dropped(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    host = NetworkManager(host=True, address=("127.0.0.1", 0))
+    src = ("127.0.0.1", 40020)
+    bad = [
+        {"seq": "3", "history": [1]},
+        {"seq": 3, "history": 5},
+        {"seq": 3, "history": {"a": 1}},
+        {"seq": 1.5, "history": [1]},
+        {"seq": True, "history": [1]},
+        {"seq": -1, "history": [1]},
+        {"seq": 3, "history": ["x"]},
+        {"seq": 100, "history": [0] * 100},
+    ]
+    for msg in bad:
+        # the generic format keeps the bad types the binary codec would coerce
+        packet = compress_packet(dict(msg, type="inputs", player=0))
+        assert host._receive(packet, src) == []
+    receiver = host.input_receivers[src]
+    assert receiver.malformed == len(bad) and receiver.latest == 0
+    good = {"type": "inputs", "seq": 1, "player": 0, "history": [4]}
+    assert host._receive(host._encode(good), src)[0][1]["new"] == [(1, 4)]
+    host.sock.close()
+
+
+def test_peers_and_spectator_stay_in_step():
+    worlds = [World(), World(), World()]
+    a = LockstepSession(worlds[0].simulate, local=0)
+    b = LockstepSession(worlds[1].simulate, local=1)
+    spectator = LockstepSession(worlds[2].simulate, local=None)
+    for frame in range(30):
+        msg_a = a.add_local_input(frame % 4)
+        msg_b = b.add_local_input(frame % 3)
+        # every third packet from a is lost
+        if frame % 3:
+            b.receive(msg_a)
+            spectator.receive(msg_a)
+        a.receive(msg_b)
+        spectator.receive(msg_b)
+        for session in (a, b, spectator):
+            session.advance()
+    assert worlds[0].frames == worlds[1].frames == worlds[2].frames
+    assert worlds[0].frames[2] == (0, 0) and worlds[0].frames[3] == (1, 1)
+
+
+def test_stalls_until_remote_input_arrives():
+    world = World()
+    session = LockstepSession(world.simulate, input_delay=1)
+    session.add_local_input(1)
+    assert session.advance()
+    assert not session.advance() and session.stalls == 1
+    session.receive({"type": "inputs", "seq": 1, "player": 1, "history": [2]})
+    assert session.advance() and world.frames[-1] == (1, 2)
+
+
+def test_long_loss_is_recovered_by_request():
+    worlds = [World(), World()]
+    a = LockstepSession(worlds[0].simulate, local=0, redundancy=4)
+    b = LockstepSession(worlds[1].simulate, local=1, redundancy=4)
+    for frame in range(40):
+        msg_a = a.add_local_input(frame % 5)
+        msg_b = b.add_local_input(frame % 3)
+        # a burst of ten lost packets is more than the history covers
+        if not 5 <= frame < 15:
+            b.receive(msg_a)
+        a.receive(msg_b)
+        for request in b.requests():
+            b.receive(a.answer(request))
+        a.advance()
+        b.advance()
+    assert b.resend_requests >= 1 and b.frame >= 30
+    assert worlds[1].frames == worlds[0].frames[:len(worlds[1].frames)]
+    # only the owner of an input answers for it
+    assert b.answer({"type": "inputs_request", "player": 0, "seq": 1}) is None
+
+
+def test_recovery_through_a_host(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    host = NetworkManager(host=True, address=("127.0.0.1", 0))
+    client = NetworkManager(host=False, address=host.sock.getsockname())
+    client_addr = ("127.0.0.1", client.sock.getsockname()[1])
+    worlds = [World(), World()]
+    a = LockstepSession(worlds[0].simulate, local=0, redundancy=2, resend_after=2)
+    b = LockstepSession(worlds[1].simulate, local=1, redundancy=2, resend_after=2)
+    for frame in range(30):
+        msg_a = a.add_local_input(frame % 4)
+        msg_b = b.add_local_input(frame % 3)
+        host._send(host._encode(msg_a), client_addr)
+        # the client's packets for frames 1-8 are lost
+        if not 1 <= frame <= 8:
+            client.send_input(msg_b)
+        time.sleep(0.002)
+        for _, msg in host.poll():
+            if msg.get("type") in ("inputs", "inputs_resend"):
+                a.receive(msg)
+        for _, msg in client.poll():
+            if msg.get("type") == "inputs_request":
+                client.send_input(b.answer(msg))
+            else:
+                b.receive(msg)
+        for request in a.requests():
+            host._send(host._encode(request), client_addr)
+        a.advance()
+        b.advance()
+    time.sleep(0.002)
+    assert a.resend_requests >= 1 and a.frame >= 15
+    assert worlds[0].frames == worlds[1].frames[:len(worlds[0].frames)]
+    host.sock.close()
+    client.sock.close()
+
+
+def test_stalled_session_does_not_queue_inputs_further_ahead():
+    session = LockstepSession(World().simulate, input_delay=2)
+    for _ in range(3):
+        session.add_local_input(1)
+        session.advance()
+    # frame 2 waits for the remote input; seq 3 is already due at frame 4
+    assert session.frame == 2 and session.history.seq == 3
+    for _ in range(5):
+        assert session.add_local_input(1)["seq"] == 3
+    assert session.inputs_dropped == 5
+
+
+def test_inputs_travel_between_managers(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    host = NetworkManager(host=True, address=("127.0.0.1", 0))
+    client = NetworkManager(host=False, address=host.sock.getsockname())
+    session = LockstepSession(lambda inputs: None, local=1)
+    client.send_input(session.add_local_input(5))
+    time.sleep(0.01)
+    msgs = host.poll()
+    assert msgs and msgs[0][1] == {
+        "type": "inputs", "seq": 1, "player": 1, "history": [5], "new": [(1, 5)]
+    }
+    host.sock.close()
+    client.sock.close()
@@ -1,7 +1,6 @@
 import time
 import os
 import sys
-from pathlib import Path
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
@@ -10,17 +9,18 @@ from hololive_coliseum.state_sync import StateSync
 from hololive_coliseum.node_registry import load_nodes, add_node
 
 
-def test_network_send_receive():
+def _isolate_nodes(monkeypatch, tmp_path):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+
+
+def test_network_send_receive(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
     host = NetworkManager(host=True, address=("127.0.0.1", 0), encrypt_key=b"k")
     addr = host.sock.getsockname()
     client = NetworkManager(host=False, address=addr, encrypt_key=b"k")
     sync = StateSync()
-
-
-def test_network_send_receive():
-    host = NetworkManager(host=True, address=("127.0.0.1", 0))
-    addr = host.sock.getsockname()
-    client = NetworkManager(host=False, address=addr)
     msg = {"x": 1}
     client.send_state(msg)
     # Give OS time to deliver
@@ -31,10 +31,10 @@ def test_network_send_receive():
     assert state == msg
     host.sock.close()
     client.sock.close()
-    assert received and received[0][1] == msg
 
 
-def test_network_discovery():
+def test_network_discovery(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
     host = NetworkManager(host=True, address=("", 0))
     port = host.sock.getsockname()[1]
     time.sleep(0.01)
@@ -48,6 +48,22 @@ def test_network_discovery():
     host.sock.close()
 
 
+def test_network_discovery_with_secret(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
+    host = NetworkManager(host=True, address=("127.0.0.1", 0), secret=b"s")
+    port = host.sock.getsockname()[1]
+    servers = NetworkManager.discover(
+        timeout=0.1,
+        port=port,
+        broadcast_address="127.0.0.1",
+        process_host=host.poll,
+        secret=b"s",
+    )
+    assert servers == [("127.0.0.1", port)]
+    assert host.packets_rejected == 0
+    host.sock.close()
+
+
 def test_network_announce(tmp_path, monkeypatch):
     monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
     monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
@@ -65,7 +81,8 @@ def test_network_announce(tmp_path, monkeypatch):
     client.sock.close()
 
 
-def test_ping_node():
+def test_ping_node(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
     host = NetworkManager(host=True, address=("127.0.0.1", 0))
     addr = host.sock.getsockname()
 
@@ -88,7 +105,8 @@ def test_select_best_node(monkeypatch):
     assert best == nodes[1]
 
 
-def test_register_and_find_games():
+def test_register_and_find_games(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
     router = NetworkManager(host=True, address=("127.0.0.1", 0))
     router_addr = router.sock.getsockname()
     host = NetworkManager(host=False, address=router_addr)
@@ -104,7 +122,8 @@ def test_register_and_find_games():
     router.sock.close()
 
 
-def test_register_and_find_clients():
+def test_register_and_find_clients(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
     router = NetworkManager(host=True, address=("127.0.0.1", 0))
     router_addr = router.sock.getsockname()
     client = NetworkManager(host=False, address=router_addr)
@@ -120,11 +139,8 @@ def test_register_and_find_clients():
     router.sock.close()
 
 
-def test_nodes_share_games(monkeypatch):
-    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', Path('test_nodes'))
-    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', Path('test_nodes/nodes.json'))
-    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
-    os.makedirs('test_nodes', exist_ok=True)
+def test_nodes_share_games(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
 
     router1 = NetworkManager(host=True, address=("127.0.0.1", 0))
     router2 = NetworkManager(host=True, address=("127.0.0.1", 0))
@@ -153,11 +169,8 @@ def test_nodes_share_games(monkeypatch):
     router2.sock.close()
 
 
-def test_nodes_share_clients(monkeypatch):
-    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', Path('test_nodes2'))
-    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', Path('test_nodes2/nodes.json'))
-    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
-    os.makedirs('test_nodes2', exist_ok=True)
+def test_nodes_share_clients(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
 
     router1 = NetworkManager(host=True, address=("127.0.0.1", 0))
     router2 = NetworkManager(host=True, address=("127.0.0.1", 0))
@@ -193,7 +206,8 @@ def test_state_sync_delta():
     assert state == {'x': 1, 'y': 3}
 
 
-def test_reliable_packets():
+def test_reliable_packets(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
     host = NetworkManager(host=True, address=("127.0.0.1", 0))
     addr = host.sock.getsockname()
     client = NetworkManager(host=False, address=addr)
@@ -212,3 +226,209 @@ def test_reliable_packets():
     assert not client._pending_acks
     host.sock.close()
     client.sock.close()
+
+
+def test_coalesced_packets_share_datagram(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
+    host = NetworkManager(host=True, address=("127.0.0.1", 0))
+    addr = host.sock.getsockname()
+    client = NetworkManager(host=False, address=addr, coalesce=True)
+    client.send_state({"x": 1})
+    client.send_state({"x": 2})
+    client.send_reliable({"type": "hello"})
+    assert client.packets_sent == 0
+    client.flush()
+    assert client.packets_sent == 1
+    time.sleep(0.01)
+    received = host.poll()
+    assert [msg.get("x") for _, msg in received[:2]] == [1, 2]
+    assert received[2][1]["type"] == "hello"
+    assert host.packets_received == 1
+    host.sock.close()
+    client.sock.close()
+
+
+def test_signed_packets_checked_before_decoding(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
+    host = NetworkManager(host=True, address=("127.0.0.1", 0), secret=b"s")
+    addr = host.sock.getsockname()
+    client = NetworkManager(host=False, address=addr, secret=b"s")
+    forger = NetworkManager(host=False, address=addr, secret=b"wrong")
+    client.send_reliable({"type": "hello"})
+    forger.send_reliable({"type": "hello"})
+    time.sleep(0.01)
+    received = host.poll()
+    assert len(received) == 1 and received[0][1]["type"] == "hello"
+    assert host.packets_rejected == 1
+    host.sock.close()
+    client.sock.close()
+    forger.sock.close()
+
+
+def test_reliable_timer_touches_only_due_packets(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
+    client = NetworkManager(host=False, address=("127.0.0.1", 9))
+    client.send_reliable({"type": "slow"}, max_retries=1, importance=1)
+    client.send_reliable({"type": "fast"}, max_retries=1, importance=4)
+    time.sleep(client.ack_timeout / 4 + 0.01)
+    client.process_reliable()
+    assert client.retransmits == 1
+    retries = sorted(entry[2] for entry in client._pending_acks.values())
+    assert retries == [1, 3]
+    for _ in range(4):
+        time.sleep(client.ack_timeout / 4 + 0.01)
+        client.process_reliable()
+    assert client.reliable_expired == 1
+    client._ack_received(next(iter(client._pending_acks)))
+    assert not client._pending_acks
+    assert client.average_ack_latency() is not None
+    client.sock.close()
+
+
+def test_acks_piggyback_on_outgoing_datagrams(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
+    host = NetworkManager(host=True, address=("127.0.0.1", 0), coalesce=True)
+    addr = host.sock.getsockname()
+    client = NetworkManager(host=False, address=addr)
+    for i in range(5):
+        client.send_reliable({"type": "event", "n": i})
+    time.sleep(0.01)
+    assert len(host.poll()) == 5
+    host.send_state({"x": 1})
+    host.flush()
+    # one state datagram carries the receipts, no standalone acks are sent
+    assert host.packets_sent == 1
+    time.sleep(0.01)
+    received = client.poll()
+    assert received[0][1]["x"] == 1
+    assert not client._pending_acks
+    assert client.acks_received == 5
+    host.sock.close()
+    client.sock.close()
+
+
+def test_duplicate_reliable_packets_dropped(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
+    host = NetworkManager(host=True, address=("127.0.0.1", 0))
+    addr = host.sock.getsockname()
+    client = NetworkManager(host=False, address=addr)
+    client.send_reliable({"type": "hello"})
+    payload = next(iter(client._pending_acks.values()))[0]
+    client._transmit(payload, addr)
+    time.sleep(0.01)
+    received = host.poll()
+    assert len(received) == 1
+    assert host.duplicates_dropped == 1
+    host.sock.close()
+    client.sock.close()
+
+
+def test_ordered_channel_delivery(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
+    host = NetworkManager(host=True, address=("127.0.0.1", 0))
+    # the client sends into the void; packets are handed to the host manually
+    client = NetworkManager(host=False, address=("127.0.0.1", 9))
+    client.send_reliable({"type": "block", "n": 1}, channel="chain")
+    client.send_reliable({"type": "block", "n": 2}, channel="chain")
+    first, second = [entry[0] for _, entry in sorted(client._pending_acks.items())]
+    src = client.sock.getsockname()
+    assert host._receive(second, src) == []
+    received = host._receive(first, src)
+    assert [msg["n"] for _, msg in received] == [1, 2]
+    host.sock.close()
+    client.sock.close()
+
+
+def _datagram(sender, msg, dest):
+    return sender._frame(sender._encode(msg), dest)
+
+
+def test_restarted_peer_gets_a_new_session(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
+    host = NetworkManager(host=True, address=("127.0.0.1", 0))
+    dest = host.sock.getsockname()
+    src = ("127.0.0.1", 40000)
+    old = NetworkManager(host=False, address=dest)
+    for n in range(3):
+        old.send_reliable({"type": "event", "n": n}, channel="c")
+    sent = [entry[0] for _, entry in sorted(old._pending_acks.items())]
+    for payload in sent:
+        assert len(host._receive(old._frame(payload, dest), src)) == 1
+    # the same address comes back as a fresh process numbering from 1 again
+    new = NetworkManager(host=False, address=dest)
+    new.send_reliable({"type": "event", "n": 0}, channel="c")
+    payload = next(iter(new._pending_acks.values()))[0]
+    received = host._receive(new._frame(payload, dest), src)
+    assert [msg["n"] for _, msg in received] == [0]
+    assert host.duplicates_dropped == 0
+    assert host.sessions_reset == 1
+    # late datagrams from the old process are not mistaken for a restart
+    assert host._receive(old._frame(sent[0], dest), src) == []
+    assert host.sessions_reset == 1
+    for manager in (host, old, new):
+        manager.sock.close()
+
+
+def test_state_from_restarted_host_is_applied(tmp_path, monkeypatch):
+    _isolate_nodes(monkeypatch, tmp_path)
+    client = NetworkManager(host=False, address=("127.0.0.1", 9))
+    src = ("127.0.0.1", 40001)
+    sync = StateSync()
+    old = NetworkManager(host=False, address=("127.0.0.1", 9))
+    for x in range(5):
+        delta = old._sync.encode({"x": x, "hp": 3})
+        for _, msg in client._receive(_datagram(old, delta, src), src):
+            state = sync.apply(msg)
+    assert state == {"x": 4, "hp": 3}
+    new = NetworkManager(host=False, address=("127.0.0.1", 9))
+    delta = new._sync.encode({"x": 100})
+    (_, msg), = client._receive(_datagram(new, delta, src), src)
+    assert sync.apply(msg) == {"x": 100}
+    for manager in (client, old, new):
+        manager.sock.close()
+
+
+def test_malformed_reliable_headers_are_dropped():
+    peer = NetworkManager(host=False, address=("127.0.0.1", 9))
+    src = ("127.0.0.1", 40002)
+    for msg in (
+        {"type": "event", "reliable": True, "seq": "a"},
+        {"type": "event", "reliable": True, "seq": -1},
+        {"type": "event", "reliable": True, "seq": [1]},
+        {"type": "event", "reliable": True, "seq": 1, "channel": [1], "cseq": 1},
+        {"type": "event", "reliable": True, "seq": 2, "channel": "c", "cseq": "x"},
+        {"type": "ack", "seq": [1]},
+    ):
+        assert peer._receive(peer._encode(msg), src) == []
+    assert src not in peer._ack_windows
+    peer.sock.close()
+
+
+def test_ordered_channel_skips_a_message_the_sender_gave_up_on():
+    peer = NetworkManager(host=False, address=("127.0.0.1", 9))
+    src = ("127.0.0.1", 40003)
+    sender = NetworkManager(host=False, address=("127.0.0.1", 9))
+    for n in range(3):
+        sender.send_reliable({"type": "event", "n": n}, channel="c")
+    first, _, third = [entry[0] for _, entry in sorted(sender._pending_acks.items())]
+    peer._receive(first, src)
+    assert peer._receive(third, src) == []
+    assert peer.poll() == []
+    peer._channels[(src, "c")].timeout = 0
+    assert [msg["n"] for _, msg in peer.poll()] == [2]
+    peer.sock.close()
+    sender.sock.close()
+
+
+def test_large_game_list_is_fragmented(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    host = NetworkManager(host=True, address=("127.0.0.1", 0), secret=b"s")
+    host.games = {("10.0.%d.%d" % (i // 250, i % 250), 40000 + i) for i in range(400)}
+    games = NetworkManager.request_games(
+        host.sock.getsockname(), timeout=1.0, process_host=host.poll, secret=b"s"
+    )
+    assert set(games) == host.games
+    assert host.fragments_sent > 1
+    host.sock.close()
@@ -27,3 +27,77 @@ def test_prune_nodes(tmp_path, monkeypatch):
 
     prune_nodes(fake_ping)
     assert load_nodes() == [('1.1.1.1', 1)]
+
+
+def test_registry_writes_behind(tmp_path):
+    from hololive_coliseum.node_registry import NodeRegistry
+
+    path = tmp_path / 'nodes.json'
+    registry = NodeRegistry(path, delay=60)
+    for i in range(100):
+        registry.add(('10.0.0.%d' % (i % 10), 5000))
+    assert len(registry.nodes()) == 10
+    assert not path.exists() and registry.writes == 0
+    registry.flush()
+    assert registry.writes == 1
+    assert NodeRegistry(path).nodes() == registry.nodes()
+    assert not registry.add(('10.0.0.1', 5000))
+    registry.flush()
+    assert registry.writes == 1
+
+
+def test_registry_timer_flushes(tmp_path):
+    import time
+    from hololive_coliseum.node_registry import NodeRegistry
+
+    path = tmp_path / 'nodes.json'
+    registry = NodeRegistry(path, defaults=[('127.0.0.1', 1)], delay=0.01)
+    registry.add(('1.2.3.4', 5))
+    deadline = time.time() + 2
+    while not path.exists() and time.time() < deadline:
+        time.sleep(0.01)
+    assert NodeRegistry(path).nodes() == [('127.0.0.1', 1), ('1.2.3.4', 5)]
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_concurrent_flushes_do_not_collide(tmp_path):
+    import threading
+    from hololive_coliseum.node_registry import NodeRegistry
+
+    path = tmp_path / 'nodes.json'
+    registry = NodeRegistry(path, delay=60)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(50):
+                registry.add(('10.%d.0.%d' % (n, i), 5000))
+                registry.flush()
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(NodeRegistry(path).nodes()) == 400
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_processes_sharing_the_file_merge_their_nodes(tmp_path):
+    from hololive_coliseum.node_registry import NodeRegistry
+
+    path = tmp_path / 'nodes.json'
+    first = NodeRegistry(path, delay=60)
+    second = NodeRegistry(path, delay=60)
+    first.add(('1.1.1.1', 1))
+    second.add(('2.2.2.2', 2))
+    first.flush()
+    second.flush()
+    assert NodeRegistry(path).nodes() == [('2.2.2.2', 2), ('1.1.1.1', 1)]
+    # a node pruned by one process is not restored from the file
+    second.replace([('2.2.2.2', 2)])
+    second.flush()
+    assert NodeRegistry(path).nodes() == [('2.2.2.2', 2)]
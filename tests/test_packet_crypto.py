@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.network import NetworkManager
+from hololive_coliseum.packet_crypto import OVERHEAD, ReplayWindow, SessionCipher
+
+
+def test_seal_and_open_roundtrip():
+    key = b"k" * 32
+    alice, bob = SessionCipher(key), SessionCipher(key)
+    first, second = alice.seal(b"hello"), alice.seal(b"hello")
+    assert len(first) == 5 + OVERHEAD
+    # counter nonces make every datagram different
+    assert first != second and alice.counter == 2
+    assert bob.open(first) == b"hello" and bob.open(second) == b"hello"
+    # another session derives another key
+    assert SessionCipher(key).seal(b"hello")[16:] != first[16:]
+
+
+def test_forged_and_replayed_datagrams_rejected():
+    key = b"k" * 32
+    alice, bob = SessionCipher(key), SessionCipher(key)
+    packet = alice.seal(b"move")
+    tampered = packet[:-1] + bytes([packet[-1] ^ 1])
+    assert bob.open(tampered) is None
+    assert SessionCipher(b"x" * 32).open(packet) is None
+    assert bob.open(packet[:OVERHEAD - 1]) is None
+    assert bob.open(packet) == b"move"
+    assert bob.open(packet) is None and bob.replays == 1
+
+
+def test_replay_window_accepts_reordering():
+    window = ReplayWindow()
+    for counter in (5, 3, 4, 70):
+        assert not window.seen(counter)
+        window.record(counter)
+    assert window.seen(5) and window.seen(70)
+    assert window.seen(6)  # slid out of the window
+    assert not window.seen(69)
+
+
+def test_managers_exchange_aead_datagrams(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    key = os.urandom(32)
+    host = NetworkManager(host=True, address=("127.0.0.1", 0), aead_key=key)
+    addr = host.sock.getsockname()
+    client = NetworkManager(address=addr, aead_key=key)
+    stranger = NetworkManager(address=addr, aead_key=os.urandom(32))
+    client.send_reliable({"type": "chat", "text": "hi"})
+    stranger.send_reliable({"type": "chat", "text": "spoof"})
+    time.sleep(0.01)
+    received = [msg for _, msg in host.poll()]
+    assert [msg["text"] for msg in received] == ["hi"]
+    assert host.packets_rejected == 1
+    time.sleep(0.01)
+    client.poll()
+    assert client.acks_received == 1
+    for manager in (host, client, stranger):
+        manager.sock.close()
+
+
+def test_discovery_reaches_aead_host(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    key = os.urandom(32)
+    host = NetworkManager(host=True, address=("127.0.0.1", 0), aead_key=key)
+    port = host.sock.getsockname()[1]
+    servers = NetworkManager.discover(
+        timeout=0.1,
+        port=port,
+        broadcast_address="127.0.0.1",
+        process_host=host.poll,
+        aead_key=key,
+    )
+    assert servers == [("127.0.0.1", port)]
+    assert host.packets_rejected == 0
+    host.sock.close()
@@ -0,0 +1,85 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.packet_framing import (
+    PacketSigner,
+    Reassembler,
+    pack_bundle,
+    split_fragments,
+    unpack_bundle,
+    unpack_fragment,
+)
+
+
+def test_bundle_roundtrip_respects_mtu():
+    payloads = [bytes([65 + i]) * 100 for i in range(10)]
+    datagrams = pack_bundle(payloads, mtu=350)
+    assert all(len(d) <= 350 for d in datagrams)
+    assert len(datagrams) == 4
+    out = [p for d in datagrams for p in unpack_bundle(d)]
+    assert out == payloads
+
+
+def test_single_and_oversized_payloads_pass_through():
+    assert pack_bundle([b"abc"]) == [b"abc"]
+    big = b"x" * 2000
+    assert pack_bundle([b"a", big, b"b"], mtu=1200) == [b"a", big, b"b"]
+    assert unpack_bundle(b"abc") == [b"abc"]
+
+
+def test_truncated_bundle_is_dropped():
+    datagram = pack_bundle([b"one", b"two"])[0]
+    assert unpack_bundle(datagram[:-1]) == []
+
+
+def test_signer_rejects_tampered_packets():
+    signer = PacketSigner(b"secret")
+    packet = signer.sign(b"payload")
+    assert signer.verify(packet) == b"payload"
+    assert signer.verify(b"X" + packet[1:]) is None
+    assert PacketSigner(b"other").verify(packet) is None
+    assert signer.verify(packet[:10]) is None
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fragments_reassemble_in_any_order():
+    body = bytes(range(256)) * 20
+    fragments = split_fragments(body, 7, 500)
+    assert all(len(f) <= 500 for f in fragments)
+    assert unpack_fragment(fragments[0])[:3] == (7, 0, len(fragments))
+    buf = Reassembler()
+    results = [buf.add("peer", f) for f in reversed(fragments)]
+    assert results[:-1] == [None] * (len(fragments) - 1)
+    assert results[-1] == body
+    assert len(buf) == 0 and buf.buffered == 0 and buf.completed == 1
+
+
+def test_partial_payloads_time_out():
+    clock = FakeClock()
+    buf = Reassembler(timeout=1.0, clock=clock)
+    first, second = split_fragments(b"x" * 300, 1, 200)
+    assert buf.add("peer", first) is None
+    clock.now = 1.5
+    assert buf.add("peer", second) is None
+    assert buf.expired == 1 and len(buf) == 1
+
+
+def test_reassembly_memory_is_bounded():
+    buf = Reassembler(max_partial=2, max_bytes=10_000, max_message=1_000)
+    for msg_id in range(3):
+        buf.add("peer", split_fragments(b"y" * 600, msg_id, 400)[0])
+    assert len(buf) == 2 and buf.evicted == 1
+    assert buf.buffered <= 10_000
+    # a payload announcing more than max_message bytes is dropped
+    for fragment in split_fragments(b"z" * 1_500, 9, 400):
+        assert buf.add("other", fragment) is None
+    assert buf.rejected == 1
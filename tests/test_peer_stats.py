@@ -0,0 +1,135 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.network import NetworkManager
+from hololive_coliseum.peer_stats import PeerStats, PeerStatsTable, overlay_lines
+
+
+def test_rtt_smoothing_follows_rfc6298():
+    stats = PeerStats()
+    stats.observe_rtt(0.1)
+    assert stats.srtt == pytest.approx(0.1) and stats.rttvar == pytest.approx(0.05)
+    stats.observe_rtt(0.2)
+    assert stats.rttvar == pytest.approx(0.75 * 0.05 + 0.25 * 0.1)
+    assert stats.srtt == pytest.approx(0.1 + (0.2 - 0.1) / 8)
+    assert stats.rto == pytest.approx(stats.srtt + 4 * stats.rttvar)
+
+
+def test_loss_and_best_node():
+    table = PeerStatsTable()
+    a, b = ("10.0.0.1", 1), ("10.0.0.2", 2)
+    assert table[a].loss is None
+    table[a].reliable_sent = 8
+    table[a].resends = 2
+    table[a].expired = 1
+    assert table[a].loss == pytest.approx(3 / 10)
+    table[a].observe_rtt(0.08)
+    table[b].observe_rtt(0.03)
+    assert table.best([a, b, ("10.0.0.3", 3)]) == b
+    table.sent(b, 100)
+    assert overlay_lines(table)[0].startswith("10.0.0.2:2 rtt 30")
+
+
+def _pair():
+    host = NetworkManager(host=True, address=("127.0.0.1", 0))
+    client = NetworkManager(address=host.sock.getsockname())
+    return host, client
+
+
+def _pump(host, client, rounds=5):
+    for _ in range(rounds):
+        time.sleep(0.01)
+        host.poll()
+        client.poll()
+
+
+def test_reliable_traffic_feeds_stats(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    host, client = _pair()
+    addr = host.sock.getsockname()
+    for i in range(3):
+        client.send_reliable({"type": "chat", "n": i})
+    _pump(host, client)
+    stats = client.peer_stats[addr]
+    assert stats.reliable_sent == 3 and stats.rtt_samples == 3
+    assert stats.srtt is not None and stats.loss == 0
+    assert stats.bytes_out == client.bytes_sent
+    assert stats.bytes_in == client.bytes_received > 0
+    back = host.peer_stats[("127.0.0.1", client.sock.getsockname()[1])]
+    assert back.bytes_in == stats.bytes_out
+    host.sock.close()
+    client.sock.close()
+
+
+def test_resent_packets_count_but_are_not_sampled(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    host, client = _pair()
+    addr = host.sock.getsockname()
+    client.ack_timeout = 0.001
+    client.send_reliable({"type": "chat"})
+    time.sleep(0.002)
+    client.process_reliable()
+    _pump(host, client)
+    stats = client.peer_stats[addr]
+    assert stats.resends == 1 and stats.rtt_samples == 0
+    assert stats.loss == pytest.approx(0.5)
+    host.sock.close()
+    client.sock.close()
+
+
+def test_ping_samples_rtt_and_consumes_pong(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    host, client = _pair()
+    addr = host.sock.getsockname()
+    client.ping()
+    seen = []
+    for _ in range(5):
+        time.sleep(0.01)
+        host.poll()
+        seen.extend(client.poll())
+    assert seen == []
+    assert client.peer_stats[addr].rtt_samples == 1
+    host.sock.close()
+    client.sock.close()
+
+
+def test_idle_peers_are_evicted():
+    table = PeerStatsTable(max_idle=10)
+    quiet, busy = ("10.0.0.1", 1), ("10.0.0.2", 2)
+    table.sent(quiet, 50)
+    table.received(busy, 50)
+    now = time.monotonic()
+    assert table.expire(now) == 0
+    table.peers[quiet].created -= 20
+    table.peers[busy].created -= 20
+    assert table.expire(now) == 1 and quiet not in table and busy in table
+    assert table.expire(now + 11) == 1 and not table and table.evicted == 2
+
+
+def test_only_verified_datagrams_are_counted(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    host = NetworkManager(host=True, address=("127.0.0.1", 0), secret=b"s")
+    forger = NetworkManager(address=host.sock.getsockname())
+    for port in range(40000, 40050):
+        host._receive(forger._frame(forger._encode({"type": "ping"}), ("h", 1)), ("10.9.9.9", port))
+    assert host.packets_rejected == 50 and len(host.peer_stats) == 0
+    # a pong with an unhashable nonce is not matched against outstanding pings
+    client = NetworkManager(address=host.sock.getsockname(), secret=b"s")
+    pong = client._frame(client._encode({"type": "pong", "nonce": [1]}), ("h", 1))
+    host._receive(pong, ("127.0.0.1", 40100))
+    assert len(host.peer_stats) == 1
+    for manager in (host, forger, client):
+        manager.sock.close()
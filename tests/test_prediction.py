@@ -0,0 +1,164 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import pygame
+
+from hololive_coliseum import physics
+from hololive_coliseum.player import PlayerCharacter
+from hololive_coliseum.network import NetworkManager
+from hololive_coliseum.prediction import (
+    InputKeys,
+    Predictor,
+    pack_input,
+    player_fields,
+)
+from hololive_coliseum.state_sync import StateSync
+
+LEFT, RIGHT, DODGE = 1, 2, 32
+
+
+def _player():
+    return PlayerCharacter(0, 0)
+
+
+def test_input_bits_round_trip():
+    keys = InputKeys(RIGHT | 4)
+    assert keys[pygame.K_RIGHT] and keys[pygame.K_SPACE] and not keys[pygame.K_LEFT]
+    assert pack_input(keys) == RIGHT | 4
+
+
+def test_input_applied_immediately():
+    player = _player()
+    pred = Predictor.for_player(player, "p1", ground_y=500)
+    msg = pred.apply(RIGHT, now=0)
+    assert msg == {"type": "inputs", "seq": 1, "player": 0, "history": [RIGHT]}
+    assert player.pos.x > 0 and pred.pending == 1
+
+
+def test_reconcile_replays_unacked_inputs():
+    client, server = _player(), _player()
+    pred = Predictor.for_player(client, "p1", ground_y=500)
+    server_pred = Predictor.for_player(server, "p1", ground_y=500)
+    host_sync, client_sync = StateSync(), StateSync()
+    msgs = [pred.apply(RIGHT, now=i * 16) for i in range(5)]
+    predicted = client.pos.x
+    # the host has only processed the first two inputs so far
+    for msg in msgs[:2]:
+        server_pred.step(msg["history"][0], 0)
+    state = dict(player_fields(server, "p1"), **{"p1.input_seq": 2})
+    assert pred.reconcile(client_sync.apply(host_sync.encode(state)))
+    assert pred.pending == 3 and pred.replayed == 3
+    assert abs(client.pos.x - predicted) < 1e-9
+    # a late copy of an older update is ignored
+    assert not pred.reconcile({"p1.input_seq": 1, "p1.x": -50})
+    assert abs(client.pos.x - predicted) < 1e-9
+
+
+def test_reconcile_corrects_misprediction():
+    player = _player()
+    pred = Predictor.for_player(player, "p1", ground_y=500)
+    pred.apply(RIGHT, now=0)
+    pred.apply(RIGHT, now=16)
+    # the host put the player somewhere else, e.g. after a knockback
+    pred.reconcile({"p1.input_seq": 1, "p1.x": 100.0, "p1.vx": 0.0})
+    assert abs(player.pos.x - (100 + physics.MOVE_ACCEL)) < 1e-9
+
+
+def test_replay_restores_cooldowns_of_the_confirmed_input():
+    client, server = _player(), _player()
+    pred = Predictor.for_player(client, "p1", ground_y=500)
+    host = Predictor.for_player(server, "p1", ground_y=500)
+    inputs = [RIGHT, RIGHT, RIGHT, RIGHT | DODGE, RIGHT, RIGHT]
+    msgs = [pred.apply(bits, now=i * 16) for i, bits in enumerate(inputs)]
+    assert client.last_dodge == 48
+    predicted = (client.pos.x, client.pos.y)
+    for i, msg in enumerate(msgs[:2]):
+        host.step(msg["history"][0], i * 16)
+    pred.reconcile(dict(player_fields(server, "p1"), **{"p1.input_seq": 2}))
+    # the dodge at seq 4 is replayed, not blocked by its own cooldown
+    assert client.last_dodge == 48
+    assert abs(client.pos.x - predicted[0]) < 1e-9
+    assert abs(client.pos.y - predicted[1]) < 1e-9
+
+
+def test_default_bindings_cover_every_action():
+    player = _player()
+    pred = Predictor.for_player(player, "p1", ground_y=500)
+    pred.apply(DODGE, now=0)
+    assert player.dodging and player.velocity.x == 8
+
+
+def test_input_message_reaches_host(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    host = NetworkManager(host=True, address=("127.0.0.1", 0))
+    client = NetworkManager(host=False, address=host.sock.getsockname())
+    pred = Predictor.for_player(_player(), "p1", ground_y=500)
+    client.send_input(pred.apply(LEFT, now=0))
+    time.sleep(0.01)
+    msgs = host.poll()
+    assert msgs and msgs[0][1]["new"] == [(1, LEFT)]
+    host.sock.close()
+    client.sock.close()
+
+
+def test_host_recovers_dropped_inputs_from_history(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    host = NetworkManager(host=True, address=("127.0.0.1", 0))
+    client = NetworkManager(host=False, address=host.sock.getsockname())
+    pred = Predictor.for_player(_player(), "p1", ground_y=500, redundancy=4)
+    addr = ("127.0.0.1", 40000)
+    delivered = []
+    for i in range(12):
+        msg = pred.apply(RIGHT if i % 2 else LEFT, now=i * 16)
+        # drop every third packet on the way to the host
+        if i % 3 == 1:
+            continue
+        for _, data in host._receive(client._frame(client._encode(msg), addr), addr):
+            delivered.extend(data["new"])
+    assert [seq for seq, _ in delivered] == list(range(1, 13))
+    assert all(bits == (RIGHT if (seq - 1) % 2 else LEFT) for seq, bits in delivered)
+    assert host.input_stats() == {"received": 12, "recovered": 4, "lost": 0}
+    # a late duplicate does not reach the game
+    late = {"type": "inputs", "seq": 2, "player": 0, "history": [RIGHT, LEFT]}
+    assert host._receive(client._frame(client._encode(late), addr), addr) == []
+    host.sock.close()
+    client.sock.close()
+
+
+def test_host_state_confirms_predicted_inputs(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    host = NetworkManager(host=True, address=("127.0.0.1", 0))
+    client = NetworkManager(host=False, address=host.sock.getsockname())
+    host.bind_input(("127.0.0.1", client.sock.getsockname()[1]), "p1")
+    local, remote = _player(), _player()
+    pred = Predictor.for_player(local, "p1", ground_y=500)
+    server = Predictor.for_player(remote, "p1", ground_y=500)
+    client_sync = StateSync()
+    for i in range(3):
+        client.send_input(pred.apply(RIGHT, now=i * 16))
+    time.sleep(0.01)
+    for _, msg in host.poll():
+        for _, bits in msg["new"]:
+            server.step(bits, 0)
+    # two more inputs are still in flight when the host's state arrives
+    for i in range(3, 5):
+        pred.apply(RIGHT, now=i * 16)
+    predicted = local.pos.x
+    host.send_state(player_fields(remote, "p1"))
+    time.sleep(0.01)
+    states = [msg for _, msg in client.poll() if "p1.x" in msg]
+    assert states
+    assert pred.reconcile(client_sync.apply(states[0]))
+    assert pred.acked == 3 and pred.pending == 2 and pred.replayed == 2
+    assert abs(local.pos.x - predicted) < 1e-9
+    host.sock.close()
+    client.sock.close()
@@ -0,0 +1,83 @@
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.network import NetworkManager
+from hololive_coliseum.probe import NodeProber, merge_lists
+
+
+def test_ping_nodes_returns_once_all_answer(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    routers = [NetworkManager(host=True, address=("127.0.0.1", 0)) for _ in range(3)]
+    nodes = [r.sock.getsockname() for r in routers]
+
+    def process():
+        for r in routers:
+            r.poll()
+
+    start = time.monotonic()
+    latencies = NetworkManager.ping_nodes(nodes, timeout=2.0, process_host=process)
+    assert time.monotonic() - start < 1.0
+    assert all(latencies[n] is not None for n in nodes)
+    for r in routers:
+        r.sock.close()
+
+
+def test_silent_nodes_resolve_to_defaults(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    router = NetworkManager(host=True, address=("127.0.0.1", 0))
+    silent = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    silent.bind(("127.0.0.1", 0))
+    live, dead = router.sock.getsockname(), silent.getsockname()
+    prober = NodeProber(NetworkManager())
+    pings = prober.ping([live, dead])
+    finds = prober.find_games([live, dead])
+    seen = []
+    pings[live].add_done_callback(lambda fut: seen.append(fut.result()))
+    prober.wait(0.1, process_host=router.poll)
+    assert seen and seen[0] is not None
+    assert pings[dead].result() is None
+    assert finds[live].result() == [] and finds[dead].result() == []
+    assert merge_lists(finds) == []
+    prober.manager.sock.close()
+    router.sock.close()
+    silent.close()
+
+
+def test_rogue_replies_do_not_resolve_or_crash():
+    rogue = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rogue.bind(("127.0.0.1", 0))
+    rogue.setblocking(False)
+    spoof = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    forge = NetworkManager()
+    prober = NodeProber(NetworkManager())
+    node = rogue.getsockname()
+    dest = ("127.0.0.1", prober.manager.sock.getsockname()[1])
+
+    def reply(sock, msg):
+        sock.sendto(forge._frame(forge._encode(msg), dest), dest)
+
+    def process():
+        try:
+            packet, _ = rogue.recvfrom(4096)
+        except BlockingIOError:
+            return
+        nonce = forge._decode_all(packet, node)[0]["nonce"]
+        # another address that learned the nonce is ignored
+        reply(spoof, {"type": "games", "nonce": nonce, "games": [["6.6.6.6", 6]]})
+        reply(rogue, {"type": "games", "nonce": [nonce], "games": []})
+        reply(rogue, {"type": "games", "nonce": nonce,
+                      "games": [[1], ["h", "p"], "x", ["h", 5, 1], ["h", 5]]})
+
+    finds = prober.find_games([node])
+    prober.wait(1.0, process_host=process)
+    assert finds[node].result() == [("h", 5)]
+    for sock in (rogue, spoof, forge.sock, prober.manager.sock):
+        sock.close()
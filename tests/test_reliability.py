@@ -0,0 +1,65 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.reliability import AckWindow, OrderedChannel, acked_sequences
+
+
+def test_ack_window_tracks_recent_receipts():
+    window = AckWindow()
+    assert window.header() is None
+    for seq in (1, 2, 4, 7):
+        assert window.record(seq) is True
+    assert window.record(4) is False
+    latest, bits = window.header()
+    assert latest == 7
+    assert sorted(acked_sequences(latest, bits)) == [1, 2, 4, 7]
+    assert window.record(3) is True
+    assert 3 in set(acked_sequences(*window.header()))
+
+
+def test_ack_window_sequences_outside_header():
+    window = AckWindow()
+    window.record(1)
+    window.record(40)
+    assert not window.covers(2)
+    assert window.record(2) is True
+    assert window.record(2) is False
+    assert list(acked_sequences(*window.header())) == [40]
+
+
+def test_ack_window_skips_abandoned_gaps():
+    window = AckWindow(max_gap=4)
+    for seq in range(3, 9):
+        assert window.record(seq)
+    # seq 1 and 2 were never delivered; the floor moved past them
+    assert window.floor == 8
+    assert window.record(2) is False
+
+
+def test_ordered_channel_releases_in_sequence():
+    channel = OrderedChannel(max_buffer=3)
+    assert channel.push(2, "b") == []
+    assert channel.push(3, "c") == []
+    assert channel.push(1, "a") == ["a", "b", "c"]
+    assert channel.push(1, "a") == []
+    for cseq in (6, 7, 8):
+        assert channel.push(cseq, cseq) == []
+    # message 4 and 5 are given up once the buffer overflows
+    assert channel.push(9, 9) == [6, 7, 8, 9]
+
+
+def test_ordered_channel_skips_gap_after_timeout():
+    now = [0.0]
+    channel = OrderedChannel(timeout=2.0, clock=lambda: now[0])
+    assert channel.push(1, "a") == ["a"]
+    assert channel.push(3, "c") == []
+    now[0] = 1.0
+    assert channel.push(4, "d") == []
+    assert channel.expire() == []
+    now[0] = 2.0
+    # message 2 was never resent in time; deliver what is waiting
+    assert channel.expire() == ["c", "d"]
+    assert channel.skipped == 1
+    assert channel.expire() == []
@@ -0,0 +1,90 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.rollback import FRAME_TIME, RollbackSession, run_frames
+
+
+class World:
+    """Tiny deterministic world: each player's position follows its input."""
+
+    def __init__(self):
+        self.pos = [0, 0]
+        self.steps = 0
+
+    def simulate(self, inputs):
+        self.steps += 1
+        for i, bits in enumerate(inputs):
+            self.pos[i] += 1 if bits & 1 else -1 if bits & 2 else 0
+
+    def save(self):
+        return list(self.pos)
+
+    def load(self, snap):
+        self.pos = list(snap)
+
+
+def make_session(**kwargs):
+    world = World()
+    session = RollbackSession(world.simulate, world.save, world.load, **kwargs)
+    return world, session
+
+
+def test_correct_prediction_needs_no_rollback():
+    world, session = make_session()
+    session.add_remote_input(1, 0, 1)
+    for frame in range(4):
+        session.add_local_input(1)
+        assert session.advance()
+        session.add_remote_input(1, frame + 1, 1)
+    assert world.pos == [4, 4]
+    assert session.rollbacks == 0 and world.steps == 4
+
+
+def test_misprediction_rolls_back_and_resimulates():
+    world, session = make_session()
+    for _ in range(5):
+        session.add_local_input(0)
+        session.advance()
+    # remote held "right" since frame 2 but we predicted idle
+    for frame in range(5):
+        session.add_remote_input(1, frame, 1 if frame >= 2 else 0)
+    session.add_local_input(0)
+    session.advance()
+    assert session.last_depth == 3 and session.rollbacks == 1
+    # frames 2-4 replayed with the real input, frame 5 predicts it again
+    assert world.pos == [0, 4]
+    assert world.steps == 5 + 3 + 1
+    stats = session.stats()
+    assert stats["rollbacks"] == 1 and stats["max_depth"] == 3
+    assert stats["avg_resim_ms"] >= 0
+
+
+def test_stalls_when_too_far_ahead():
+    world, session = make_session(max_rollback=3)
+    ran = 0
+    for _ in range(10):
+        session.add_local_input(0)
+        ran += session.advance()
+    assert ran == 3 and session.frame == 3
+    session.add_remote_input(1, 0, 0)
+    assert session.advance()
+
+
+def test_old_snapshots_are_trimmed():
+    world, session = make_session()
+    for frame in range(20):
+        session.add_local_input(0)
+        session.add_remote_input(1, frame, 0)
+        session.advance()
+    assert len(session._snapshots) <= 1
+
+
+def test_run_frames_decouples_simulation_from_render_rate():
+    world, session = make_session(max_rollback=100)
+    ran, left = run_frames(session, 0.5 * FRAME_TIME)
+    assert ran == 0
+    ran, left = run_frames(session, 2.6 * FRAME_TIME, left)
+    assert ran == 3 and world.steps == 3
+    assert abs(left - 0.1 * FRAME_TIME) < 1e-9
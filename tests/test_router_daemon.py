@@ -0,0 +1,127 @@
+import os
+import socket
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.network import NetworkManager
+from hololive_coliseum.router_daemon import RouterWorker
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "SO_REUSEPORT") or not hasattr(socket, "AF_UNIX"),
+    reason="needs SO_REUSEPORT and Unix sockets",
+)
+
+
+def _free_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_workers_share_port_and_tables(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    addr = ("127.0.0.1", _free_port())
+    run_dir = str(tmp_path / "run")
+    workers = [RouterWorker(i, 2, addr, run_dir) for i in range(2)]
+    games = [NetworkManager(host=False, address=addr) for _ in range(8)]
+    for game in games:
+        game.register_game([addr])
+    for _ in range(6):
+        for worker in workers:
+            worker.step(timeout=0.01)
+    ports = {g.sock.getsockname()[1] for g in games}
+    for worker in workers:
+        assert {p for _, p in worker.manager.games} == ports
+    for sock in [g.sock for g in games]:
+        sock.close()
+    for worker in workers:
+        worker.close()
+    assert not os.listdir(run_dir)
+
+
+def test_lost_sibling_delta_is_resynced(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    addr = ("127.0.0.1", _free_port())
+    run_dir = str(tmp_path / "run")
+    first = RouterWorker(0, 2, addr, run_dir, sync_interval=0)
+    # the sibling is not up yet, so the first delta cannot be delivered
+    first.manager.gossip.set("games", ("10.0.0.1", 1))
+    first.sync_siblings()
+    second = RouterWorker(1, 2, addr, run_dir, sync_interval=0)
+    for _ in range(4):
+        first.step(timeout=0.01)
+        second.step(timeout=0.01)
+    assert ("10.0.0.1", 1) in second.manager.games
+    first.close()
+    second.close()
+
+
+def test_worker_accepts_aead_registrations(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    key = os.urandom(32)
+    addr = ("127.0.0.1", _free_port())
+    worker = RouterWorker(0, 1, addr, str(tmp_path / "run"), aead_key=key)
+    game = NetworkManager(host=False, address=addr, aead_key=key)
+    game.register_game([addr])
+    for _ in range(3):
+        worker.step(timeout=0.01)
+    assert {p for _, p in worker.manager.games} == {game.sock.getsockname()[1]}
+    assert worker.manager.packets_rejected == 0
+    game.sock.close()
+    worker.close()
+
+
+def test_local_sync_drops_forged_and_malformed_messages(tmp_path, monkeypatch):
+    import json
+    from hololive_coliseum.gossip import GossipTable
+    from hololive_coliseum.packet_framing import PacketSigner
+
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    secret = b"router-secret"
+    run_dir = str(tmp_path / "run")
+    worker = RouterWorker(0, 2, ("127.0.0.1", _free_port()), run_dir, secret=secret)
+    table = GossipTable()
+    table.set("games", ("10.0.0.9", 9))
+    delta = json.dumps(table.delta_for("w0")).encode("utf-8")
+    signer = PacketSigner(secret)
+    # a process impersonating the sibling that does not know the secret
+    rogue = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    rogue.bind(os.path.join(run_dir, "worker-1.sock"))
+    rogue.sendto(delta, worker.path)
+    rogue.sendto(signer.sign(b"[1, 2]"), worker.path)
+    stranger = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    stranger.bind(str(tmp_path / "stranger.sock"))
+    stranger.sendto(signer.sign(delta), worker.path)
+    worker._receive_local()
+    assert worker.rejected == 3
+    assert not worker.manager.games
+    rogue.sendto(signer.sign(delta), worker.path)
+    worker._receive_local()
+    assert ("10.0.0.9", 9) in worker.manager.games
+    rogue.close()
+    stranger.close()
+    worker.close()
+
+
+def test_run_dir_must_be_private(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    run_dir = tmp_path / "shared"
+    run_dir.mkdir()
+    run_dir.chmod(0o777)
+    with pytest.raises(PermissionError):
+        RouterWorker(0, 1, ("127.0.0.1", _free_port()), str(run_dir))
@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.network import NetworkManager
+from hololive_coliseum.send_scheduler import SendScheduler, field_size
+from hololive_coliseum.state_sync import StateSync
+
+
+def test_budget_sends_highest_priority_first():
+    sched = SendScheduler(budget=6 + field_size("hp", 1) + field_size("x", 1))
+    sched.set_priority("hp", 5.0)
+    state = {"x": 1, "y": 2, "hp": 100}
+    first = sched.select("a", state)
+    assert set(first) == {"hp", "x", "seq"} or set(first) == {"hp", "y", "seq"}
+    assert sched.backlog("a") == 1
+    # the skipped field accumulated priority and goes out next tick
+    second = sched.select("a", state)
+    assert set(second) - {"seq"} and "hp" not in second
+    assert sched.select("a", state) is None
+
+
+def test_per_client_budgets_are_independent():
+    sched = SendScheduler(budget=1000)
+    sched.set_budget("slow", 6 + field_size("a", 1))
+    state = {"a": 1, "b": 2, "c": 3}
+    fast = sched.select("fast", state)
+    slow = sched.select("slow", state)
+    assert len(fast) == 4 and len(slow) == 2
+    sync = StateSync()
+    while slow is not None:
+        sync.apply(slow)
+        slow = sched.select("slow", state)
+    assert sync.last_state == state
+
+
+def test_host_schedules_state_per_client(tmp_path, monkeypatch):
+    monkeypatch.setattr('hololive_coliseum.node_registry.SAVE_DIR', tmp_path)
+    monkeypatch.setattr('hololive_coliseum.node_registry.NODES_FILE', tmp_path / 'nodes.json')
+    monkeypatch.setattr('hololive_coliseum.node_registry.DEFAULT_NODES', [])
+    host = NetworkManager(host=True, address=("127.0.0.1", 0), state_budget=30)
+    addr = host.sock.getsockname()
+    client = NetworkManager(host=False, address=addr)
+    client.send_state({"hello": 1})
+    time.sleep(0.01)
+    host.poll()
+    host.send_state({f"f{i}": i for i in range(10)})
+    time.sleep(0.01)
+    received = client.poll()
+    assert 1 <= len(received[0][1]) - 1 < 10
+    host.sock.close()
+    client.sock.close()
@@ -0,0 +1,112 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.snapshot_buffer import SnapshotBuffer, lerp_state
+from hololive_coliseum.state_sync import StateSync
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_state_sync_ignores_stale_delta():
+    sync = StateSync()
+    sync.apply({"x": 2, "seq": 2})
+    state = sync.apply({"x": 1, "seq": 1})
+    assert state == {"x": 2} and sync.seq == 2
+
+
+def test_state_sync_starts_over_for_new_epoch():
+    sync = StateSync()
+    sync.apply({"x": 2, "y": 1, "seq": 9, "epoch": 1})
+    state = sync.apply({"x": 5, "seq": 1, "epoch": 2})
+    assert state == {"x": 5} and sync.seq == 1
+
+
+def test_buffer_restarts_with_the_host():
+    clock = FakeClock()
+    buf = SnapshotBuffer(interval=0.1, clock=clock)
+    for seq in range(1, 4):
+        clock.now = seq * 0.1
+        buf.push({"p.x": seq, "seq": seq, "epoch": 7})
+    clock.now = 5.0
+    buf.push({"p.x": 50, "seq": 1, "epoch": 8})
+    assert buf.stale_dropped == 0
+    assert buf.sync.last_state == {"p.x": 50}
+    assert buf.sample() == {"p.x": 50}
+
+
+def test_out_of_order_deltas_applied_in_seq_order():
+    clock = FakeClock()
+    buf = SnapshotBuffer(interval=0.1, clock=clock)
+    clock.now = 1.0
+    buf.push({"p.x": 0, "p.hp": 5, "seq": 1})
+    clock.now = 1.2
+    buf.push({"p.x": 20, "seq": 3})
+    clock.now = 1.21
+    buf.push({"p.x": 10, "p.hp": 4, "seq": 2})
+    buf.push({"p.x": 0, "seq": 1})
+    assert buf.sync.last_state == {"p.x": 20, "p.hp": 4}
+    assert buf.stale_dropped == 1 and buf.skipped == 0
+
+
+def test_sample_interpolates_in_the_past():
+    clock = FakeClock()
+    buf = SnapshotBuffer(interval=0.1, clock=clock)
+    for seq in range(1, 4):
+        clock.now = seq * 0.1
+        buf.push({"p.x": seq * 10, "p.name": "ina", "seq": seq})
+    # no jitter: two intervals of delay and no transit offset
+    assert abs(buf.delay - 0.2) < 1e-9
+    state = buf.sample(0.4)
+    assert abs(state["p.x"] - 20) < 1e-6 and state["p.name"] == "ina"
+    state = buf.sample(0.45)
+    assert abs(state["p.x"] - 25) < 1e-6
+
+
+def test_missing_delta_is_skipped_once_due():
+    clock = FakeClock()
+    buf = SnapshotBuffer(interval=0.1, min_delay=0.25, clock=clock)
+    clock.now = 0.1
+    buf.push({"p.x": 1, "seq": 1})
+    clock.now = 0.3
+    buf.push({"p.x": 3, "seq": 3})
+    assert buf.sync.seq == 1
+    buf.sample(0.4)
+    assert buf.sync.seq == 3 and buf.skipped == 1
+
+
+def test_delay_grows_with_jitter():
+    clock = FakeClock()
+    buf = SnapshotBuffer(interval=0.02, min_delay=0.05, clock=clock)
+    for seq in range(1, 50):
+        clock.now = seq * 0.02 + (0.06 if seq % 2 else 0.0)
+        buf.push({"seq": seq})
+    assert buf.jitter > 0.03
+    assert buf.delay > 0.15
+
+
+def test_delay_starts_at_100ms_floor():
+    clock = FakeClock()
+    buf = SnapshotBuffer(clock=clock)
+    assert buf.delay == 0.1
+    for seq in range(1, 30):
+        clock.now = seq / 60
+        buf.push({"seq": seq})
+    # a steady 60 Hz stream keeps the floor instead of dropping to 33 ms
+    assert buf.jitter < 1e-9 and buf.delay == 0.1
+    for seq in range(30, 80):
+        clock.now = seq / 60 + (0.04 if seq % 2 else 0.0)
+        buf.push({"seq": seq})
+    assert buf.delay > 0.1
+
+
+def test_lerp_state_leaves_bools_alone():
+    out = lerp_state({"x": 0, "alive": True}, {"x": 10, "alive": False}, 0.25)
+    assert out == {"x": 2.5, "alive": True}
@@ -0,0 +1,41 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hololive_coliseum.wire_codec import decode_message, encode_message, is_binary
+from hololive_coliseum.holographic_compression import compress_packet
+from hololive_coliseum.network import NetworkManager
+
+
+def test_hot_messages_roundtrip():
+    for msg in (
+        {"x": 3, "y": -2.5, "name": "gura", "alive": True, "item": None, "seq": 7},
+        {"type": "ack", "seq": 12},
+        {"type": "ping", "nonce": 99},
+        {"type": "input", "seq": 4, "frame": 90, "bits": 0b1011},
+    ):
+        packet = encode_message(msg)
+        assert packet is not None and is_binary(packet)
+        assert decode_message(packet) == msg
+        assert len(packet) < len(compress_packet(msg))
+
+
+def test_unmatched_messages_fall_back():
+    assert encode_message({"type": "register"}) is None
+    assert encode_message({"type": "ack", "seq": 1, "reliable": True}) is None
+    assert encode_message({"pos": [1, 2], "seq": 1}) is None
+    assert not is_binary(compress_packet({"type": "register"}))
+
+
+def test_binary_packets_are_signed_and_encrypted():
+    a = NetworkManager(secret=b"s", encrypt_key=b"k")
+    b = NetworkManager(secret=b"s", encrypt_key=b"k")
+    packet = a._encode({"type": "ack", "seq": 5})
+    assert is_binary(packet)
+    datagram = a._frame(packet, ("127.0.0.1", 1))
+    assert b._decode_all(datagram, ("127.0.0.1", 2)) == [{"type": "ack", "seq": 5}]
+    forged = datagram[:-1] + bytes([datagram[-1] ^ 1])
+    assert b._decode_all(forged, ("127.0.0.1", 2)) == []
+    a.sock.close()
+    b.sock.close()